@@ -1,13 +1,33 @@
 from __future__ import annotations
-from typing import Callable, List, Tuple
-from soup_lang import Piece, Soup
+from typing import Callable, Dict, List, Optional, Tuple
+from soup_dsl import CompiledSemantics, Rule, Spec, rule
+from soup_lang import Soup
+from ordering import NATURAL
+from symmetry import PermutationGroup, ProcessSymmetry, swap
 
 """Encodage des modèles AB1..AB5 en Soup.
 
-Configuration = (a_loc, b_loc, flagAlice, flagBob, turn)
+Les modèles sont écrits sous forme déclarative (soup_dsl.Spec): gardes =
+tests de champs, effets = affectations de champs. get_semantics(name) donne
+la sémantique compilée (une fonction de successeurs engendrée par modèle),
+get_model(name) le Soup équivalent.
+
+Configuration = (a_loc, b_loc, flagAlice, flagBob, turn), ou sa forme
+compactée (get_semantics(name, packed=True)) sur 7 bits au plus.
 
 Même si certains modèles n'utilisent pas tous les champs (ex: AB1 n'utilise pas
 les flags/turn), on les conserve avec des valeurs stables.
+
+Les configurations sont des tuples de chaînes simples: leur ordre naturel
+coïncide avec l'ordre par repr, on déclare donc sort_key=NATURAL (même ordre
+de parcours, sans construire de chaîne).
+
+make_mutex(n) construit un modèle paramétré à n processus (verrou partagé),
+pour les explorations plus grosses.
+
+Symétries déclarées (Spec.symmetry, voir symmetry.py): AB1, AB2 et AB5 sont
+invariants par échange d'Alice et Bob (AB_SWAP, AB_SWAP_TURN pour AB5);
+AB3 et AB4 ne le sont pas (Bob seul recule). make_mutex(n): permutation des n processus.
 """
 
 # Domaine des configurations
@@ -48,44 +68,51 @@ def upd(
     )
 
 
-# Helpers: création de pièces
-Guard = Callable[[Config], bool]
-Effect = Callable[[Config], Config]
+FIELDS = ("a_loc", "b_loc", "flag_a", "flag_b", "turn")
 
 
-def piece(name: str, guard: Guard, effect: Effect) -> Piece:
-    return Piece(name=name, guard=guard, effect=effect)
+# Échange Alice <-> Bob: champs miroirs; AB5 (Peterson) échange aussi les
+# valeurs de turn, que AB1 / AB2 n'utilisent pas (turn reste à ALICE)
+_MIRROR = [("a_loc", "b_loc"), ("flag_a", "flag_b")]
+AB_SWAP = PermutationGroup(FIELDS, [swap(FIELDS, _MIRROR)])
+AB_SWAP_TURN = PermutationGroup(
+    FIELDS, [swap(FIELDS, _MIRROR, {"turn": {ALICE: BOB, BOB: ALICE}})]
+)
 
 
-def a_loc_is(x: str) -> Guard:
-    return lambda c: c[0] == x
-
-
-def b_loc_is(x: str) -> Guard:
-    return lambda c: c[1] == x
+def _spec(rules: List[Rule], symmetry: Optional[PermutationGroup] = None) -> Spec:
+    return Spec(
+        FIELDS,
+        rules,
+        init=[mk(I, I, DOWN, DOWN, ALICE)],
+        sort_key=NATURAL,
+        symmetry=symmetry,
+    )
 
 
 # Modèles AB1..AB5
 
 
-def make_ab1() -> Soup:
+def ab1_spec() -> Spec:
     """AB1: pas de flags.
 
     Alice: I --a1--> CS ; CS --a2--> I
     Bob:   I --b1--> CS ; CS --b2--> I
     """
-    pieces: List[Piece] = [
-        # Alice
-        piece("a1", a_loc_is(I), lambda c: upd(c, a_loc=CS)),
-        piece("a2", a_loc_is(CS), lambda c: upd(c, a_loc=I)),
-        # Bob
-        piece("b1", b_loc_is(I), lambda c: upd(c, b_loc=CS)),
-        piece("b2", b_loc_is(CS), lambda c: upd(c, b_loc=I)),
-    ]
-    return Soup(pieces=pieces, init=[mk(I, I, DOWN, DOWN, ALICE)])
+    return _spec(
+        [
+            # Alice
+            rule("a1", when={"a_loc": I}, then={"a_loc": CS}),
+            rule("a2", when={"a_loc": CS}, then={"a_loc": I}),
+            # Bob
+            rule("b1", when={"b_loc": I}, then={"b_loc": CS}),
+            rule("b2", when={"b_loc": CS}, then={"b_loc": I}),
+        ],
+        symmetry=AB_SWAP,
+    )
 
 
-def make_ab2() -> Soup:
+def ab2_spec() -> Spec:
     """AB2: stratégie par drapeaux.
 
     Alice:
@@ -98,43 +125,46 @@ def make_ab2() -> Soup:
       W  --b2 [flagA==DOWN]--> CS
       CS --b3 / flagB=DOWN-->  I
     """
-    pieces: List[Piece] = [
-        # Alice
-        piece("a1", a_loc_is(I), lambda c: upd(c, a_loc=W, flag_a=UP)),
-        piece("a2", lambda c: c[0] == W and c[3] == DOWN, lambda c: upd(c, a_loc=CS)),
-        piece("a3", a_loc_is(CS), lambda c: upd(c, a_loc=I, flag_a=DOWN)),
-        # Bob
-        piece("b1", b_loc_is(I), lambda c: upd(c, b_loc=W, flag_b=UP)),
-        piece("b2", lambda c: c[1] == W and c[2] == DOWN, lambda c: upd(c, b_loc=CS)),
-        piece("b3", b_loc_is(CS), lambda c: upd(c, b_loc=I, flag_b=DOWN)),
-    ]
-    return Soup(pieces=pieces, init=[mk(I, I, DOWN, DOWN, ALICE)])
+    return _spec(
+        [
+            # Alice
+            rule("a1", when={"a_loc": I}, then={"a_loc": W, "flag_a": UP}),
+            rule("a2", when={"a_loc": W, "flag_b": DOWN}, then={"a_loc": CS}),
+            rule("a3", when={"a_loc": CS}, then={"a_loc": I, "flag_a": DOWN}),
+            # Bob
+            rule("b1", when={"b_loc": I}, then={"b_loc": W, "flag_b": UP}),
+            rule("b2", when={"b_loc": W, "flag_a": DOWN}, then={"b_loc": CS}),
+            rule("b3", when={"b_loc": CS}, then={"b_loc": I, "flag_b": DOWN}),
+        ],
+        symmetry=AB_SWAP,
+    )
 
 
-def make_ab3() -> Soup:
+def ab3_spec() -> Spec:
     """AB3: AB2 + backoff de Bob.
 
     Ajout: b4 depuis W -> I si flagA==UP, et flagB=DOWN.
     """
-    pieces: List[Piece] = [
-        # Alice (AB2)
-        piece("a1", a_loc_is(I), lambda c: upd(c, a_loc=W, flag_a=UP)),
-        piece("a2", lambda c: c[0] == W and c[3] == DOWN, lambda c: upd(c, a_loc=CS)),
-        piece("a3", a_loc_is(CS), lambda c: upd(c, a_loc=I, flag_a=DOWN)),
-        # Bob (AB2 + b4)
-        piece("b1", b_loc_is(I), lambda c: upd(c, b_loc=W, flag_b=UP)),
-        piece("b2", lambda c: c[1] == W and c[2] == DOWN, lambda c: upd(c, b_loc=CS)),
-        piece(
-            "b4",
-            lambda c: c[1] == W and c[2] == UP,
-            lambda c: upd(c, b_loc=I, flag_b=DOWN),
-        ),
-        piece("b3", b_loc_is(CS), lambda c: upd(c, b_loc=I, flag_b=DOWN)),
-    ]
-    return Soup(pieces=pieces, init=[mk(I, I, DOWN, DOWN, ALICE)])
+    return _spec(
+        [
+            # Alice (AB2)
+            rule("a1", when={"a_loc": I}, then={"a_loc": W, "flag_a": UP}),
+            rule("a2", when={"a_loc": W, "flag_b": DOWN}, then={"a_loc": CS}),
+            rule("a3", when={"a_loc": CS}, then={"a_loc": I, "flag_a": DOWN}),
+            # Bob (AB2 + b4)
+            rule("b1", when={"b_loc": I}, then={"b_loc": W, "flag_b": UP}),
+            rule("b2", when={"b_loc": W, "flag_a": DOWN}, then={"b_loc": CS}),
+            rule(
+                "b4",
+                when={"b_loc": W, "flag_a": UP},
+                then={"b_loc": I, "flag_b": DOWN},
+            ),
+            rule("b3", when={"b_loc": CS}, then={"b_loc": I, "flag_b": DOWN}),
+        ]
+    )
 
 
-def make_ab4() -> Soup:
+def ab4_spec() -> Spec:
     """AB4: AB2 côté Alice, Bob avec état R (retry).
 
     Bob:
@@ -144,30 +174,31 @@ def make_ab4() -> Soup:
       R  --b5 [flagA==DOWN] / flagB=UP--> CS
       CS --b3 / flagB=DOWN-->  I
     """
-    pieces: List[Piece] = [
-        # Alice (AB2)
-        piece("a1", a_loc_is(I), lambda c: upd(c, a_loc=W, flag_a=UP)),
-        piece("a2", lambda c: c[0] == W and c[3] == DOWN, lambda c: upd(c, a_loc=CS)),
-        piece("a3", a_loc_is(CS), lambda c: upd(c, a_loc=I, flag_a=DOWN)),
-        # Bob
-        piece("b1", b_loc_is(I), lambda c: upd(c, b_loc=W, flag_b=UP)),
-        piece("b2", lambda c: c[1] == W and c[2] == DOWN, lambda c: upd(c, b_loc=CS)),
-        piece(
-            "b4",
-            lambda c: c[1] == W and c[2] == UP,
-            lambda c: upd(c, b_loc=R, flag_b=DOWN),
-        ),
-        piece(
-            "b5",
-            lambda c: c[1] == R and c[2] == DOWN,
-            lambda c: upd(c, b_loc=CS, flag_b=UP),
-        ),
-        piece("b3", b_loc_is(CS), lambda c: upd(c, b_loc=I, flag_b=DOWN)),
-    ]
-    return Soup(pieces=pieces, init=[mk(I, I, DOWN, DOWN, ALICE)])
+    return _spec(
+        [
+            # Alice (AB2)
+            rule("a1", when={"a_loc": I}, then={"a_loc": W, "flag_a": UP}),
+            rule("a2", when={"a_loc": W, "flag_b": DOWN}, then={"a_loc": CS}),
+            rule("a3", when={"a_loc": CS}, then={"a_loc": I, "flag_a": DOWN}),
+            # Bob
+            rule("b1", when={"b_loc": I}, then={"b_loc": W, "flag_b": UP}),
+            rule("b2", when={"b_loc": W, "flag_a": DOWN}, then={"b_loc": CS}),
+            rule(
+                "b4",
+                when={"b_loc": W, "flag_a": UP},
+                then={"b_loc": R, "flag_b": DOWN},
+            ),
+            rule(
+                "b5",
+                when={"b_loc": R, "flag_a": DOWN},
+                then={"b_loc": CS, "flag_b": UP},
+            ),
+            rule("b3", when={"b_loc": CS}, then={"b_loc": I, "flag_b": DOWN}),
+        ]
+    )
 
 
-def make_ab5() -> Soup:
+def ab5_spec() -> Spec:
     """AB5: Peterson (flags + turn).
 
     Alice:
@@ -180,38 +211,124 @@ def make_ab5() -> Soup:
       W  --b2 [turn=Bob || flagA==DOWN]--> CS
       CS --b3 / flagB=DOWN--> I
     """
-    pieces: List[Piece] = [
-        # Alice
-        piece("a1", a_loc_is(I), lambda c: upd(c, a_loc=W, flag_a=UP, turn=BOB)),
-        piece(
-            "a2",
-            lambda c: c[0] == W and (c[4] == ALICE or c[3] == DOWN),
-            lambda c: upd(c, a_loc=CS),
-        ),
-        piece("a3", a_loc_is(CS), lambda c: upd(c, a_loc=I, flag_a=DOWN)),
-        # Bob
-        piece("b1", b_loc_is(I), lambda c: upd(c, b_loc=W, flag_b=UP, turn=ALICE)),
-        piece(
-            "b2",
-            lambda c: c[1] == W and (c[4] == BOB or c[2] == DOWN),
-            lambda c: upd(c, b_loc=CS),
-        ),
-        piece("b3", b_loc_is(CS), lambda c: upd(c, b_loc=I, flag_b=DOWN)),
-    ]
-    return Soup(pieces=pieces, init=[mk(I, I, DOWN, DOWN, ALICE)])
+    return _spec(
+        [
+            # Alice
+            rule("a1", when={"a_loc": I}, then={"a_loc": W, "flag_a": UP, "turn": BOB}),
+            rule(
+                "a2",
+                when={"a_loc": W},
+                any_of=[{"turn": ALICE}, {"flag_b": DOWN}],
+                then={"a_loc": CS},
+            ),
+            rule("a3", when={"a_loc": CS}, then={"a_loc": I, "flag_a": DOWN}),
+            # Bob
+            rule(
+                "b1",
+                when={"b_loc": I},
+                then={"b_loc": W, "flag_b": UP, "turn": ALICE},
+            ),
+            rule(
+                "b2",
+                when={"b_loc": W},
+                any_of=[{"turn": BOB}, {"flag_a": DOWN}],
+                then={"b_loc": CS},
+            ),
+            rule("b3", when={"b_loc": CS}, then={"b_loc": I, "flag_b": DOWN}),
+        ],
+        symmetry=AB_SWAP_TURN,
+    )
+
+
+SPECS: Dict[str, Callable[[], Spec]] = {
+    "AB1": ab1_spec,
+    "AB2": ab2_spec,
+    "AB3": ab3_spec,
+    "AB4": ab4_spec,
+    "AB5": ab5_spec,
+}
+
+
+def get_spec(name: str) -> Spec:
+    """Spec déclaratif par identifiant 'AB1'..'AB5'."""
+    n = name.strip().upper()
+    if n not in SPECS:
+        raise ValueError(f"Modèle inconnu: {name}")
+    return SPECS[n]()
+
+
+_COMPILED: Dict[Tuple[str, bool], CompiledSemantics] = {}
+
+
+def get_semantics(name: str, packed: bool = False) -> CompiledSemantics:
+    """Sémantique compilée du modèle (fonctions de successeurs engendrées).
+
+    La compilation (génération + exec du code) est faite une fois par modèle:
+    la sémantique compilée est sans état, elle est partagée.
+    packed=True: configurations compactées dans un entier (packed_config.py),
+    qui s'indexent et s'affichent comme les tuples.
+    """
+    n = name.strip().upper()
+    sem = _COMPILED.get((n, packed))
+    if sem is None:
+        sem = _COMPILED[(n, packed)] = get_spec(n).compile(packed=packed)
+    return sem
+
+
+def make_ab1() -> Soup:
+    return ab1_spec().to_soup()
+
+
+def make_ab2() -> Soup:
+    return ab2_spec().to_soup()
+
+
+def make_ab3() -> Soup:
+    return ab3_spec().to_soup()
+
+
+def make_ab4() -> Soup:
+    return ab4_spec().to_soup()
+
+
+def make_ab5() -> Soup:
+    return ab5_spec().to_soup()
 
 
 def get_model(name: str) -> Soup:
     """Accès simple par identifiant 'AB1'..'AB5'."""
-    n = name.strip().upper()
-    if n == "AB1":
-        return make_ab1()
-    if n == "AB2":
-        return make_ab2()
-    if n == "AB3":
-        return make_ab3()
-    if n == "AB4":
-        return make_ab4()
-    if n == "AB5":
-        return make_ab5()
-    raise ValueError(f"Modèle inconnu: {name}")
+    return get_spec(name).to_soup()
+
+
+# Modèle paramétré à n processus
+
+
+FREE = "free"
+
+
+def make_mutex(n: int) -> Spec:
+    """n processus I -> W -> CS -> I autour d'un verrou partagé.
+
+    Configuration = (loc_0, ..., loc_{n-1}, lock), lock = FREE ou l'indice
+    du processus en section critique:
+      I  --t_i-->            W
+      W  --e_i [lock==FREE] / lock=i--> CS
+      CS --x_i / lock=FREE--> I
+    Symétrie: permutation des processus (ProcessSymmetry).
+    """
+    if n <= 0:
+        raise ValueError("n doit être > 0")
+    fields = tuple(f"p{i}" for i in range(n)) + ("lock",)
+    rules: List[Rule] = []
+    for i in range(n):
+        p = f"p{i}"
+        rules += [
+            rule(f"t{i}", when={p: I}, then={p: W}),
+            rule(f"e{i}", when={p: W, "lock": FREE}, then={p: CS, "lock": str(i)}),
+            rule(f"x{i}", when={p: CS}, then={p: I, "lock": FREE}),
+        ]
+    init = [tuple([I] * n) + (FREE,)]
+    sym = ProcessSymmetry(
+        fields, [(f"p{i}",) for i in range(n)], {"lock": [str(i) for i in range(n)]}
+    )
+    return Spec(fields, rules, init=init, sort_key=NATURAL, symmetry=sym)
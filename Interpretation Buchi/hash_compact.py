@@ -0,0 +1,104 @@
+"""Compaction par hachage: visited ne stocke que des empreintes.
+
+Chaque état est réduit à une empreinte de `bits` bits (state_hash), rangée
+dans une table à adressage ouvert (sondage linéaire) sur un `array`
+d'entiers de 32 ou 64 bits selon la largeur d'empreinte.
+Deux états distincts de même empreinte sont confondus (le second est omis):
+collision_probability() estime la probabilité qu'au moins une telle
+collision se soit produite.
+"""
+from __future__ import annotations
+
+from array import array
+from typing import Any, Optional, Tuple
+
+from state_hash import Encode, fingerprint
+
+_EMPTY = 0
+
+
+class HashCompactSet:
+    """Ensemble d'empreintes, interface compatible avec bfs (in / add / len)."""
+
+    def __init__(
+        self,
+        bits: int = 64,
+        capacity: int = 1 << 16,
+        max_load: float = 0.5,
+        encode: Encode = repr,
+    ) -> None:
+        if not 8 <= bits <= 64:
+            raise ValueError("bits doit être dans [8, 64]")
+        self.bits = bits
+        self.max_load = max_load
+        self.encode = encode
+        self.count = 0
+        # 4 octets par case suffisent jusqu'à 32 bits d'empreinte
+        self._code = "I" if bits <= 32 else "Q"
+        size = 1
+        while size < capacity:
+            size <<= 1
+        self._table = self._new_table(size)
+        self._mask = size - 1
+        self._last: Optional[Tuple[Any, int]] = None
+
+    def _new_table(self, size: int) -> array:
+        t = array(self._code)
+        t.frombytes(bytes(t.itemsize * size))
+        return t
+
+    def _fp(self, state: Any) -> int:
+        last = self._last
+        if last is not None and last[0] is state:
+            return last[1]
+        fp = fingerprint(state, self.bits, self.encode) or 1  # 0 = case vide
+        self._last = (state, fp)
+        return fp
+
+    def _slot(self, fp: int) -> int:
+        table, mask = self._table, self._mask
+        i = fp & mask
+        while True:
+            v = table[i]
+            if v == fp or v == _EMPTY:
+                return i
+            i = (i + 1) & mask
+
+    def __contains__(self, state: Any) -> bool:
+        fp = self._fp(state)
+        return self._table[self._slot(fp)] == fp
+
+    def add(self, state: Any) -> None:
+        fp = self._fp(state)
+        i = self._slot(fp)
+        if self._table[i] == fp:
+            return
+        self._table[i] = fp
+        self.count += 1
+        if self.count > self.max_load * (self._mask + 1):
+            self._grow()
+
+    def _grow(self) -> None:
+        old = self._table
+        size = 2 * len(old)
+        self._table = self._new_table(size)
+        self._mask = size - 1
+        for fp in old:
+            if fp != _EMPTY:
+                self._table[self._slot(fp)] = fp
+
+    def __len__(self) -> int:
+        return self.count
+
+    def collision_probability(self) -> float:
+        """Borne (paradoxe des anniversaires) sur P(au moins une collision)."""
+        n = self.count
+        return min(1.0, n * (n - 1) / 2 / float(1 << self.bits))
+
+    def stats(self) -> dict:
+        return {
+            "states": self.count,
+            "fingerprint_bits": self.bits,
+            "table_bytes": self._table.itemsize * len(self._table),
+            "collision_probability": self.collision_probability(),
+        }
@@ -1,6 +1,34 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Set, Tuple
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+# Propositions atomiques (compute_ap de verify_buchi_alice_bob.py): une valeur
+# de Step.ap est un masque de bits, bit i <=> AP_NAMES[i] vraie.
+AP_NAMES: Tuple[str, ...] = (
+    "aCS",
+    "bCS",
+    "cond",
+    "q",
+    "deadlock",
+    "p0",
+    "q0",
+    "p1",
+    "q1",
+    "aW",
+    "bW",
+    "aNI",
+    "bNI",
+)
+AP_BIT: Dict[str, int] = {name: 1 << i for i, name in enumerate(AP_NAMES)}
+
+
+def ap_mask(values: Mapping[str, bool]) -> int:
+    """Masque des propositions vraies de values (nom -> booléen)."""
+    out = 0
+    for name, v in values.items():
+        if v:
+            out |= AP_BIT[name]
+    return out
 
 
 @dataclass(frozen=True)
@@ -12,7 +40,7 @@ class Step:
     src: Any
     action: str
     tgt: Any
-    ap: Dict[str, bool]
+    ap: int  # masque de bits des propositions vraies sur tgt (AP_BIT)
 
 
 @dataclass(frozen=True)
@@ -28,6 +56,11 @@ class BuchiProperty:
     - actions(step, state) -> list of enabled PropAction
     - execute(action, step, state) -> next state (int)
     - accepting_states: set of accepting states
+
+    Les gardes ne dépendent du step que par ses propositions atomiques
+    (step.ap). `aps` nomme celles qu'elles lisent (toutes par défaut): la
+    propriété est compilée en une table (état, masque des aps) -> actions
+    déjà triées, et actions() ne fait plus qu'une recherche.
     """
 
     def __init__(
@@ -36,11 +69,22 @@ class BuchiProperty:
         initial_states: List[int],
         accepting_states: Set[int],
         transitions: Dict[int, List[Tuple[str, Callable[[Step], bool], int]]],
+        aps: Optional[Sequence[str]] = None,
     ) -> None:
         self.name = name
         self._initial_states = list(initial_states)
         self.accepting_states = set(accepting_states)
         self._transitions = transitions
+        bits = [AP_BIT[a] for a in (AP_NAMES if aps is None else aps)]
+        self._used = sum(bits)
+        self._table: Dict[int, Dict[int, List[PropAction]]] = {
+            st: {} for st in transitions
+        }
+        for k in range(1 << len(bits)):
+            mask = sum(b for j, b in enumerate(bits) if k >> j & 1)
+            step = Step(src=None, action="", tgt=None, ap=mask)
+            for st, row in self._table.items():
+                row[mask] = self._evaluate(step, st)
 
     def initial(self) -> List[int]:
         return list(self._initial_states)
@@ -49,6 +93,13 @@ class BuchiProperty:
         return st in self.accepting_states
 
     def actions(self, step: Step, st: int) -> List[PropAction]:
+        """Actions activées (table compilée; liste partagée, ne pas modifier)."""
+        row = self._table.get(st)
+        if row is None:
+            return []
+        return row[step.ap & self._used]
+
+    def _evaluate(self, step: Step, st: int) -> List[PropAction]:
         out: List[PropAction] = []
         for lbl, guard, tgt in self._transitions.get(st, []):
             if guard(step):
@@ -63,7 +114,7 @@ class BuchiProperty:
 
 # Atomic proposition helpers (read from step.ap)
 def ap(step: Step, key: str) -> bool:
-    return bool(step.ap.get(key, False))
+    return bool(step.ap & AP_BIT[key])
 
 
 # Buchi properties
@@ -83,6 +134,7 @@ def prop_P1_exclusion_violation() -> BuchiProperty:
                 ("true", lambda s: True, 0),
             ],
         },
+        aps=("cond",),
     )
 
 
@@ -101,6 +153,7 @@ def prop_P2_deadlock_violation() -> BuchiProperty:
                 ("true", lambda s: True, 0),
             ],
         },
+        aps=("deadlock",),
     )
 
 
@@ -124,6 +177,7 @@ def prop_P3_at_least_one_in_violation() -> BuchiProperty:
                 ("!q", lambda s: not ap(s, "q"), Y),
             ],
         },
+        aps=("q",),
     )
 
 
@@ -149,6 +203,7 @@ def prop_P4_if_wants_then_gets_in_violation() -> BuchiProperty:
                 ("!q1", lambda s: not ap(s, "q1"), B_BAD),
             ],
         },
+        aps=("p0", "q0", "p1", "q1"),
     )
 
 
@@ -182,6 +237,7 @@ def prop_P5_uncontested_progress_violation() -> BuchiProperty:
                 ("!bCS", lambda s: not ap(s, "bCS"), B_BAD),
             ],
         },
+        aps=("aCS", "bCS", "aW", "bW", "aNI", "bNI"),
     )
 
 
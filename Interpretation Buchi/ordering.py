@@ -0,0 +1,88 @@
+"""Protocole d'ordre déterministe des frontières.
+
+Une sémantique (ou un graphe) peut déclarer:
+  - sort_key:   ordre des états successeurs
+  - action_key: ordre des actions
+
+Valeurs possibles:
+  - REPR      : tri par repr (défaut historique, valable pour tout état)
+  - NATURAL   : tri par l'ordre naturel des valeurs (tuples de str/int...),
+                sans construire de chaîne
+  - UNORDERED : pas de tri, la sémantique produit déjà un ordre canonique
+  - une fonction clé quelconque
+Dans tous les cas l'ordre de parcours reste reproductible d'une exécution
+à l'autre.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, List, Optional, Union
+
+
+class _Unordered:
+    def __repr__(self) -> str:
+        return "UNORDERED"
+
+
+REPR: Callable[[Any], str] = repr
+NATURAL = None
+UNORDERED: Any = _Unordered()
+
+SortKey = Union[None, Callable[[Any], Any], _Unordered]
+
+
+def action_name(a: Any) -> str:
+    try:
+        return a.name
+    except AttributeError:
+        return repr(a)
+
+
+def state_order(obj: Any) -> SortKey:
+    """Ordre des états déclaré par `obj` (REPR par défaut)."""
+    return getattr(obj, "sort_key", REPR)
+
+
+def action_order(obj: Any) -> SortKey:
+    """Ordre des actions déclaré par `obj` (par nom par défaut)."""
+    return getattr(obj, "action_key", action_name)
+
+
+def sort_in_place(xs: List[Any], key: SortKey) -> None:
+    if key is UNORDERED:
+        return
+    xs.sort(key=key)  # type: ignore[arg-type]
+
+
+def sorted_by(xs: Any, key: SortKey) -> List[Any]:
+    out = list(xs)
+    sort_in_place(out, key)
+    return out
+
+
+def _as_callable(key: SortKey) -> Optional[Callable[[Any], Any]]:
+    if key is UNORDERED:
+        return lambda _x: 0  # tri stable: conserve l'ordre de génération
+    if key is NATURAL:
+        return lambda x: x
+    return key  # type: ignore[return-value]
+
+
+def first_order(key: SortKey) -> SortKey:
+    """Ordre (stable) sur des couples (x, y) selon x seul."""
+    if key is UNORDERED:
+        return UNORDERED
+    k = _as_callable(key)
+    return lambda p: k(p[0])  # type: ignore[misc]
+
+
+def pair_order(lkey: SortKey, rkey: SortKey) -> SortKey:
+    """Ordre sur des couples (l, r) à partir des ordres de chaque côté."""
+    if lkey is REPR or rkey is REPR:
+        return REPR
+    if lkey is NATURAL and rkey is NATURAL:
+        return NATURAL
+    if lkey is UNORDERED and rkey is UNORDERED:
+        return UNORDERED
+    kl = _as_callable(lkey)
+    kr = _as_callable(rkey)
+    return lambda c: (kl(c[0]), kr(c[1]))  # type: ignore[misc]
@@ -0,0 +1,136 @@
+"""Configurations compactées dans un entier (champs codés sur quelques bits).
+
+Un Codec associe à chaque champ d'une configuration (tuple) un domaine fini
+de valeurs; la configuration devient un entier où chaque champ occupe
+ceil(log2(|domaine|)) bits, le premier champ en poids fort.
+
+Les entiers produits sont des PackedConfig (sous-classe de int, sans
+__dict__) qui restent lisibles comme des tuples:
+  - cfg[i], len(cfg), itération, déballage: valeurs décodées du champ;
+  - repr(cfg) == repr(decode(cfg)): traces, rapports et empreintes
+    (state_hash) identiques à ceux des tuples;
+  - hash / égalité: ceux de l'entier (un seul mot, pas de hachage de
+    chaînes).
+Les codes d'un champ suivent l'ordre naturel de ses valeurs (quand elles
+sont comparables): l'ordre des entiers coïncide alors avec l'ordre
+lexicographique des tuples, et sort_key=NATURAL donne le même parcours.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+
+def _ordered(values: Sequence[Any]) -> List[Any]:
+    out = list(dict.fromkeys(values))
+    try:
+        out.sort()
+    except TypeError:
+        pass  # valeurs non comparables: ordre de première apparition
+    return out
+
+
+class PackedConfig(int):
+    """Configuration compactée (voir le docstring du module).
+
+    Classe de base: chaque Codec en dérive une sous-classe qui porte le
+    codec (attribut de classe), les instances ne stockent que l'entier.
+    """
+
+    __slots__ = ()
+    codec: "Codec"
+
+    def __getitem__(self, i: Any) -> Any:
+        if isinstance(i, slice):
+            return self.codec.decode(self)[i]
+        c = self.codec
+        return c.domains[i][(self >> c.shifts[i]) & c.masks[i]]
+
+    def __len__(self) -> int:
+        return len(self.codec.fields)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.codec.decode(self))
+
+    def __repr__(self) -> str:
+        return repr(self.codec.decode(self))
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (_unpickle, (self.codec, int(self)))
+
+
+def _unpickle(codec: "Codec", value: int) -> PackedConfig:
+    return codec.type(value)
+
+
+class Codec:
+    """Codage bit à bit des configurations à champs de domaines finis."""
+
+    def __init__(
+        self, fields: Sequence[str], domains: Sequence[Sequence[Any]]
+    ) -> None:
+        if len(fields) != len(domains):
+            raise ValueError("un domaine par champ")
+        self.fields: Tuple[str, ...] = tuple(fields)
+        self.domains: List[Tuple[Any, ...]] = [tuple(_ordered(d)) for d in domains]
+        self.codes: List[Dict[Any, int]] = [
+            {v: k for k, v in enumerate(d)} for d in self.domains
+        ]
+        # un domaine à une seule valeur n'occupe aucun bit
+        self.widths: List[int] = [(len(d) - 1).bit_length() for d in self.domains]
+        self.shifts: List[int] = []
+        shift = sum(self.widths)
+        self.bits = shift
+        for w in self.widths:
+            shift -= w
+            self.shifts.append(shift)
+        self.masks: List[int] = [(1 << w) - 1 for w in self.widths]
+        self.type = type(
+            "PackedConfig", (PackedConfig,), {"__slots__": (), "codec": self}
+        )
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (Codec, (self.fields, self.domains))
+
+    def index(self, field: str) -> int:
+        return self.fields.index(field)
+
+    def code(self, field: str, value: Any) -> int:
+        """Code (non décalé) de `value` dans le champ `field`."""
+        i = self.index(field)
+        try:
+            return self.codes[i][value]
+        except KeyError:
+            raise ValueError(f"valeur hors domaine pour {field}: {value!r}") from None
+
+    def bits_of(self, tests: Sequence[Tuple[str, Any]]) -> Tuple[int, int]:
+        """(masque, valeur) des tests champ == valeur: cfg & masque == valeur."""
+        mask = value = 0
+        for f, v in tests:
+            i = self.index(f)
+            mask |= self.masks[i] << self.shifts[i]
+            value |= self.code(f, v) << self.shifts[i]
+        return mask, value
+
+    def encode(self, config: Sequence[Any]) -> PackedConfig:
+        if len(config) != len(self.fields):
+            raise ValueError(
+                f"configuration de taille {len(config)} != {len(self.fields)}"
+            )
+        x = 0
+        for i, v in enumerate(config):
+            try:
+                x |= self.codes[i][v] << self.shifts[i]
+            except KeyError:
+                raise ValueError(
+                    f"valeur hors domaine pour {self.fields[i]}: {v!r}"
+                ) from None
+        return self.type(x)
+
+    def decode(self, packed: int) -> Tuple[Any, ...]:
+        return tuple(
+            d[(packed >> s) & m]
+            for d, s, m in zip(self.domains, self.shifts, self.masks)
+        )
+
+    def __repr__(self) -> str:
+        return f"Codec({len(self.fields)} champs, {self.bits} bits)"
@@ -0,0 +1,287 @@
+"""Soup déclarative compilée en fonctions de successeurs spécialisées.
+
+Une configuration est un tuple dont les champs sont nommés (Spec.fields).
+Chaque règle (Rule) est déclarative:
+  - when:   conjonction de tests champ == valeur
+  - any_of: disjonction (optionnelle) de telles conjonctions
+  - then:   affectations champ := valeur
+Exemple (Peterson, Alice entre en section critique):
+    rule("a2", when={"a_loc": W}, any_of=[{"turn": ALICE}, {"flag_b": DOWN}],
+         then={"a_loc": CS})
+
+Spec.compile() engendre le code source Python d'un modèle entier:
+  - enabled(c):    règles activables, dans l'ordre du programme;
+  - successors(c): couples (règle, successeur), un seul appel par état;
+  - une fonction d'effet par règle (pour execute).
+Les gardes et effets ne passent donc plus par des lambdas: un état coûte un
+appel de fonction et quelques comparaisons. Les ensembles de champs lus /
+écrits de chaque règle (Rule.reads / Rule.writes) sont connus statiquement.
+
+Spec.to_soup() donne le Soup équivalent (pièces à garde indexée), pour les
+outils qui manipulent des Soup.
+
+Spec.compile(packed=True) engendre la même sémantique sur des configurations
+compactées (packed_config.py): une conjonction de tests devient
+`c & masque == valeur`, un effet `c & garde | posés`; les états restent
+lisibles comme des tuples (indexation, repr).
+"""
+from __future__ import annotations
+
+import keyword
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from language_semantics import LanguageSemantics
+from ordering import REPR, SortKey
+from packed_config import Codec
+from soup_lang import Piece, Soup
+
+Config = Tuple[Any, ...]
+Tests = Tuple[Tuple[str, Any], ...]  # conjonction de champ == valeur
+
+
+@dataclass(frozen=True, eq=False)
+class Rule:
+    """Règle déclarative (voir le docstring du module).
+
+    Égalité par identité: deux règles de même contenu restent deux actions.
+    """
+
+    name: str
+    when: Tests = ()
+    then: Tests = ()
+    any_of: Tuple[Tests, ...] = ()
+
+    @property
+    def reads(self) -> FrozenSet[str]:
+        out = {f for f, _ in self.when}
+        for alt in self.any_of:
+            out.update(f for f, _ in alt)
+        return frozenset(out)
+
+    @property
+    def writes(self) -> FrozenSet[str]:
+        return frozenset(f for f, _ in self.then)
+
+    def __repr__(self) -> str:
+        return f"Rule({self.name})"
+
+
+def rule(
+    name: str,
+    when: Optional[Mapping[str, Any]] = None,
+    then: Optional[Mapping[str, Any]] = None,
+    any_of: Sequence[Mapping[str, Any]] = (),
+) -> Rule:
+    return Rule(
+        name=name,
+        when=tuple((when or {}).items()),
+        then=tuple((then or {}).items()),
+        any_of=tuple(tuple(alt.items()) for alt in any_of),
+    )
+
+
+@dataclass
+class Spec:
+    """Programme déclaratif: champs nommés, règles, configurations initiales.
+
+    symmetry: groupe de permutations des champs qui préserve les transitions
+    (symmetry.PermutationGroup / ProcessSymmetry), None si aucun.
+    """
+
+    fields: Tuple[str, ...]
+    rules: List[Rule]
+    init: List[Config]
+    sort_key: SortKey = REPR
+    symmetry: Any = None
+    _compiled: Dict[bool, Any] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def index(self, name: str) -> int:
+        return self.fields.index(name)
+
+    def domains(self) -> List[List[Any]]:
+        """Valeurs de chaque champ: états initiaux et constantes des règles."""
+        out: List[List[Any]] = [[] for _ in self.fields]
+        for c in self.init:
+            for i, v in enumerate(c):
+                out[i].append(v)
+        for r in self.rules:
+            for f, v in r.when + r.then + tuple(t for a in r.any_of for t in a):
+                out[self.index(f)].append(v)
+        return [list(dict.fromkeys(d)) for d in out]
+
+    def codec(self) -> Codec:
+        """Codage compact des configurations (packed_config.Codec)."""
+        return Codec(self.fields, self.domains())
+
+    def compile(self, packed: bool = False) -> "CompiledSemantics":
+        sem = self._compiled.get(packed)
+        if sem is None:
+            codec = self.codec() if packed else None
+            sem = self._compiled[packed] = CompiledSemantics(self, codec)
+        return sem
+
+    def to_soup(self) -> Soup:
+        """Soup équivalent: garde indexée sur le premier test de when."""
+        sem = self.compile()
+        pieces: List[Piece] = []
+        for r in self.rules:
+            on = None
+            if r.when:
+                f, v = r.when[0]
+                on = (self.index(f), v)
+            residual = None if sem.residual_is_true(r) else sem.guard_fn(r)
+            pieces.append(Piece(r.name, sem.effect_fn(r), residual, on))
+        return Soup(
+            pieces=pieces, init=list(self.init), sort_key=self.sort_key, immutable=True
+        )
+
+
+class _Codegen:
+    """Génération du code source d'un Spec (constantes passées par nom)."""
+
+    def __init__(self, spec: Spec, codec: Optional[Codec] = None) -> None:
+        for f in spec.fields:
+            if not f.isidentifier() or keyword.iskeyword(f):
+                raise ValueError(f"nom de champ invalide: {f!r}")
+        unknown = {
+            f
+            for r in spec.rules
+            for f in r.reads | r.writes
+            if f not in spec.fields
+        }
+        if unknown:
+            raise ValueError(f"champs inconnus: {sorted(unknown)}")
+        self.spec = spec
+        self.codec = codec
+        self.env: Dict[str, Any] = {}
+        self._consts: Dict[Tuple[type, Any], str] = {}
+        if codec is not None:
+            self.env["_P"] = codec.type
+
+    def const(self, value: Any) -> str:
+        key = (type(value), value)
+        name = self._consts.get(key)
+        if name is None:
+            name = self._consts[key] = f"_v{len(self._consts)}"
+            self.env[name] = value
+        return name
+
+    def header(self, name: str) -> List[str]:
+        if self.codec is not None:
+            return [f"def {name}(c):"]  # tests directement sur l'entier c
+        names = ", ".join(f"f_{f}" for f in self.spec.fields)
+        return [f"def {name}(c):", f"    ({names},) = c"]
+
+    def conj(self, tests: Tests) -> str:
+        if not tests:
+            return "True"  # alternative any_of vide: toujours vraie
+        if self.codec is not None:
+            mask, value = self.codec.bits_of(tests)
+            return f"c & {mask:#x} == {value:#x}"
+        return " and ".join(f"f_{f} == {self.const(v)}" for f, v in tests)
+
+    def cond(self, r: Rule, residual_only: bool = False) -> str:
+        parts = [] if residual_only else ([self.conj(r.when)] if r.when else [])
+        if residual_only and len(r.when) > 1:
+            parts.append(self.conj(r.when[1:]))
+        if r.any_of:
+            parts.append("(" + " or ".join(f"({self.conj(a)})" for a in r.any_of) + ")")
+        return " and ".join(parts) or "True"
+
+    def target(self, r: Rule) -> str:
+        if self.codec is not None:
+            mask, value = self.codec.bits_of(r.then)
+            keep = ((1 << self.codec.bits) - 1) & ~mask
+            return f"_P(c & {keep:#x} | {value:#x})"
+        new = dict(r.then)
+        items = [
+            self.const(new[f]) if f in new else f"f_{f}" for f in self.spec.fields
+        ]
+        return "(" + ", ".join(items) + ",)"
+
+    def source(self) -> str:
+        rules = self.spec.rules
+        for i, r in enumerate(rules):
+            self.env[f"_r{i}"] = r
+        lines = self.header("enabled") + ["    out = []"]
+        for i, r in enumerate(rules):
+            lines += [f"    if {self.cond(r)}:", f"        out.append(_r{i})"]
+        lines += ["    return out", ""] + self.header("successors")
+        lines.append("    out = []")
+        for i, r in enumerate(rules):
+            lines += [
+                f"    if {self.cond(r)}:",
+                f"        out.append((_r{i}, {self.target(r)}))",
+            ]
+        lines += ["    return out", ""]
+        for i, r in enumerate(rules):
+            lines += self.header(f"_e{i}") + [f"    return {self.target(r)}"]
+            lines += self.header(f"_g{i}")
+            lines += [f"    return {self.cond(r, residual_only=True)}", ""]
+        return "\n".join(lines)
+
+
+class CompiledSemantics(LanguageSemantics):
+    """Sémantique d'un Spec, exécutée par le code engendré.
+
+    successors(state) renvoie les couples (règle, successeur) dans l'ordre
+    de actions(state) (une règle = un successeur); LS2RG l'utilise pour ne
+    faire qu'un appel par état.
+    """
+
+    immutable = True
+
+    def __init__(self, spec: Spec, codec: Optional[Codec] = None) -> None:
+        self.spec = spec
+        self.codec = codec
+        self.sort_key = spec.sort_key
+        gen = _Codegen(spec, codec)
+        self.source = gen.source()
+        env = gen.env
+        exec(compile(self.source, f"<soup_dsl {len(spec.rules)} règles>", "exec"), env)
+        self._enabled: Callable[[Config], List[Rule]] = env["enabled"]
+        self.successors: Callable[[Config], List[Tuple[Rule, Config]]] = env[
+            "successors"
+        ]
+        self._effects = {r: env[f"_e{i}"] for i, r in enumerate(spec.rules)}
+        self._guards = {r: env[f"_g{i}"] for i, r in enumerate(spec.rules)}
+
+    def initials(self) -> List[Config]:
+        if self.codec is not None:
+            return [self.codec.encode(c) for c in self.spec.init]
+        return list(self.spec.init)
+
+    def actions(self, state: Config) -> List[Rule]:
+        return self._enabled(state)
+
+    def execute(self, state: Config, action: Rule) -> List[Config]:
+        return [self._effects[action](state)]
+
+    def effect_fn(self, r: Rule) -> Callable[[Config], Config]:
+        return self._effects[r]
+
+    def guard_fn(self, r: Rule) -> Callable[[Config], bool]:
+        """Garde résiduelle (tests de when hors du premier, any_of)."""
+        return self._guards[r]
+
+    def residual_is_true(self, r: Rule) -> bool:
+        return len(r.when) <= 1 and not r.any_of
+
+    def reads(self) -> Dict[str, FrozenSet[str]]:
+        return {r.name: r.reads for r in self.spec.rules}
+
+    def writes(self) -> Dict[str, FrozenSet[str]]:
+        return {r.name: r.writes for r in self.spec.rules}
@@ -2,26 +2,52 @@
 from __future__ import annotations
 
 from copy import deepcopy
-from dataclasses import dataclass
-from typing import Any, Callable, Iterable, List, Sequence
+from operator import itemgetter
+from dataclasses import dataclass, fields, is_dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from language_semantics import LanguageSemantics
+from ordering import REPR, SortKey
 
 
 Guard = Callable[[Any], bool]
 Effect = Callable[[Any], Any]
+Index = Tuple[int, Any]  # (indice de champ de l'état, valeur)
+
+_ATOMS = (str, int, float, complex, bool, bytes, type(None), Enum)
+
+
+def is_immutable(value: Any) -> bool:
+    """Vrai si value est profondément immuable (scalaires, tuples, frozenset,
+    dataclasses gelées de valeurs immuables)."""
+    if isinstance(value, _ATOMS):
+        return True
+    if isinstance(value, (tuple, frozenset)):
+        return all(is_immutable(v) for v in value)
+    if is_dataclass(value) and value.__dataclass_params__.frozen:
+        return all(is_immutable(getattr(value, f.name)) for f in fields(value))
+    return False
 
 
 @dataclass
 class Piece:
-    """Une règle: si guard(state) alors on peut appliquer effect(state)."""
+    """Une règle: si guard(state) alors on peut appliquer effect(state).
+
+    on: garde indexée (i, v), la pièce n'est activable que si state[i] == v;
+    SoupSemantics s'en sert pour ne présenter que les pièces candidates.
+    guard est alors la garde résiduelle (None = toujours vraie).
+    """
 
     name: str
     effect: Effect
-    guard: Guard
+    guard: Optional[Guard] = None
+    on: Optional[Index] = None
 
     def enabled(self, state: Any) -> bool:
-        return bool(self.guard(state))
+        if self.on is not None and state[self.on[0]] != self.on[1]:
+            return False
+        return self.guard is None or bool(self.guard(state))
 
     def apply(self, state: Any) -> Any:
         return self.effect(state)
@@ -32,10 +58,18 @@ class Piece:
 
 @dataclass
 class Soup:
-    """Un programme: une liste de pièces + un ensemble d'états initiaux."""
+    """Un programme: une liste de pièces + un ensemble d'états initiaux.
+
+    sort_key: ordre des états utilisé pour l'exploration (voir ordering.py).
+    immutable: True si les états sont des valeurs immuables (pas de copie
+    défensive dans execute), False pour toujours copier, None pour le
+    détecter sur les états initiaux (voir SoupSemantics).
+    """
 
     pieces: List[Piece]
     init: List[Any]
+    sort_key: SortKey = REPR
+    immutable: Optional[bool] = None
 
     def __repr__(self) -> str:
         names = [p.name for p in self.pieces]
@@ -50,18 +84,61 @@ class SoupSemantics(LanguageSemantics):
       - execute(state, action) applique une pièce et renvoie une liste de successeurs
 
     Note: on utilise deepcopy pour éviter les effets de bord si l'état ou le résultat est mutable.
+    Si les états sont immuables (program.immutable, ou détecté sur les états
+    initiaux quand il vaut None), les copies sont inutiles et omises: un
+    effet ne peut que construire un nouvel état.
+
+    check_mutation: mode débogage, vérifie après chaque effet que l'état
+    d'entrée n'a pas été modifié (RuntimeError sinon).
+
+    Gardes indexées (Piece.on): les pièces candidates pour une combinaison de
+    valeurs des champs indexés sont calculées une fois (table de dispatch,
+    dans l'ordre du programme); seules leurs gardes résiduelles sont évaluées.
     """
 
-    def __init__(self, program: Soup):
+    def __init__(self, program: Soup, check_mutation: bool = False):
         self.program = program
+        self.sort_key = program.sort_key
+        self.check_mutation = check_mutation
+        if program.immutable is None:
+            self.immutable = all(is_immutable(s) for s in program.init)
+        else:
+            self.immutable = program.immutable
+        fields_ = sorted({p.on[0] for p in program.pieces if p.on is not None})
+        self._index_key = itemgetter(*fields_) if fields_ else None
+        self._dispatch: Dict[Any, List[Piece]] = {}
 
     def initials(self) -> List[Any]:
         return list(self.program.init)
 
     def actions(self, state: Any) -> List[Piece]:
-        return [p for p in self.program.pieces if p.enabled(state)]
+        if self._index_key is None:
+            return [p for p in self.program.pieces if p.enabled(state)]
+
+        key = self._index_key(state)
+        candidates = self._dispatch.get(key)
+        if candidates is None:
+            candidates = [
+                p
+                for p in self.program.pieces
+                if p.on is None or state[p.on[0]] == p.on[1]
+            ]
+            self._dispatch[key] = candidates
+        return [p for p in candidates if p.guard is None or p.guard(state)]
 
     def execute(self, state: Any, action: Piece) -> Iterable[Any]:
+        if self.check_mutation:
+            before = deepcopy(state)
+            result = action.apply(state)
+            if state != before:
+                raise RuntimeError(
+                    f"{action.name}: l'effet a modifié son état d'entrée {before!r}"
+                )
+            return [result if self.immutable else deepcopy(result)]
+
+        if self.immutable:
+            return [action.apply(state)]
+
         # Copie défensive (utile si state est mutable, même si guard/effect ne modifient pas)
         state_copy = deepcopy(state)
 
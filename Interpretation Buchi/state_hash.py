@@ -0,0 +1,27 @@
+"""Empreintes d'états stables (indépendantes de PYTHONHASHSEED).
+
+hash() sur des tuples de chaînes change d'un processus à l'autre; les
+structures qui ne gardent que des empreintes (bitstate, hash compaction)
+utilisent donc un condensé blake2b de l'encodage texte de l'état
+(repr par défaut), reproductible entre exécutions.
+"""
+from __future__ import annotations
+
+from hashlib import blake2b
+from typing import Any, Callable, Tuple
+
+Encode = Callable[[Any], str]
+
+
+def digest128(state: Any, encode: Encode = repr) -> Tuple[int, int]:
+    """Deux mots de 64 bits indépendants pour `state`."""
+    d = blake2b(encode(state).encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(d[:8], "little"), int.from_bytes(d[8:], "little")
+
+
+def fingerprint(state: Any, bits: int = 64, encode: Encode = repr) -> int:
+    """Empreinte de `bits` bits (1..64) de `state`."""
+    if not 1 <= bits <= 64:
+        raise ValueError("bits doit être dans [1, 64]")
+    h, _ = digest128(state, encode)
+    return h >> (64 - bits)
@@ -1,23 +1,42 @@
 from __future__ import annotations
 import argparse
 import importlib
-from collections import deque
+import os
+from collections import OrderedDict, deque
 from dataclasses import dataclass
-from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
-from isoup_buchi_alice_bob import PROPERTIES, BuchiProperty, PropAction, Step
-from soup_lang import SoupSemantics
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+from checkpoint import Checkpointer
+from hash_compact import HashCompactSet
+from isoup_buchi_alice_bob import PROPERTIES, BuchiProperty, PropAction, Step, ap_mask
+from ordering import sort_in_place, state_order
+from telemetry import Telemetry, TimedSemantics
 
 CANDIDATE_MODEL_MODULES = ["alice_bob_soup_models"]
 
+# Taille par défaut du cache des pas système (configurations mémorisées)
+STEP_CACHE = 1 << 16
 
-def load_system(model_name: str) -> Any:
+
+def load_system(model_name: str, packed: bool = False) -> Any:
     """
-    Charge un modèle ABk depuis alice_bob_soup_models.get_model()
-    puis l'enveloppe dans SoupSemantics pour avoir initials/actions/execute.
+    Charge un modèle ABk depuis alice_bob_soup_models.get_semantics():
+    sémantique compilée (soup_dsl) avec initials/actions/execute.
+    packed=True: configurations compactées dans un entier (packed_config.py),
+    indexables comme des tuples (compute_ap, traces inchangés).
     """
     m = importlib.import_module("alice_bob_soup_models")
-    soup = m.get_model(model_name)  # retourne un Soup
-    return SoupSemantics(soup)  # retourne la sémantique exécutable
+    return m.get_semantics(model_name, packed)  # retourne la sémantique exécutable
 
 
 def sys_initials(sys: Any) -> List[Any]:
@@ -72,7 +91,8 @@ def tup_get(cfg: Any, i: int, default: Any) -> Any:
         return default
 
 
-def compute_ap(sys: Any, cfg: Any) -> Dict[str, bool]:
+def compute_ap(sys: Any, cfg: Any) -> int:
+    """Masque de bits des propositions atomiques vraies sur cfg (AP_BIT)."""
     a_loc = tup_get(cfg, 0, None)
     b_loc = tup_get(cfg, 1, None)
     flagA = tup_get(cfg, 2, "DOWN")
@@ -96,21 +116,23 @@ def compute_ap(sys: Any, cfg: Any) -> Dict[str, bool]:
     aNI = flagA == "DOWN"
     bNI = flagB == "DOWN"
 
-    return {
-        "aCS": aCS,
-        "bCS": bCS,
-        "cond": aCS and bCS,
-        "q": q,
-        "deadlock": deadlock,
-        "p0": p0,
-        "q0": q0,
-        "p1": p1,
-        "q1": q1,
-        "aW": aW,
-        "bW": bW,
-        "aNI": aNI,
-        "bNI": bNI,
-    }
+    return ap_mask(
+        {
+            "aCS": aCS,
+            "bCS": bCS,
+            "cond": aCS and bCS,
+            "q": q,
+            "deadlock": deadlock,
+            "p0": p0,
+            "q0": q0,
+            "p1": p1,
+            "q1": q1,
+            "aW": aW,
+            "bW": bW,
+            "aNI": aNI,
+            "bNI": bNI,
+        }
+    )
 
 
 # Buchi product exploration + accepting cycle search
@@ -123,43 +145,78 @@ class Edge:
     prop_label: str
 
 
-def build_reachable_product(sys: Any, prop: BuchiProperty) -> Tuple[
-    Set[Node],
-    Dict[Node, List[Tuple[Node, Edge]]],
-    Dict[Node, Tuple[Optional[Node], Edge]],
-]:
-    visited: Set[Node] = set()
-    adj: Dict[Node, List[Tuple[Node, Edge]]] = {}
-    parent: Dict[Node, Tuple[Optional[Node], Edge]] = {}
+class ProductSteps:
+    """Successeurs des nœuds du produit système × propriété.
 
-    q: Deque[Node] = deque()
+    cache_size: cache LRU des pas système (clé = configuration). Une
+    configuration est associée à plusieurs états de la propriété: ses
+    actions, cibles et propositions atomiques ne sont calculées qu'une fois
+    pour tous ces nœuds. 0 = pas de cache, None = cache non borné.
 
-    for s0 in sys_initials(sys):
-        init_step = Step(src=s0, action="init", tgt=s0, ap=compute_ap(sys, s0))
-        for p0 in prop.initial():
-            pacts = prop.actions(init_step, p0)
-            # safety: if property has no enabled transition, keep p0
-            if not pacts:
-                n0 = (s0, p0)
-                if n0 not in visited:
-                    visited.add(n0)
-                    parent[n0] = (None, Edge("init", "epsilon"))
-                    q.append(n0)
-                continue
+    observer: télémétrie (telemetry.py); le temps des actions / execute du
+    système et du tri des cibles y est mesuré.
+    """
 
-            for pa in pacts:
-                p1 = prop.execute(pa, init_step, p0)
-                n0 = (s0, p1)
-                if n0 not in visited:
-                    visited.add(n0)
-                    parent[n0] = (None, Edge("init", pa.label))
-                    q.append(n0)
+    def __init__(
+        self,
+        sys: Any,
+        prop: BuchiProperty,
+        cache_size: Optional[int] = STEP_CACHE,
+        observer: Optional[Telemetry] = None,
+    ) -> None:
+        # ordre des cibles déclaré par le système (repr par défaut, cf. ordering.py)
+        self.key = state_order(sys)
+        self.sys = sys if observer is None else TimedSemantics(sys, observer)
+        self.prop = prop
+        self.observer = observer
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Any, List[Step]]" = OrderedDict()
+
+    def initial_nodes(self) -> List[Tuple[Node, Edge]]:
+        """Nœuds initiaux avec l'arête "init" qui les produit (doublons inclus)."""
+        sys, prop = self.sys, self.prop
+        out: List[Tuple[Node, Edge]] = []
+        for s0 in sys_initials(sys):
+            init_step = Step(src=s0, action="init", tgt=s0, ap=compute_ap(sys, s0))
+            for p0 in prop.initial():
+                pacts = prop.actions(init_step, p0)
+                # safety: if property has no enabled transition, keep p0
+                if not pacts:
+                    out.append(((s0, p0), Edge("init", "epsilon")))
+                    continue
+                for pa in pacts:
+                    p1 = prop.execute(pa, init_step, p0)
+                    out.append(((s0, p1), Edge("init", pa.label)))
+        return out
 
-    while q:
-        node = q.popleft()
+    def successors(self, node: Node) -> List[Tuple[Node, Edge]]:
         s, pst = node
-
+        prop = self.prop
         outs: List[Tuple[Node, Edge]] = []
+        for step in self.steps(s):
+            for pa in prop.actions(step, pst):
+                pst2 = prop.execute(pa, step, pst)
+                outs.append(((step.tgt, pst2), Edge(step.action, pa.label)))
+        return outs
+
+    def steps(self, s: Any) -> List[Step]:
+        """Pas système depuis s, partagés par tous les états de la propriété."""
+        if self.cache_size == 0:
+            return self._compute_steps(s)
+        cache = self._cache
+        out = cache.get(s)
+        if out is not None:
+            cache.move_to_end(s)
+            return out
+        out = self._compute_steps(s)
+        cache[s] = out
+        if self.cache_size is not None and len(cache) > self.cache_size:
+            cache.popitem(last=False)  # le moins récemment utilisé
+        return out
+
+    def _compute_steps(self, s: Any) -> List[Step]:
+        sys, observer = self.sys, self.observer
+        out: List[Step] = []
         acts = sys_actions(sys, s)
         acts_sorted = sorted(acts, key=act_name)
 
@@ -173,29 +230,94 @@ def build_reachable_product(sys: Any, prop: BuchiProperty) -> Tuple[
                 targets = [s]
             else:
                 targets = sys_execute(sys, s, a)
+                if observer is not None:
+                    observer.lap("product")
                 # deterministic order
-                targets = sorted(targets, key=lambda x: repr(x))
+                sort_in_place(targets, self.key)
+                if observer is not None:
+                    observer.lap("sort")
 
             for t in targets:
-                step = Step(src=s, action=a_name, tgt=t, ap=compute_ap(sys, t))
-                pacts = prop.actions(step, pst)
-                for pa in pacts:
-                    pst2 = prop.execute(pa, step, pst)
-                    succ: Node = (t, pst2)
-                    e = Edge(a_name, pa.label)
-                    outs.append((succ, e))
+                out.append(Step(src=s, action=a_name, tgt=t, ap=compute_ap(sys, t)))
+        return out
 
-                    if succ not in visited:
-                        visited.add(succ)
-                        parent[succ] = (node, e)
-                        q.append(succ)
 
-        adj[node] = outs
+def build_reachable_product(
+    sys: Any,
+    prop: BuchiProperty,
+    visited: Any = None,
+    checkpointer: Optional[Checkpointer] = None,
+    resume: bool = False,
+    observer: Optional[Telemetry] = None,
+    cache_size: Optional[int] = STEP_CACHE,
+) -> Tuple[
+    Any,
+    Dict[Node, List[Tuple[Node, Edge]]],
+    Dict[Node, Tuple[Optional[Node], Edge]],
+]:
+    """
+    Produit atteignable système × propriété (BFS).
+
+    visited: ensemble des nœuds découverts, un set par défaut ou tout objet
+    avec in / add / len. adj et parent gardent tous les nœuds et arêtes du
+    produit: pour une mémoire bornée, voir nested_dfs.
+
+    checkpointer: sauvegarde périodique de visited / adj / parent / file
+    entre deux expansions; resume=True repart du checkpoint s'il existe.
+
+    observer: télémétrie (telemetry.py) par niveau BFS; le temps est réparti
+    entre actions / execute du système, sort et "product" (pas de la
+    propriété, propositions atomiques et détection des doublons).
+
+    cache_size: cache des pas système (voir ProductSteps).
+    """
+    if visited is None:
+        visited = set()
+    adj: Dict[Node, List[Tuple[Node, Edge]]] = {}
+    parent: Dict[Node, Tuple[Optional[Node], Edge]] = {}
+
+    q: Deque[Node] = deque()
+    product = ProductSteps(sys, prop, cache_size, observer)
 
-    # ensure nodes with no outgoing appear in adj
-    for n in list(visited):
-        adj.setdefault(n, [])
+    saved = checkpointer.load() if (checkpointer is not None and resume) else None
+    if saved is not None:
+        visited, adj, parent = saved["visited"], saved["adj"], saved["parent"]
+        q.extend(saved["queue"])
+    else:
+        for n0, e0 in product.initial_nodes():
+            if n0 not in visited:
+                visited.add(n0)
+                parent[n0] = (None, e0)
+                q.append(n0)
+    if observer is not None:
+        observer.start(len(adj))
 
+    while q:
+        if checkpointer is not None and checkpointer.due():
+            checkpointer.save(
+                {"visited": visited, "adj": adj, "parent": parent, "queue": list(q)}
+            )
+            if observer is not None:
+                observer.lap("checkpoint")
+        node = q.popleft()
+        if observer is not None:
+            observer.expand(len(visited))
+
+        outs = product.successors(node)
+        for succ, e in outs:
+            if succ not in visited:
+                visited.add(succ)
+                parent[succ] = (node, e)
+                q.append(succ)
+
+        adj[node] = outs
+        if observer is not None:
+            observer.lap("product", len(outs))
+
+    if checkpointer is not None:
+        checkpointer.clear()
+    if observer is not None:
+        observer.finish(len(visited))
     return visited, adj, parent
 
 
@@ -258,9 +380,8 @@ def scc_has_cycle(comp: List[Node], adj: Dict[Node, List[Tuple[Node, Edge]]]) ->
 def find_accepting_cycle(
     prop: BuchiProperty,
     adj: Dict[Node, List[Tuple[Node, Edge]]],
-    visited: Set[Node],
 ) -> Optional[Node]:
-    nodes = list(visited)
+    nodes = list(adj)
     sccs = tarjan_scc(nodes, adj)
 
     # deterministic order: pick smallest SCC representative by repr
@@ -375,10 +496,17 @@ def find_cycle_from(
 
 
 def verify_buchi(
-    sys: Any, prop: BuchiProperty
+    sys: Any,
+    prop: BuchiProperty,
+    visited: Any = None,
+    checkpointer: Optional[Checkpointer] = None,
+    resume: bool = False,
+    observer: Optional[Telemetry] = None,
 ) -> Tuple[bool, int, Optional[Tuple[List[Any], List[Edge], List[Any], List[Edge]]]]:
-    visited, adj, parent = build_reachable_product(sys, prop)
-    acc_node = find_accepting_cycle(prop, adj, visited)
+    visited, adj, parent = build_reachable_product(
+        sys, prop, visited, checkpointer, resume, observer
+    )
+    acc_node = find_accepting_cycle(prop, adj)
 
     if acc_node is None:
         return True, len(visited), None
@@ -388,7 +516,7 @@ def verify_buchi(
 
     # cycle inside SCC
     # rebuild SCC set containing acc_node
-    nodes = list(visited)
+    nodes = list(adj)
     sccs = tarjan_scc(nodes, adj)
     scc_set: Set[Node] = set()
     for comp in sccs:
@@ -400,6 +528,82 @@ def verify_buchi(
     return False, len(visited), (prefix_sys, prefix_edges, cycle_sys, cycle_edges)
 
 
+def nested_dfs(
+    sys: Any,
+    prop: BuchiProperty,
+    new_visited: Callable[[], Any],
+    cache_size: Optional[int] = STEP_CACHE,
+) -> Tuple[
+    bool, Any, Optional[Tuple[List[Any], List[Edge], List[Any], List[Edge]]]
+]:
+    """Recherche d'un cycle acceptant par double DFS (Courcoubetis et al.).
+
+    Mémoire bornée: ni adj ni parent; deux ensembles de nœuds visités
+    fournis par new_visited() (ex: HashCompactSet, qui ne garde que des
+    empreintes) et les piles des deux DFS (profondeur du produit). Le DFS
+    externe lance, en post-ordre de chaque nœud acceptant, un DFS interne
+    (ensemble visited commun à tous les DFS internes) qui cherche à revenir
+    sur ce nœud.
+
+    Returns: (ok, visited du DFS externe, contre-exemple au même format
+    que verify_buchi: préfixe puis suffixe cyclique, projection système).
+    """
+    product = ProductSteps(sys, prop, cache_size)
+    outer = new_visited()
+    inner = new_visited()
+
+    def cycle_from(seed: Node) -> Optional[Tuple[List[Node], List[Edge]]]:
+        # pile: (nœud, successeurs restants, arête d'arrivée)
+        stack: List[Tuple[Node, Iterator[Tuple[Node, Edge]], Optional[Edge]]] = [
+            (seed, iter(product.successors(seed)), None)
+        ]
+        while stack:
+            node, it, _ = stack[-1]
+            nxt = next(it, None)
+            if nxt is None:
+                stack.pop()
+                continue
+            succ, e = nxt
+            if succ == seed:
+                nodes = [n for n, _, _ in stack] + [seed]
+                edges = [a for _, _, a in stack[1:] if a is not None] + [e]
+                return nodes, edges
+            if succ not in inner:
+                inner.add(succ)
+                stack.append((succ, iter(product.successors(succ)), e))
+        return None
+
+    for n0, e0 in product.initial_nodes():
+        if n0 in outer:
+            continue
+        outer.add(n0)
+        stack: List[Tuple[Node, Iterator[Tuple[Node, Edge]], Edge]] = [
+            (n0, iter(product.successors(n0)), e0)
+        ]
+        while stack:
+            node, it, _ = stack[-1]
+            nxt = next(it, None)
+            if nxt is not None:
+                succ, e = nxt
+                if succ not in outer:
+                    outer.add(succ)
+                    stack.append((succ, iter(product.successors(succ)), e))
+                continue
+            # post-ordre
+            if prop.is_accepting(node[1]):
+                found = cycle_from(node)
+                if found is not None:
+                    cyc_nodes, cyc_edges = found
+                    # préfixe: arête init vue comme s0 --init||...--> s0
+                    prefix_sys = [n0[0]] + [n[0] for n, _, _ in stack]
+                    prefix_edges = [a for _, _, a in stack]
+                    cycle_sys = [n[0] for n in cyc_nodes]
+                    cex = (prefix_sys, prefix_edges, cycle_sys, cyc_edges)
+                    return False, outer, cex
+            stack.pop()
+    return True, outer, None
+
+
 def print_trace(sys_states: List[Any], edges: List[Edge]) -> None:
     """
     Affiche: state --label--> next_state
@@ -430,14 +634,92 @@ def main() -> None:
         "--model", required=True, choices=["AB1", "AB2", "AB3", "AB4", "AB5"]
     )
     ap_.add_argument("--prop", required=True, choices=["P1", "P2", "P3", "P4", "P5"])
+    ap_.add_argument(
+        "--hash-compact",
+        type=int,
+        default=None,
+        metavar="BITS",
+        help="empreintes de BITS bits, double DFS à mémoire bornée (nested_dfs)",
+    )
+    ap_.add_argument(
+        "--checkpoint",
+        default=None,
+        metavar="DIR",
+        help="répertoire des checkpoints périodiques (un fichier par modèle × "
+        "propriété)",
+    )
+    ap_.add_argument(
+        "--checkpoint-every",
+        type=float,
+        default=60.0,
+        metavar="SEC",
+        help="intervalle entre deux checkpoints (secondes)",
+    )
+    ap_.add_argument(
+        "--resume",
+        action="store_true",
+        help="reprendre depuis --checkpoint s'il existe",
+    )
+    ap_.add_argument(
+        "--telemetry",
+        default=None,
+        metavar="FILE",
+        help="statistiques d'exploration (JSON lines) dans FILE + tableau récapitulatif",
+    )
+    ap_.add_argument(
+        "--packed",
+        action="store_true",
+        help="configurations système compactées dans un entier (packed_config.py)",
+    )
     args = ap_.parse_args()
-
-    sys = load_system(args.model)
+    if args.resume and args.checkpoint is None:
+        ap_.error("--resume nécessite --checkpoint DIR")
+    if args.hash_compact is not None and (
+        args.checkpoint is not None or args.telemetry is not None
+    ):
+        ap_.error("--hash-compact (double DFS): ni --checkpoint ni --telemetry")
+
+    sys = load_system(args.model, args.packed)
     prop = PROPERTIES[args.prop]()
 
-    ok, visited_count, cex = verify_buchi(sys, prop)
+    store = None
+    if args.hash_compact is not None:
+        bits = args.hash_compact
+        ok, store, cex = nested_dfs(sys, prop, lambda: HashCompactSet(bits))
+        visited_count = len(store)
+
+    ckpt = None
+    if args.checkpoint is not None:
+        os.makedirs(args.checkpoint, exist_ok=True)
+        ckpt = Checkpointer(
+            os.path.join(args.checkpoint, f"{args.model}_{args.prop}.ckpt"),
+            every=args.checkpoint_every,
+            meta={
+                "model": args.model,
+                "prop": args.prop,
+                "packed": args.packed,
+                "hash_compact": args.hash_compact,
+            },
+        )
+
+    if store is not None:
+        pass  # verdict déjà donné par nested_dfs
+    elif args.telemetry is None:
+        ok, visited_count, cex = verify_buchi(sys, prop, None, ckpt, args.resume)
+    else:
+        with open(args.telemetry, "w", encoding="utf-8") as sink:
+            tm = Telemetry(sink, label=f"{args.model}/{args.prop}")
+            ok, visited_count, cex = verify_buchi(
+                sys, prop, None, ckpt, args.resume, tm
+            )
+        print("\n".join(tm.summary_lines()))
 
     print(f"Model={args.model} | Prop={args.prop} | visited={visited_count}")
+    if store is not None:
+        print(
+            f"hash-compact: {store.bits} bits, "
+            f"P(collision) <= {store.collision_probability():.3e}"
+        )
     if ok:
         print("RESULT: SAT (pas de cycle acceptant)")
         return
@@ -24,8 +24,8 @@ def fmt_trace(sys_states: List[Any], edges: List[vb.Edge]) -> str:
     return "\n".join(lines)
 
 
-def run_one(model: str, prop_name: str) -> dict:
-    sys = vb.load_system(model)
+def run_one(model: str, prop_name: str, packed: bool = False) -> dict:
+    sys = vb.load_system(model, packed)
     prop = vb.PROPERTIES[prop_name]()
 
     ok, visited, cex = vb.verify_buchi(sys, prop)
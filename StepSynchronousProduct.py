@@ -1,14 +1,9 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Any, Iterable, List, Tuple
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
-
-def _sorted_by_repr(xs: Iterable[Any]) -> List[Any]:
-    return sorted(list(xs), key=repr)
-
-
-def _name(x: Any) -> str:
-    return getattr(x, "name", repr(x))
+from ordering import action_name as _name
+from ordering import UNORDERED, action_order, pair_order, sorted_by, state_order
 
 
 class StutteringAction:
@@ -22,12 +17,25 @@ STUTTER = StutteringAction()
 
 Step = Tuple[Any, Any, Any]  # (lc, la, lt)
 
+# Taille par défaut du cache des pas système (configurations lc mémorisées)
+STEP_CACHE = 1 << 16
+
+
+class ProductAction(NamedTuple):
+    """Action produit: un couple (pas système, action de la propriété).
+
+    Le pas vient du cache des pas système et l'action de la propriété est
+    un morceau iSoup partagé: rien n'est copié par arête. Le nom lisible
+    n'est construit qu'à l'affichage (étiquettes de trace).
+    """
 
-@dataclass(frozen=True)
-class ProductAction:
     step: Step
     rhs_action: Any
-    name: str  # ex: "a1||cond", "stutter||!cond"
+
+    @property
+    def name(self) -> str:
+        # ex: "a1||cond", "stutter||!cond"
+        return f"{_name(self.step[1])}||{_name(self.rhs_action)}"
 
 
 class StepSynchronousProduct:
@@ -39,48 +47,100 @@ class StepSynchronousProduct:
       - initials()
       - actions(c)
       - execute(c, a)
+
+    Ordres: chaque côté trie ses états / actions selon l'ordre qu'il déclare
+    (ordering.py); l'ordre sur les états produit en est dérivé (sort_key).
+    actions(c) sort déjà dans l'ordre des composantes (ordre des actions du
+    système, puis de la propriété): action_key = UNORDERED, les noms ne
+    servent pas au tri. Cet ordre est déterministe mais n'est pas celui des
+    noms "la||ra" triés comme chaînes: il en diffère quand un nom d'action
+    système est préfixe d'un autre (make_mutex(11): "t1||.." précède
+    "t10||.."), et l'ordre BFS et les traces peuvent alors changer.
+
+    cache_size: cache LRU des pas système (clé = lc). Une configuration lc
+    est associée à plusieurs états de la propriété (rc); ses pas
+    (lc, la, lt) ne sont calculés qu'une fois pour tous ces états produit.
+    0 = pas de cache, None = cache non borné.
     """
 
-    def __init__(self, lhs: Any, rhs: Any) -> None:
+    def __init__(
+        self, lhs: Any, rhs: Any, cache_size: Optional[int] = STEP_CACHE
+    ) -> None:
         self.lhs = lhs
         self.rhs = rhs
+        self._lkey = state_order(lhs)
+        self._rkey = state_order(rhs)
+        self._lact = action_order(lhs)
+        self._ract = action_order(rhs)
+        self.sort_key = pair_order(self._lkey, self._rkey)
+        self.action_key = UNORDERED
+        self.cache_size = cache_size
+        self._steps: "OrderedDict[Any, List[Step]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
 
     def initials(self) -> List[Any]:
-        l0 = _sorted_by_repr(self.lhs.initials())
-        r0 = _sorted_by_repr(self.rhs.initials())
+        l0 = sorted_by(self.lhs.initials(), self._lkey)
+        r0 = sorted_by(self.rhs.initials(), self._rkey)
         return [(lc, rc) for lc in l0 for rc in r0]
 
-    def actions(self, c: Any) -> List[ProductAction]:
-        lc, rc = c
-        out: List[ProductAction] = []
+    def steps(self, lc: Any) -> List[Step]:
+        """Pas système (lc, la, lt) depuis lc, dans l'ordre des actions.
+
+        Deadlock côté système: un seul pas (lc, STUTTER, lc). La liste
+        renvoyée peut être partagée (cache): ne pas la modifier.
+        """
+        if self.cache_size == 0:
+            return self._compute_steps(lc)
 
-        lactions = sorted(list(self.lhs.actions(lc)), key=_name)
+        cache = self._steps
+        out = cache.get(lc)
+        if out is not None:
+            cache.move_to_end(lc)
+            self.hits += 1
+            return out
+
+        self.misses += 1
+        out = self._compute_steps(lc)
+        cache[lc] = out
+        if self.cache_size is not None and len(cache) > self.cache_size:
+            cache.popitem(last=False)  # le moins récemment utilisé
+        return out
+
+    def _compute_steps(self, lc: Any) -> List[Step]:
+        lactions = sorted_by(self.lhs.actions(lc), self._lact)
 
         # Si deadlock côté système -> stutter
         if not lactions:
-            step: Step = (lc, STUTTER, lc)
-            ractions = sorted(list(self.rhs.actions(step, rc)), key=_name)
-            for ra in ractions:
-                out.append(
-                    ProductAction(
-                        step=step, rhs_action=ra, name=f"{_name(STUTTER)}||{_name(ra)}"
-                    )
-                )
-            return out
+            return [(lc, STUTTER, lc)]
 
         # Sinon: pour chaque transition système lc --la--> lt
+        out: List[Step] = []
         for la in lactions:
             # execute(state, action)
-            ltargets = _sorted_by_repr(self.lhs.execute(lc, la))
-            for lt in ltargets:
-                step: Step = (lc, la, lt)
-                ractions = sorted(list(self.rhs.actions(step, rc)), key=_name)
-                for ra in ractions:
-                    out.append(
-                        ProductAction(
-                            step=step, rhs_action=ra, name=f"{_name(la)}||{_name(ra)}"
-                        )
-                    )
+            for lt in sorted_by(self.lhs.execute(lc, la), self._lkey):
+                out.append((lc, la, lt))
+        return out
+
+    def cache_info(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._steps),
+            "maxsize": self.cache_size,
+        }
+
+    def cache_clear(self) -> None:
+        self._steps.clear()
+        self.hits = self.misses = 0
+
+    def actions(self, c: Any) -> List[ProductAction]:
+        lc, rc = c
+        out: List[ProductAction] = []
+        for step in self.steps(lc):
+            ractions = sorted_by(self.rhs.actions(step, rc), self._ract)
+            for ra in ractions:
+                out.append(ProductAction(step, ra))
         return out
 
     def execute(self, c: Any, a: ProductAction) -> List[Any]:
@@ -89,5 +149,5 @@ class StepSynchronousProduct:
         step = a.step
         lt = step[2]
 
-        rtargets = _sorted_by_repr(self.rhs.execute(a.rhs_action, step, rc))
+        rtargets = sorted_by(self.rhs.execute(a.rhs_action, step, rc), self._rkey)
         return [(lt, rt) for rt in rtargets]
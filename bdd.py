@@ -0,0 +1,221 @@
+"""Diagrammes de décision binaires (BDD) réduits et ordonnés, en Python pur.
+
+Un nœud est un entier (identifiant dans le gestionnaire BDD):
+  - FALSE = 0 et TRUE = 1 sont les feuilles;
+  - un nœud interne porte une variable (entier, l'ordre des variables est
+    l'ordre des entiers) et deux fils lo (variable = 0) et hi (variable = 1).
+La table d'unicité garantit qu'une fonction booléenne a un seul nœud: deux
+ensembles sont égaux si et seulement si leurs nœuds sont égaux.
+
+Opérations: and_, or_, not_, diff, exists (quantification existentielle),
+cube (conjonction de littéraux), sat_count, pick (une affectation), size.
+Les résultats intermédiaires sont mémorisés (caches vidés par
+clear_caches()).
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+FALSE = 0
+TRUE = 1
+
+_LEAF = 1 << 30  # « variable » des feuilles, après toutes les autres
+
+
+class BDD:
+    """Gestionnaire de nœuds (table d'unicité + caches d'opérations)."""
+
+    def __init__(self) -> None:
+        self._var: List[int] = [_LEAF, _LEAF]
+        self._lo: List[int] = [FALSE, TRUE]
+        self._hi: List[int] = [FALSE, TRUE]
+        self._unique: Dict[Tuple[int, int, int], int] = {}
+        self._and: Dict[Tuple[int, int], int] = {}
+        self._or: Dict[Tuple[int, int], int] = {}
+        self._not: Dict[int, int] = {}
+        self._exists: Dict[Tuple[int, Tuple[int, ...]], int] = {}
+
+    def __len__(self) -> int:
+        return len(self._var)
+
+    def clear_caches(self) -> None:
+        self._and.clear()
+        self._or.clear()
+        self._not.clear()
+        self._exists.clear()
+
+    # Construction
+
+    def mk(self, var: int, lo: int, hi: int) -> int:
+        if lo == hi:
+            return lo
+        key = (var, lo, hi)
+        u = self._unique.get(key)
+        if u is None:
+            u = len(self._var)
+            self._var.append(var)
+            self._lo.append(lo)
+            self._hi.append(hi)
+            self._unique[key] = u
+        return u
+
+    def var(self, v: int) -> int:
+        return self.mk(v, FALSE, TRUE)
+
+    def cube(self, literals: Mapping[int, bool]) -> int:
+        """Conjonction des littéraux var == valeur."""
+        u = TRUE
+        for v in sorted(literals, reverse=True):
+            u = self.mk(v, FALSE, u) if literals[v] else self.mk(v, u, FALSE)
+        return u
+
+    # Opérations
+
+    def and_(self, u: int, v: int) -> int:
+        if u == FALSE or v == FALSE:
+            return FALSE
+        if u == TRUE or u == v:
+            return v
+        if v == TRUE:
+            return u
+        if u > v:
+            u, v = v, u
+        key = (u, v)
+        r = self._and.get(key)
+        if r is not None:
+            return r
+        xu, xv = self._var[u], self._var[v]
+        if xu == xv:
+            lo = self.and_(self._lo[u], self._lo[v])
+            r = self.mk(xu, lo, self.and_(self._hi[u], self._hi[v]))
+        elif xu < xv:
+            r = self.mk(xu, self.and_(self._lo[u], v), self.and_(self._hi[u], v))
+        else:
+            r = self.mk(xv, self.and_(u, self._lo[v]), self.and_(u, self._hi[v]))
+        self._and[key] = r
+        return r
+
+    def or_(self, u: int, v: int) -> int:
+        if u == TRUE or v == TRUE:
+            return TRUE
+        if u == FALSE or u == v:
+            return v
+        if v == FALSE:
+            return u
+        if u > v:
+            u, v = v, u
+        key = (u, v)
+        r = self._or.get(key)
+        if r is not None:
+            return r
+        xu, xv = self._var[u], self._var[v]
+        if xu == xv:
+            lo = self.or_(self._lo[u], self._lo[v])
+            r = self.mk(xu, lo, self.or_(self._hi[u], self._hi[v]))
+        elif xu < xv:
+            r = self.mk(xu, self.or_(self._lo[u], v), self.or_(self._hi[u], v))
+        else:
+            r = self.mk(xv, self.or_(u, self._lo[v]), self.or_(u, self._hi[v]))
+        self._or[key] = r
+        return r
+
+    def not_(self, u: int) -> int:
+        if u <= TRUE:
+            return TRUE - u
+        r = self._not.get(u)
+        if r is None:
+            r = self.mk(self._var[u], self.not_(self._lo[u]), self.not_(self._hi[u]))
+            self._not[u] = r
+        return r
+
+    def diff(self, u: int, v: int) -> int:
+        """u ∧ ¬v."""
+        return self.and_(u, self.not_(v))
+
+    def disjunction(self, nodes: Iterable[int]) -> int:
+        r = FALSE
+        for u in nodes:
+            r = self.or_(r, u)
+        return r
+
+    def exists(self, u: int, variables: Iterable[int]) -> int:
+        """∃ variables . u"""
+        vs = tuple(sorted(set(variables)))
+        if not vs:
+            return u
+        return self._exists_rec(u, vs)
+
+    def _exists_rec(self, u: int, vs: Tuple[int, ...]) -> int:
+        if u <= TRUE:
+            return u
+        x = self._var[u]
+        # variables quantifiées restantes (toutes >= x sont encore utiles)
+        while vs and vs[0] < x:
+            vs = vs[1:]
+        if not vs:
+            return u
+        key = (u, vs)
+        r = self._exists.get(key)
+        if r is not None:
+            return r
+        lo = self._exists_rec(self._lo[u], vs)
+        hi = self._exists_rec(self._hi[u], vs)
+        r = self.or_(lo, hi) if vs[0] == x else self.mk(x, lo, hi)
+        self._exists[key] = r
+        return r
+
+    # Lecture
+
+    def sat_count(self, u: int, nvars: int) -> int:
+        """Nombre d'affectations des variables 0..nvars-1 qui satisfont u."""
+        memo: Dict[int, int] = {}
+
+        def level(w: int) -> int:
+            return nvars if w <= TRUE else self._var[w]
+
+        def count(w: int) -> int:
+            # affectations des variables level(w)..nvars-1
+            if w <= TRUE:
+                return w
+            r = memo.get(w)
+            if r is None:
+                x = self._var[w]
+                lo, hi = self._lo[w], self._hi[w]
+                r = (count(lo) << (level(lo) - x - 1)) + (
+                    count(hi) << (level(hi) - x - 1)
+                )
+                memo[w] = r
+            return r
+
+        return count(u) << level(u)
+
+    def pick(self, u: int) -> Optional[Dict[int, bool]]:
+        """Une affectation satisfaisant u (variables libres omises), ou None.
+
+        Préfère la branche lo: l'affectation est la plus petite dans l'ordre
+        des variables.
+        """
+        if u == FALSE:
+            return None
+        out: Dict[int, bool] = {}
+        while u > TRUE:
+            if self._lo[u] != FALSE:
+                out[self._var[u]] = False
+                u = self._lo[u]
+            else:
+                out[self._var[u]] = True
+                u = self._hi[u]
+        return out
+
+    def size(self, u: int) -> int:
+        """Nombre de nœuds internes atteignables depuis u."""
+        seen = set()
+        stack = [u]
+        while stack:
+            w = stack.pop()
+            if w <= TRUE or w in seen:
+                continue
+            seen.add(w)
+            stack.append(self._lo[w])
+            stack.append(self._hi[w])
+        return len(seen)
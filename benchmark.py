@@ -0,0 +1,256 @@
+"""Banc de mesure du moteur d'exploration (détection de régressions).
+
+Scénarios:
+  - hanoi:  validation_ls.solve_hanoi_ls(n) pour n dans [--hanoi MIN MAX]
+  - soup:   check_ab_soup.explore(ABk) pour AB1..AB5
+  - nfa:    verify_nfa_alice_bob.verify_one pour AB1..AB5 × (P1,P2) × (1,2)
+  - buchi:  verify_buchi pour AB1..AB5 × P1..P5 (dossier Interpretation Buchi)
+  - mutex:  exploration de alice_bob_soup_models.make_mutex(n), n dans
+            [--mutex MIN MAX] (modèle compilé, soup_dsl)
+
+Chaque scénario s'exécute dans un processus neuf (spawn): le pic de RSS
+mesuré est celui du scénario seul, et les modules homonymes du dossier
+Büchi ne se mélangent pas avec ceux de la racine. Une première exécution
+instrumentée (telemetry.Telemetry) compte états et transitions; le temps
+retenu est le minimum de --repeat exécutions non instrumentées.
+
+Résultats en JSON (--out). Avec --baseline FICHIER, chaque scénario est
+comparé à la référence: un ralentissement au-delà de --threshold (et d'au
+moins --min-delta secondes), ou un nombre d'états différent, est signalé
+et le code de sortie vaut 1.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+from telemetry import Telemetry, peak_rss_kb
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BUCHI_DIR = os.path.join(HERE, "Interpretation Buchi")
+
+MODELS = ["AB1", "AB2", "AB3", "AB4", "AB5"]
+NFA_PROPS = ["P1", "P2"]
+NFA_PATTERNS = [1, 2]
+BUCHI_PROPS = ["P1", "P2", "P3", "P4", "P5"]
+
+Case = Tuple[str, str, Dict[str, Any]]  # (suite, nom, paramètres)
+
+
+def _run_hanoi(observer: Any, n: int) -> None:
+    from validation_ls import solve_hanoi_ls
+
+    solve_hanoi_ls(n, observer=observer)
+
+
+def _run_soup(observer: Any, model: str) -> None:
+    from check_ab_soup import explore
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        explore(model, observer=observer)
+
+
+def _run_nfa(observer: Any, model: str, prop: str, pattern: int) -> None:
+    from verify_nfa_alice_bob import verify_one
+
+    verify_one(model, prop, pattern, observer=observer)
+
+
+def _run_buchi(observer: Any, model: str, prop: str) -> None:
+    if BUCHI_DIR not in sys.path:
+        sys.path.insert(0, BUCHI_DIR)
+    import verify_buchi_alice_bob as vb
+
+    vb.verify_buchi(vb.load_system(model), vb.PROPERTIES[prop](), observer=observer)
+
+
+def _run_mutex(observer: Any, n: int) -> None:
+    from alice_bob_soup_models import make_mutex
+    from bfs import bfs_interned
+    from ls2rg import LS2RG
+
+    rg = LS2RG(make_mutex(n).compile())
+    bfs_interned(rg, {}, lambda _p, _n, _o: False, observer=observer)
+
+
+RUNNERS: Dict[str, Callable[..., None]] = {
+    "hanoi": _run_hanoi,
+    "soup": _run_soup,
+    "nfa": _run_nfa,
+    "buchi": _run_buchi,
+    "mutex": _run_mutex,
+}
+
+
+def cases(
+    hanoi_min: int, hanoi_max: int, mutex_min: int, mutex_max: int
+) -> List[Case]:
+    out: List[Case] = []
+    for n in range(hanoi_min, hanoi_max + 1):
+        out.append(("hanoi", f"n={n}", {"n": n}))
+    for m in MODELS:
+        out.append(("soup", m, {"model": m}))
+    for m in MODELS:
+        for p in NFA_PROPS:
+            for pat in NFA_PATTERNS:
+                out.append(
+                    ("nfa", f"{m}/{p}/p{pat}", {"model": m, "prop": p, "pattern": pat})
+                )
+    for m in MODELS:
+        for p in BUCHI_PROPS:
+            out.append(("buchi", f"{m}/{p}", {"model": m, "prop": p}))
+    for n in range(mutex_min, mutex_max + 1):
+        out.append(("mutex", f"n={n}", {"n": n}))
+    return out
+
+
+def run_case(suite: str, params: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    """Exécuté dans le processus fils: compte (instrumenté) puis chronomètre."""
+    runner = RUNNERS[suite]
+    tm = Telemetry()
+    runner(tm, **params)
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        runner(None, **params)
+        best = min(best, time.perf_counter() - t0)
+    return {
+        "wall": best,
+        "states": tm.summary["states"],
+        "transitions": tm.summary["transitions"],
+        "rss_peak_kb": peak_rss_kb(),
+    }
+
+
+def run_all(selected: List[Case], repeat: int) -> List[Dict[str, Any]]:
+    ctx = multiprocessing.get_context("spawn")
+    results: List[Dict[str, Any]] = []
+    for suite, name, params in selected:
+        # un processus par scénario (pic RSS propre au scénario)
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            r = pool.submit(run_case, suite, params, repeat).result()
+        r = {"suite": suite, "case": name, **r}
+        print(
+            f"{suite:>6} {name:<12} {r['wall'] * 1000:>10.2f} ms "
+            f"{r['states']:>8} états {r['transitions']:>9} transitions "
+            f"{(r['rss_peak_kb'] or 0) / 1024:>7.1f} Mo",
+            flush=True,
+        )
+        results.append(r)
+    return results
+
+
+def compare(
+    results: List[Dict[str, Any]],
+    baseline: Dict[str, Any],
+    threshold: float,
+    min_delta: float,
+) -> List[str]:
+    """Lignes de rapport des régressions (vide si aucune)."""
+    base = {(r["suite"], r["case"]): r for r in baseline["results"]}
+    flagged: List[str] = []
+    for r in results:
+        b = base.get((r["suite"], r["case"]))
+        if b is None:
+            continue
+        tag = f"{r['suite']} {r['case']}"
+        if r["states"] != b["states"]:
+            flagged.append(f"{tag}: états {b['states']} -> {r['states']}")
+        ratio = r["wall"] / b["wall"] if b["wall"] > 0 else 1.0
+        if ratio > 1 + threshold and r["wall"] - b["wall"] >= min_delta:
+            flagged.append(
+                f"{tag}: {b['wall'] * 1000:.2f} ms -> {r['wall'] * 1000:.2f} ms "
+                f"(x{ratio:.2f})"
+            )
+    return flagged
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--suite",
+        action="append",
+        choices=sorted(RUNNERS),
+        default=None,
+        help="Scénarios à exécuter (répétable, tous par défaut).",
+    )
+    parser.add_argument(
+        "--hanoi",
+        type=int,
+        nargs=2,
+        default=[3, 8],
+        metavar=("MIN", "MAX"),
+        help="Plage de n pour Hanoi.",
+    )
+    parser.add_argument(
+        "--mutex",
+        type=int,
+        nargs=2,
+        default=[3, 8],
+        metavar=("MIN", "MAX"),
+        help="Plage de n pour le modèle mutex à n processus.",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Mesures par scénario.")
+    parser.add_argument("--out", type=str, default="benchmark.json")
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Résultats de référence (JSON produit par --out) à comparer.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Ralentissement relatif toléré (0.10 = +10%%).",
+    )
+    parser.add_argument(
+        "--min-delta",
+        type=float,
+        default=0.002,
+        metavar="SEC",
+        help="Écart absolu minimal pour signaler un ralentissement (bruit).",
+    )
+    args = parser.parse_args()
+
+    suites = args.suite or list(RUNNERS)
+    selected = [c for c in cases(*args.hanoi, *args.mutex) if c[0] in suites]
+    results = run_all(selected, args.repeat)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[OK] Résultats écrits dans: {args.out}")
+
+    if args.baseline is not None:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        flagged = compare(results, baseline, args.threshold, args.min_delta)
+        if flagged:
+            print(f"RÉGRESSIONS ({len(flagged)}):")
+            for line in flagged:
+                print(f"  {line}")
+            raise SystemExit(1)
+        print("Aucune régression par rapport à la référence.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,36 @@
 from __future__ import annotations
 
 from collections import deque
-from typing import Any, Callable, Deque, Dict, Iterable, Optional, Set, Tuple, TypeVar
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from ordering import sort_in_place, state_order
+from state_table import NO_PARENT, StateTable
 
 
 Node = TypeVar("Node")
 Opaque = Dict[str, Any]
 OnEntry = Callable[[Optional[Node], Node, Opaque], bool]
+OnEntryId = Callable[[int, int, Opaque], bool]
 
 
-def bfs(graph: Any, opaque: Opaque, on_entry: OnEntry) -> Tuple[Opaque, Set[Node]]:
+def bfs(
+    graph: Any,
+    opaque: Opaque,
+    on_entry: OnEntry,
+    visited: Any = None,
+    observer: Any = None,
+) -> Tuple[Opaque, Set[Node]]:
     """Breadth-first search over a RootedGraph-like interface.
 
     The `graph` must implement:
@@ -20,13 +41,28 @@ def bfs(graph: Any, opaque: Opaque, on_entry: OnEntry) -> Tuple[Opaque, Set[Node
     per discovered node (the first time it is visited). If it returns True,
     the exploration stops early.
 
+    Successors are sorted with the ordering declared by the graph
+    (`graph.sort_key`, see ordering.py; repr by default) so the traversal
+    order is reproducible across runs and platforms.
+
+    `visited` is the store of discovered nodes: a plain set by default, or
+    any object providing `in`, `add` and `len` (e.g. bitstate.BitStateSet).
+
+    `observer` (telemetry.Telemetry) receives per-level statistics and the
+    time spent in neighbors / sort / dedup / on_entry.
+
     Returns:
       (opaque, visited)
     """
 
+    key = state_order(graph)
     first = True
-    visited: Set[Node] = set()
+    if visited is None:
+        visited = set()
     queue: Deque[Node] = deque()
+    if observer is not None:
+        on_entry = observer.wrap_on_entry(on_entry)
+        observer.start()
 
     while first or queue:
         if first:
@@ -35,10 +71,16 @@ def bfs(graph: Any, opaque: Opaque, on_entry: OnEntry) -> Tuple[Opaque, Set[Node
             first = False
         else:
             parent = queue.popleft()
+            if observer is not None:
+                observer.expand(len(visited))
             frontier = graph.neighbors(parent)
 
         frontier_list = list(frontier)
-        frontier_list.sort(key=repr)  # ordre stable inter-plateforme
+        if observer is not None:
+            observer.lap("neighbors", 0 if parent is None else len(frontier_list))
+        sort_in_place(frontier_list, key)  # ordre stable inter-plateforme
+        if observer is not None:
+            observer.lap("sort")
         for node in frontier_list:
             if node in visited:
                 continue
@@ -48,11 +90,139 @@ def bfs(graph: Any, opaque: Opaque, on_entry: OnEntry) -> Tuple[Opaque, Set[Node
             queue.append(node)
 
             if done:
+                if observer is not None:
+                    observer.finish(len(visited))
                 return opaque, visited
+        if observer is not None:
+            observer.lap("dedup")
 
+    if observer is not None:
+        observer.finish(len(visited))
     return opaque, visited
 
 
+def bfs_iter(
+    graph: Any, visited: Any = None
+) -> Iterator[Tuple[Optional[Node], Node, int]]:
+    """Lazy BFS: yields one `(parent, node, depth)` event per discovered node.
+
+    Same traversal order as `bfs` (roots have parent None and depth 0).
+    Expansion is driven by the consumer: a node is expanded only once every
+    event generated before it has been consumed, so the caller can stop
+    (break / close()), pause and resume (keep the generator), throttle the
+    exploration, or stream events elsewhere without per-node callback state.
+    """
+
+    key = state_order(graph)
+    if visited is None:
+        visited = set()
+    queue: Deque[Tuple[Node, int]] = deque()
+
+    frontier_list = list(graph.roots())
+    sort_in_place(frontier_list, key)
+    for node in frontier_list:
+        if node in visited:
+            continue
+        visited.add(node)
+        queue.append((node, 0))
+        yield None, node, 0
+
+    while queue:
+        parent, depth = queue.popleft()
+        frontier_list = list(graph.neighbors(parent))
+        sort_in_place(frontier_list, key)
+        for node in frontier_list:
+            if node in visited:
+                continue
+            visited.add(node)
+            queue.append((node, depth + 1))
+            yield parent, node, depth + 1
+
+
+def bfs_interned(
+    graph: Any,
+    opaque: Opaque,
+    on_entry: OnEntryId,
+    table: Optional[StateTable] = None,
+    head: int = 0,
+    checkpointer: Any = None,
+    observer: Any = None,
+) -> Tuple[Opaque, StateTable]:
+    """Same traversal as `bfs`, but over interned state ids.
+
+    Each discovered node is stored once in `table` (a StateTable) and gets a
+    dense integer id in discovery order; its BFS parent is recorded in the
+    table as an id. The callback receives ids:
+    `on_entry(parent_id, node_id, opaque)`, with parent_id == NO_PARENT for
+    roots; use `table.state(i)` to get the node and `table.path(i)` to
+    rebuild the trace.
+
+    Since ids are assigned in discovery order, the FIFO queue is simply the
+    range of ids not yet expanded: no separate deque is kept.
+
+    Checkpointing: if `checkpointer` is given (checkpoint.Checkpointer), the
+    table, the next id to expand (`head`) and `opaque` are saved between two
+    expansions whenever `checkpointer.due()`. To resume, pass the saved
+    table, head and opaque back in.
+
+    `observer`: see `bfs` (on resume, statistics cover the resumed part).
+
+    Returns:
+      (opaque, table)
+    """
+
+    if table is None:
+        table = StateTable()
+    key = state_order(graph)
+    if observer is not None:
+        on_entry = observer.wrap_on_entry(on_entry)
+        observer.start(head)
+
+    frontier_list = list(graph.roots())
+    sort_in_place(frontier_list, key)
+    for node in frontier_list:
+        if node in table:
+            continue
+        nid = table.add(node, NO_PARENT)
+        if on_entry(NO_PARENT, nid, opaque):
+            if observer is not None:
+                observer.finish(len(table))
+            return opaque, table
+    if observer is not None:
+        observer.lap("roots")
+
+    while head < len(table):
+        if checkpointer is not None and checkpointer.due():
+            checkpointer.save({"table": table, "head": head, "opaque": opaque})
+            if observer is not None:
+                observer.lap("checkpoint")
+        parent = head
+        head += 1
+        if observer is not None:
+            observer.expand(len(table))
+
+        frontier_list = list(graph.neighbors(table.state(parent)))
+        if observer is not None:
+            observer.lap("neighbors", len(frontier_list))
+        sort_in_place(frontier_list, key)
+        if observer is not None:
+            observer.lap("sort")
+        for node in frontier_list:
+            if node in table:
+                continue
+            nid = table.add(node, parent)
+            if on_entry(parent, nid, opaque):
+                if observer is not None:
+                    observer.finish(len(table))
+                return opaque, table
+        if observer is not None:
+            observer.lap("dedup")
+
+    if observer is not None:
+        observer.finish(len(table))
+    return opaque, table
+
+
 class Graph:
     """Small directed graph helper (for BFS sanity checks)."""
 
@@ -0,0 +1,122 @@
+"""Hachage bitstate (supertrace, Holzmann).
+
+L'ensemble visited est un tableau de bits de taille fixe: un état est
+marqué en mettant à 1 k bits choisis par k fonctions de hachage (double
+hachage h1 + i*h2 sur un condensé de 128 bits). Un état dont les k bits
+sont déjà à 1 est considéré comme visité, éventuellement à tort
+(collision): il est alors omis, ainsi que la partie de l'espace d'états
+qu'il aurait seule permis d'atteindre. La mémoire reste constante quel
+que soit le nombre d'états.
+"""
+from __future__ import annotations
+
+from itertools import takewhile
+from typing import Any, Callable, List, Optional, Tuple
+
+from bfs import bfs_iter
+from state_hash import Encode, digest128
+
+MB = 1 << 20
+
+
+class BitStateSet:
+    """Ensemble approché d'états, interface compatible avec bfs (in / add / len)."""
+
+    def __init__(self, size_bytes: int = 512 * MB, k: int = 3, encode: Encode = repr):
+        if size_bytes <= 0 or k <= 0:
+            raise ValueError("size_bytes et k doivent être > 0")
+        self.bits = bytearray(size_bytes)
+        self.m = size_bytes * 8
+        self.k = k
+        self.encode = encode
+        self.bits_set = 0
+        self.count = 0
+        # somme des probabilités d'omission au moment de chaque insertion
+        self.expected_omissions = 0.0
+        self._last: Optional[Tuple[Any, List[int]]] = None
+
+    def _positions(self, state: Any) -> List[int]:
+        last = self._last
+        if last is not None and last[0] is state:
+            return last[1]
+        h1, h2 = digest128(state, self.encode)
+        h2 |= 1
+        m = self.m
+        pos = [(h1 + i * h2) % m for i in range(self.k)]
+        self._last = (state, pos)
+        return pos
+
+    def __contains__(self, state: Any) -> bool:
+        bits = self.bits
+        for p in self._positions(state):
+            if not bits[p >> 3] & (1 << (p & 7)):
+                return False
+        return True
+
+    def add(self, state: Any) -> None:
+        self.expected_omissions += self.omission_probability()
+        bits = self.bits
+        for p in self._positions(state):
+            byte, mask = p >> 3, 1 << (p & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                self.bits_set += 1
+        self.count += 1
+
+    def __len__(self) -> int:
+        return self.count
+
+    def omission_probability(self) -> float:
+        """Probabilité qu'un nouvel état soit pris à tort pour un état visité."""
+        return (self.bits_set / self.m) ** self.k
+
+    def coverage(self) -> float:
+        """Estimation de la fraction de l'espace d'états effectivement visitée."""
+        if self.count == 0:
+            return 1.0
+        return self.count / (self.count + self.expected_omissions)
+
+    def stats(self) -> dict:
+        return {
+            "states": self.count,
+            "size_bytes": len(self.bits),
+            "k": self.k,
+            "fill_ratio": self.bits_set / self.m,
+            "omission_probability": self.omission_probability(),
+            "expected_omissions": self.expected_omissions,
+            "coverage": self.coverage(),
+        }
+
+
+def replay_levels(graph: Any, goal: Any, new_visited: Callable[[], Any]) -> List[Any]:
+    """Retrouve un chemin racine -> goal sans aucun parent mémorisé.
+
+    new_visited() fournit un ensemble visited neuf, du même type et de la
+    même taille que celui de l'exploration d'origine: rejouée par bfs_iter
+    (même ordre, mêmes omissions), l'exploration retrouve goal et sa
+    profondeur d. Pour k = d-1, ..., 0, une nouvelle exploration jusqu'à la
+    profondeur k cherche un état de profondeur k dont le dernier état trouvé
+    est successeur. La mémoire reste celle d'une exploration (file BFS +
+    visited, un seul à la fois), au prix de d + 1 explorations partielles.
+    """
+    depth = None
+    for _, node, d in bfs_iter(graph, new_visited()):
+        if node == goal:
+            depth = d
+            break
+    if depth is None:
+        raise RuntimeError("replay_levels: état cible introuvable au rejeu")
+    path = [goal]
+    for k in range(depth - 1, -1, -1):
+        target = path[-1]
+        # bfs_iter produit les profondeurs dans l'ordre: arrêt après le niveau k
+        level = takewhile(lambda e: e[2] <= k, bfs_iter(graph, new_visited()))
+        pred = next(
+            (n for _, n, d in level if d == k and target in graph.neighbors(n)),
+            None,
+        )
+        if pred is None:
+            raise RuntimeError("replay_levels: prédécesseur introuvable")
+        path.append(pred)
+    path.reverse()
+    return path
@@ -1,27 +1,72 @@
 from __future__ import annotations
+import argparse
 from typing import Any, Dict, Optional
-from bfs import bfs
+from bfs import bfs, bfs_interned
+from bitstate import MB, BitStateSet
 from ls2rg import LS2RG
-from soup_lang import SoupSemantics
-from alice_bob_soup_models import CS, get_model
+from por import StubbornSemantics
+from symmetry import SymmetricSemantics
+from state_table import StateTable
+from alice_bob_soup_models import CS, get_semantics, get_spec
 
 """Check minimal pour les modèles AB encodés en Soup."""
 
+NEIGHBOR_CACHE = 1 << 16
 
-def explore(name: str) -> None:
-    soup = get_model(name)
-    sem = SoupSemantics(soup)
-    rg = LS2RG(sem, keep_labels=True)
+
+def explore(
+    name: str,
+    bitstate_mb: Optional[int] = None,
+    observer: Any = None,
+    packed: bool = False,
+    por: bool = False,
+    symmetry: bool = False,
+) -> None:
+    """Explore tout le modèle et affiche exclusion mutuelle / deadlocks.
+
+    bitstate_mb: si donné, visited est un tableau de bits de cette taille
+    (Mo) au lieu de la table des états (exploration approchée, voir
+    bitstate.py); la couverture estimée est affichée.
+    observer: télémétrie de l'exploration (telemetry.Telemetry).
+    packed: configurations compactées dans un entier (packed_config.py).
+    por: réduction d'ordre partiel (por.py); exclusion mutuelle et
+    deadlocks sont préservés, le nombre d'états est celui du graphe réduit.
+    symmetry: un représentant par orbite de la symétrie déclarée par le
+    modèle (Spec.symmetry, symmetry.py); sans effet si le modèle n'en
+    déclare pas. Les exemples affichés sont des représentants.
+    """
+    sem: Any = get_semantics(name, packed)  # sémantique compilée (soup_dsl)
+    group = get_spec(name).symmetry if symmetry else None
+    if group is not None:
+        sem = SymmetricSemantics(sem, group)
+    if packed:
+        table = StateTable()  # états (déjà des entiers) + parents BFS
+    else:
+        # états stockés compactés (un entier chacun), redécodés à la lecture
+        codec = get_spec(name).codec()
+        table = StateTable(codec.encode, codec.decode)
+    reduced: Optional[StubbornSemantics] = None
+    if por:
+        if group is not None:
+            raise ValueError("réduction d'ordre partiel et symétrie non combinables")
+        if bitstate_mb is not None:
+            raise ValueError("la réduction d'ordre partiel nécessite visited exact")
+        # champs lus par la propriété d'exclusion mutuelle
+        sem = reduced = StubbornSemantics(
+            sem, visible=("a_loc", "b_loc"), discovered=table.id_of
+        )
+    # deadlock: neighbors(node) est demandé par check puis par bfs à
+    # l'expansion du même nœud; le cache (borné) évite le second calcul.
+    # Ni étiquettes ni cache en mode bitstate: la mémoire reste bornée.
+    exact = bitstate_mb is None
+    rg = LS2RG(sem, keep_labels=exact, cache_size=NEIGHBOR_CACHE if exact else 0)
 
     opaque: Dict[str, Any] = {
-        "parent": {},
         "goal_mutex": None,
         "deadlocks": [],
     }
 
-    def on_entry(parent: Optional[Any], node: Any, opaque_dict: Dict[str, Any]) -> bool:
-        opaque_dict["parent"][node] = parent
-
+    def check(node: Any, opaque_dict: Dict[str, Any]) -> bool:
         # Violation exclusion: les deux en CS
         if node[0] == CS and node[1] == CS and opaque_dict["goal_mutex"] is None:
             opaque_dict["goal_mutex"] = node
@@ -32,10 +77,38 @@ def explore(name: str) -> None:
 
         return False  # on explore tout
 
-    opaque_out, visited = bfs(rg, opaque, on_entry)
+    if bitstate_mb is None:
+
+        def on_entry(parent: int, node_id: int, opaque_dict: Dict[str, Any]) -> bool:
+            return check(table.state(node_id), opaque_dict)
+
+        opaque_out, visited = bfs_interned(
+            rg, opaque, on_entry, table, observer=observer
+        )
+    else:
+        store = BitStateSet(bitstate_mb * MB)
+        opaque_out, visited = bfs(
+            rg,
+            opaque,
+            lambda _p, node, o: check(node, o),
+            visited=store,
+            observer=observer,
+        )
 
     print()
     print(f"{name}: {len(visited)} états atteignables")
+    if bitstate_mb is not None:
+        print(
+            f"  Bitstate: couverture estimée {store.coverage():.6f}, "
+            f"probabilité d'omission {store.omission_probability():.3e}"
+        )
+    if group is not None:
+        print(f"  Symétrie: un représentant par orbite (groupe d'ordre {len(group)})")
+    if reduced is not None:
+        print(
+            f"  POR: {reduced.reduced} état(s) développé(s) partiellement, "
+            f"{reduced.full} entièrement"
+        )
 
     if opaque_out["goal_mutex"] is None:
         print("  Exclusion mutuelle: OK (pas d'état CS/CS atteignable)")
@@ -53,5 +126,35 @@ def explore(name: str) -> None:
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--bitstate",
+        type=int,
+        default=None,
+        metavar="MB",
+        help="Visited approché par tableau de bits de MB Mo (supertrace).",
+    )
+    parser.add_argument(
+        "--packed",
+        action="store_true",
+        help="Configurations compactées dans un entier (packed_config.py).",
+    )
+    parser.add_argument(
+        "--por",
+        action="store_true",
+        help="Réduction d'ordre partiel (ensembles têtus, por.py).",
+    )
+    parser.add_argument(
+        "--symmetry",
+        action="store_true",
+        help="Réduction par symétrie (modèles qui en déclarent une, symmetry.py).",
+    )
+    args = parser.parse_args()
+    if args.por and args.symmetry:
+        parser.error("--por et --symmetry ne se combinent pas")
+    if args.por and args.bitstate is not None:
+        parser.error("--por: visited exact requis (sans --bitstate)")
     for m in ["AB1", "AB2", "AB3", "AB4", "AB5"]:
-        explore(m)
+        explore(
+            m, args.bitstate, packed=args.packed, por=args.por, symmetry=args.symmetry
+        )
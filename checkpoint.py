@@ -0,0 +1,90 @@
+"""Points de reprise (checkpoint) pour les longues explorations.
+
+Un checkpoint est un dictionnaire (file d'attente, visited, parents,
+opaque, ...) sérialisé par pickle puis compressé par zlib dans un fichier
+binaire. L'écriture passe par un fichier temporaire suivi de os.replace:
+un arrêt brutal pendant la sauvegarde laisse intact le checkpoint
+précédent.
+"""
+from __future__ import annotations
+
+import os
+import pickle
+import time
+import zlib
+from typing import Any, Callable, Dict, Optional
+
+MAGIC = b"VCKP1\n"
+
+Payload = Dict[str, Any]
+
+
+def save_checkpoint(path: str, payload: Payload) -> None:
+    data = zlib.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path: str) -> Payload:
+    with open(path, "rb") as f:
+        raw = f.read()
+    if not raw.startswith(MAGIC):
+        raise ValueError(f"{path}: ce n'est pas un checkpoint")
+    return pickle.loads(zlib.decompress(raw[len(MAGIC) :]))
+
+
+class Checkpointer:
+    """Sauvegarde périodique (toutes les `every` secondes) d'une exploration.
+
+    meta: informations d'identification du calcul (modèle, propriété...),
+    enregistrées dans le checkpoint et vérifiées à la reprise.
+    extra: fonction renvoyant des données supplémentaires à sauvegarder
+    (ex: étiquettes d'arêtes).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        every: float = 60.0,
+        meta: Optional[Dict[str, Any]] = None,
+        extra: Optional[Callable[[], Dict[str, Any]]] = None,
+    ) -> None:
+        self.path = path
+        self.every = every
+        self.meta = dict(meta or {})
+        self.extra = extra
+        self.saves = 0
+        self._last = time.monotonic()
+
+    def due(self) -> bool:
+        return time.monotonic() - self._last >= self.every
+
+    def save(self, payload: Payload) -> None:
+        full = dict(payload)
+        full["meta"] = self.meta
+        if self.extra is not None:
+            full["extra"] = self.extra()
+        save_checkpoint(self.path, full)
+        self.saves += 1
+        self._last = time.monotonic()
+
+    def load(self) -> Optional[Payload]:
+        """Charge le checkpoint s'il existe (None sinon), après vérification."""
+        if not os.path.exists(self.path):
+            return None
+        payload = load_checkpoint(self.path)
+        if payload.get("meta") != self.meta:
+            raise ValueError(
+                f"{self.path}: checkpoint d'un autre calcul ({payload.get('meta')})"
+            )
+        return payload
+
+    def clear(self) -> None:
+        """Supprime le checkpoint (exploration terminée)."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,7 @@
+"""Configuration pytest: les tests sont dans tests/.
+
+TD2/ et Interpretation Buchi/ ont leurs propres copies de bfs.py,
+soup_dsl.py, ...: ils ne sont pas collectés, pour que les tests importent
+les modules de la racine.
+"""
+collect_ignore = ["TD2", "Interpretation Buchi"]
@@ -0,0 +1,182 @@
+"""BFS en mémoire externe avec détection différée des doublons.
+
+Pour les espaces d'états plus grands que la RAM (Hanoi n grand, soupes
+paramétrées): au lieu d'un `visited: Set` et d'une `deque`, chaque niveau
+BFS vit sur disque.
+
+Pour chaque niveau:
+  1. on lit la frontière (fichier) et on génère les successeurs dans un
+     tampon borné; chaque tampon plein est trié et écrit dans un "run";
+  2. les runs sont fusionnés (fusion externe k-voies), les doublons du
+     niveau éliminés;
+  3. la fusion avec le fichier trié des états déjà visités élimine les
+     états des niveaux précédents (détection différée des doublons);
+  4. les nouveaux états forment le niveau suivant et sont fusionnés dans
+     le fichier visited.
+
+Seuls les tampons (buffer_size enregistrements) et une ligne par run
+ouvert sont en mémoire.
+
+Encodage: un état est écrit sous forme d'une ligne texte `encode(state)`
+(repr par défaut, relu par ast.literal_eval), ce qui convient aux états
+littéraux (tuples de str/int). L'ordre des états sur disque est l'ordre
+des chaînes encodées.
+"""
+from __future__ import annotations
+
+import ast
+import heapq
+import os
+import tempfile
+from typing import Any, Callable, Iterator, List, Optional, TextIO, Tuple
+
+from bfs import OnEntry, Opaque
+
+Encode = Callable[[Any], str]
+Decode = Callable[[str], Any]
+
+
+def _records(f: TextIO) -> Iterator[Tuple[str, str]]:
+    for line in f:
+        key, _, parent = line.rstrip("\n").partition("\t")
+        yield key, parent
+
+
+def _keys(f: TextIO) -> Iterator[str]:
+    for line in f:
+        yield line.rstrip("\n")
+
+
+class _Runs:
+    """Tampon borné de (clé, clé parent), vidé en runs triés sur disque."""
+
+    def __init__(self, workdir: str, buffer_size: int) -> None:
+        self.workdir = workdir
+        self.buffer_size = buffer_size
+        self.buffer: List[str] = []
+        self.paths: List[str] = []
+
+    def add(self, key: str, parent: str) -> None:
+        self.buffer.append(f"{key}\t{parent}\n")
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.buffer:
+            return
+        self.buffer.sort()
+        path = os.path.join(self.workdir, f"run_{len(self.paths)}")
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(self.buffer)
+        self.paths.append(path)
+        self.buffer = []
+
+    def merged_unique(self) -> Iterator[Tuple[str, str]]:
+        """Fusion k-voies des runs; garde le premier parent de chaque clé."""
+        self.flush()
+        files = [open(p, encoding="utf-8") for p in self.paths]
+        try:
+            last: Optional[str] = None
+            for line in heapq.merge(*files):
+                key, _, parent = line.rstrip("\n").partition("\t")
+                if key != last:
+                    last = key
+                    yield key, parent
+        finally:
+            for f in files:
+                f.close()
+            for p in self.paths:
+                os.remove(p)
+            self.paths = []
+
+
+def external_bfs(
+    graph: Any,
+    opaque: Opaque,
+    on_entry: OnEntry,
+    workdir: Optional[str] = None,
+    buffer_size: int = 100_000,
+    encode: Encode = repr,
+    decode: Decode = ast.literal_eval,
+) -> Tuple[Opaque, int]:
+    """BFS niveau par niveau sur disque, même callback que bfs.bfs.
+
+    on_entry(parent, node, opaque) est appelé une fois par état; à
+    l'intérieur d'un niveau, les états sont visités dans l'ordre de leurs
+    clés encodées (le parent retenu est la plus petite clé parmi les
+    prédécesseurs du niveau précédent). Renvoyer True arrête l'exploration.
+
+    Returns:
+      (opaque, visited_count)
+    """
+    with tempfile.TemporaryDirectory(dir=workdir, prefix="ext_bfs_") as tmp:
+        return _external_bfs(graph, opaque, on_entry, tmp, buffer_size, encode, decode)
+
+
+def _external_bfs(
+    graph: Any,
+    opaque: Opaque,
+    on_entry: OnEntry,
+    tmp: str,
+    buffer_size: int,
+    encode: Encode,
+    decode: Decode,
+) -> Tuple[Opaque, int]:
+    level_path = os.path.join(tmp, "level")
+    visited_path = os.path.join(tmp, "visited")
+    count = 0
+
+    # Niveau 0: racines
+    runs = _Runs(tmp, buffer_size)
+    for root in graph.roots():
+        runs.add(encode(root), "")
+    with open(level_path, "w", encoding="utf-8") as lv, open(
+        visited_path, "w", encoding="utf-8"
+    ) as vis:
+        for key, _ in runs.merged_unique():
+            count += 1
+            lv.write(f"{key}\t\n")
+            vis.write(f"{key}\n")
+            if on_entry(None, decode(key), opaque):
+                return opaque, count
+
+    while os.path.getsize(level_path) > 0:
+        # 1. expansion de la frontière dans des runs triés
+        runs = _Runs(tmp, buffer_size)
+        with open(level_path, encoding="utf-8") as lv:
+            for key, _ in _records(lv):
+                for succ in graph.neighbors(decode(key)):
+                    runs.add(encode(succ), key)
+
+        # 2-4. fusion des runs, élimination des états déjà visités
+        next_level = os.path.join(tmp, "level_next")
+        next_visited = os.path.join(tmp, "visited_next")
+        stopped = False
+        with open(visited_path, encoding="utf-8") as old, open(
+            next_level, "w", encoding="utf-8"
+        ) as lv, open(next_visited, "w", encoding="utf-8") as vis:
+            old_keys = _keys(old)
+            cur_old = next(old_keys, None)
+            for key, parent in runs.merged_unique():
+                while cur_old is not None and cur_old < key:
+                    vis.write(f"{cur_old}\n")
+                    cur_old = next(old_keys, None)
+                if cur_old == key:
+                    continue  # doublon d'un niveau précédent
+                count += 1
+                lv.write(f"{key}\t{parent}\n")
+                vis.write(f"{key}\n")
+                if on_entry(decode(parent), decode(key), opaque):
+                    stopped = True
+                    break
+            while cur_old is not None:
+                vis.write(f"{cur_old}\n")
+                cur_old = next(old_keys, None)
+
+        if stopped:
+            return opaque, count
+
+        os.replace(next_level, level_path)
+        os.replace(next_visited, visited_path)
+
+    return opaque, count
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from copy import deepcopy
 from typing import Iterable, List, Tuple
 
 from language_semantics import Action, LanguageSemantics
+from ordering import REPR
 
 Peg = Tuple[int, ...]
 State = Tuple[Peg, Peg, Peg]
@@ -16,8 +16,14 @@ class HanoiLS(LanguageSemantics):
     - état = (peg0, peg1, peg2)
     - peg = tuple de disques (bas -> haut), top = peg[-1]
     - action = move i->j
+
+    Ordre des états: repr (sort_key=REPR). L'ordre naturel des tuples n'est
+    pas celui des repr: "(10, ...)" passe avant "(9, ...)" dès n >= 10, et
+    "(3,)" après "(3, 2)"; il changerait donc le parcours et la solution.
     """
 
+    sort_key = REPR
+
     def __init__(self, n: int) -> None:
         if n <= 0:
             raise ValueError("n doit être > 0")
@@ -46,8 +52,8 @@ class HanoiLS(LanguageSemantics):
     def execute(self, state: State, action: Action) -> Iterable[State]:
         i, j = action.data
 
-        # On passe en structure mutable, puis deepcopy (copie indépendante)
-        pegs = deepcopy([list(p) for p in state])
+        # On passe en structure mutable (listes neuves: state n'est pas modifié)
+        pegs = [list(p) for p in state]
 
         # Vérifications de sécurité (au cas où)
         if not pegs[i]:
@@ -64,6 +70,25 @@ class HanoiLS(LanguageSemantics):
         nxt: State = tuple(tuple(p) for p in pegs)  # type: ignore
         return [nxt]
 
+    def encode_state(self, state: State) -> int:
+        """État compacté en un entier: 2 bits par disque (numéro de piquet).
+
+        Les disques d'un piquet sont toujours décroissants (bas -> haut):
+        le piquet de chaque disque suffit à retrouver l'état (decode_state).
+        Codec pour StateTable(ls.encode_state, ls.decode_state).
+        """
+        code = 0
+        for peg, disks in enumerate(state):
+            for d in disks:
+                code |= peg << (2 * (d - 1))
+        return code
+
+    def decode_state(self, code: int) -> State:
+        pegs: List[List[int]] = [[], [], []]
+        for d in range(self.n, 0, -1):
+            pegs[(code >> (2 * (d - 1))) & 3].append(d)
+        return (tuple(pegs[0]), tuple(pegs[1]), tuple(pegs[2]))
+
     def is_goal(self, state: State) -> bool:
         target = tuple(range(self.n, 0, -1))
         return state[0] == () and state[1] == () and state[2] == target
@@ -1,6 +1,8 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Any, Callable, Iterable, List, Set, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from ordering import REPR, SortKey
 
 
 # Un "morceau" iSoup = une transition de l'automate de propriété
@@ -13,14 +15,27 @@ class iPiece:
 
 @dataclass
 class iSoup:
+    """Propriété iSoup.
+
+    ap: projection d'un pas système sur les propositions atomiques lues par
+    les gardes (ex: cond(step) -> bool). Si elle est donnée, les gardes ne
+    doivent dépendre du pas que par ap(step): les actions sont alors
+    mémorisées par (état de propriété, ap(step)).
+    """
+
     pieces: List[iPiece]
     init: List[Any]
     accepting: Set[Any]
+    sort_key: SortKey = REPR  # ordre des états de propriété (ordering.py)
+    ap: Optional[Callable[[Any], Any]] = None
 
 
 class iSoupSemantics:
     def __init__(self, isoup: iSoup):
         self.isoup = isoup
+        self.sort_key = isoup.sort_key
+        self._ap = isoup.ap
+        self._table: Dict[Tuple[Any, Any], List[iPiece]] = {}
 
     def initials(self) -> List[Any]:
         return list(self.isoup.init)
@@ -29,6 +44,16 @@ class iSoupSemantics:
         return prop_state in self.isoup.accepting
 
     def actions(self, sys_cfg: Any, prop_state: Any) -> List[iPiece]:
+        if self._ap is None:
+            return self._evaluate(sys_cfg, prop_state)
+        # table (état, valuation des propositions) -> morceaux, partagée
+        key = (prop_state, self._ap(sys_cfg))
+        out = self._table.get(key)
+        if out is None:
+            out = self._table[key] = self._evaluate(sys_cfg, prop_state)
+        return out
+
+    def _evaluate(self, sys_cfg: Any, prop_state: Any) -> List[iPiece]:
         # Ordre déterministe: on garde l'ordre de self.isoup.pieces
         out: List[iPiece] = []
         for p in self.isoup.pieces:
@@ -1,47 +1,185 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Tuple
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
 from rooted_graph import RootedGraph
 from language_semantics import LanguageSemantics, Action
+from ordering import (
+    action_name,
+    action_order,
+    first_order,
+    sort_in_place,
+    sorted_by,
+    state_order,
+)
+
+# Modes de conservation des étiquettes (keep_labels=True)
+LABELS_EDGES = "edges"  # une étiquette par arête générée: O(arêtes)
+LABELS_TREE = "tree"  # arête de première découverte de chaque état: O(états)
+LABELS_LAZY = "lazy"  # rien n'est stocké, recalcul à la demande
+
+
+def _label(act: Any) -> str:
+    # étiquette mémorisée: action, ou déjà un nom (import_labels)
+    return act if isinstance(act, str) else action_name(act)
 
 
 class LS2RG(RootedGraph):
     """
     Adaptateur: LanguageSemantics -> RootedGraph.
     neighbors(state) = union execute(state, a) pour a dans actions(state).
+
+    Les ordres (états / actions) sont ceux déclarés par la sémantique
+    (voir ordering.py); sort_key est réexposé pour bfs.
+
+    cache_size: cache LRU des successeurs (clé = état), pour les
+    appels répétés à neighbors (checkers, étiquetage de traces, passes
+    multiples). 0 = pas de cache, None = cache non borné. Les listes
+    renvoyées sont alors partagées: ne pas les modifier.
+
+    label_mode (avec keep_labels=True):
+      - LABELS_EDGES: étiquette de chaque arête (état, succ) générée;
+      - LABELS_TREE: pour chaque état, seulement l'arête qui l'a généré en
+        premier, c'est-à-dire l'arête parent de l'arbre BFS;
+      - LABELS_LAZY: aucune étiquette stockée.
+    En modes tree et lazy, label(src, dst) pour une arête non mémorisée
+    rejoue actions / execute depuis src. Les actions sont mémorisées telles
+    quelles: leur nom (action.name) n'est calculé qu'en cas de conflit entre
+    deux arêtes et à l'affichage (label), ex: noms paresseux de
+    StepSynchronousProduct.ProductAction.
+
+    Si la sémantique fournit successors(state) -> [(action, succ), ...] (un
+    successeur par action, dans l'ordre de actions(state); ex:
+    soup_dsl.CompiledSemantics), neighbors l'utilise: un seul appel par état,
+    même résultat que actions + execute.
     """
 
-    def __init__(self, ls: LanguageSemantics, keep_labels: bool = False) -> None:
+    def __init__(
+        self,
+        ls: LanguageSemantics,
+        keep_labels: bool = False,
+        cache_size: Optional[int] = 0,
+        label_mode: str = LABELS_EDGES,
+    ) -> None:
+        if label_mode not in (LABELS_EDGES, LABELS_TREE, LABELS_LAZY):
+            raise ValueError(f"label_mode inconnu: {label_mode}")
         self.ls = ls
         self.keep_labels = keep_labels
-        self._labels: Dict[Tuple[Any, Any], str] = {}
+        self.label_mode = label_mode
+        self._labels: Dict[Tuple[Any, Any], Any] = {}  # (état, succ) -> action
+        self._tree: Dict[Any, Tuple[Any, Any]] = {}  # succ -> (état, action)
+        self.sort_key = state_order(ls)
+        self.action_key = action_order(ls)
+        self._fused = getattr(ls, "successors", None)
+        self._pair_key = first_order(self.action_key)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Any, List[Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
 
     def roots(self) -> List[Any]:
-        return sorted(list(self.ls.initials()), key=repr)
+        return sorted_by(self.ls.initials(), self.sort_key)
 
     def neighbors(self, state: Any) -> List[Any]:
+        if self.cache_size == 0:
+            return self._successors(state)
+
+        cache = self._cache
+        out = cache.get(state)
+        if out is not None:
+            cache.move_to_end(state)
+            self.hits += 1
+            return out
+
+        self.misses += 1
+        out = self._successors(state)
+        cache[state] = out
+        if self.cache_size is not None and len(cache) > self.cache_size:
+            cache.popitem(last=False)  # le moins récemment utilisé
+        return out
+
+    def cache_info(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._cache),
+            "maxsize": self.cache_size,
+        }
+
+    def cache_clear(self) -> None:
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+    def _successors(self, state: Any) -> List[Any]:
+        if self._fused is not None:
+            return self._fused_successors(state)
+
         out: List[Any] = []
 
         acts = list(self.ls.actions(state))
-        # tri stable par nom si possible, sinon repr
-        acts.sort(key=lambda a: getattr(a, "name", repr(a)))
+        # ordre déclaré par la sémantique (par nom par défaut)
+        sort_in_place(acts, self.action_key)
 
         for act in acts:
             nxts = list(self.ls.execute(state, act))
-            nxts.sort(key=repr)
+            sort_in_place(nxts, self.sort_key)
 
             for nxt in nxts:
                 out.append(nxt)
                 if self.keep_labels:
-                    key = (state, nxt)
-                    name = act.name
-                    prev = self._labels.get(key)
-                    # si plusieurs actions mènent au même nxt, choisir la plus petite (stable)
-                    if prev is None or name < prev:
-                        self._labels[key] = name
+                    self._record(state, nxt, act)
 
         return out
 
+    def _fused_successors(self, state: Any) -> List[Any]:
+        pairs = list(self._fused(state))
+        # même ordre que actions triées puis execute (tri stable par action)
+        sort_in_place(pairs, self._pair_key)
+        if self.keep_labels:
+            for act, nxt in pairs:
+                self._record(state, nxt, act)
+        return [nxt for _, nxt in pairs]
+
+    def _record(self, state: Any, nxt: Any, act: Any) -> None:
+        if self.label_mode == LABELS_EDGES:
+            key = (state, nxt)
+            prev = self._labels.get(key)
+            # si plusieurs actions mènent au même nxt, choisir la plus petite (stable)
+            if prev is None or _label(act) < _label(prev):
+                self._labels[key] = act
+        elif self.label_mode == LABELS_TREE:
+            prev_t = self._tree.get(nxt)
+            if prev_t is None or (
+                prev_t[0] == state and _label(act) < _label(prev_t[1])
+            ):
+                self._tree[nxt] = (state, act)
+
+    def _recompute_label(self, src: Any, dst: Any) -> str:
+        # plus petite action de src menant à dst (même règle que _record)
+        best: Optional[str] = None
+        for act in self.ls.actions(src):
+            if dst in list(self.ls.execute(src, act)):
+                if best is None or act.name < best:
+                    best = act.name
+        return "?" if best is None else best
+
+    def export_labels(self) -> Dict[Any, Any]:
+        """Étiquettes mémorisées, actions remplacées par leur nom (checkpoints)."""
+        if self.label_mode == LABELS_TREE:
+            return {k: (src, _label(a)) for k, (src, a) in self._tree.items()}
+        return {k: _label(a) for k, a in self._labels.items()}
+
+    def import_labels(self, labels: Dict[Any, Any]) -> None:
+        store = self._tree if self.label_mode == LABELS_TREE else self._labels
+        store.update(labels)
+
     def label(self, src: Any, dst: Any) -> str:
         """Optionnel: utile pour afficher une trace d'actions."""
-        return self._labels.get((src, dst), "?")
+        if not self.keep_labels or self.label_mode == LABELS_EDGES:
+            act = self._labels.get((src, dst))
+            return "?" if act is None else _label(act)
+        if self.label_mode == LABELS_TREE:
+            rec = self._tree.get(dst)
+            if rec is not None and rec[0] == src:
+                return _label(rec[1])
+        return self._recompute_label(src, dst)
@@ -0,0 +1,148 @@
+"""Produit d'un système avec plusieurs propriétés iSoup (une seule exploration).
+
+État produit: (lc, comps) où comps[i] est l'ensemble des états de la
+propriété i (automate non déterministe) atteignables en lisant les pas
+système du chemin, sous forme de tuple trié (construction des sous-ensembles
+à la volée). Chaque pas système (lc, la, lt) fait avancer toutes les
+propriétés à la fois: le côté propriété est déterministe, une seule
+configuration système n'est donc associée qu'à un vecteur d'ensembles par
+chemin, au lieu d'un produit par propriété.
+
+Composantes particulières:
+  - ACCEPTED (None): la propriété a atteint un état acceptant (violation);
+  - (): plus aucun état possible, la propriété ne peut plus accepter.
+ACCEPTED est absorbant. Le produit ne dépend pas de l'exploration: les
+propriétés déjà décidées sont filtrées par l'appelant (verify_many), pas
+par la sémantique, pour que les états déjà rencontrés gardent leur sens.
+
+run(prop, steps) rejoue un chemin système sur une propriété et
+retrouve une exécution acceptante (noms des morceaux iSoup), pour les
+étiquettes "la||ra" des contre-exemples.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from ordering import UNORDERED, action_name, action_order, sorted_by, state_order
+from StepSynchronousProduct import STEP_CACHE, Step, StepSynchronousProduct
+
+ACCEPTED = None
+
+
+class StepAction(NamedTuple):
+    """Action du produit multiple: le pas système seul (nom = son action)."""
+
+    step: Step
+
+    @property
+    def name(self) -> str:
+        return action_name(self.step[1])
+
+
+class MultiPropertyProduct(StepSynchronousProduct):
+    """Produit synchrone système × (propriété 1, ..., propriété k).
+
+    lhs: sémantique système; props: sémantiques iSoup (isoup_lang), avec
+    initials / actions(step, rs) / execute(a, step, rs) / accepting(rs).
+    Les pas système viennent du cache de StepSynchronousProduct.
+    Une seule cible par action, générée dans l'ordre: sort_key et
+    action_key valent UNORDERED.
+    """
+
+    def __init__(
+        self, lhs: Any, props: Sequence[Any], cache_size: Optional[int] = STEP_CACHE
+    ) -> None:
+        super().__init__(lhs, None, cache_size)
+        self.props = list(props)
+        self._pkeys = [state_order(p) for p in self.props]
+        self.sort_key = UNORDERED
+        self.action_key = UNORDERED
+
+    def _comp(self, i: int, states: Any) -> Optional[Tuple[Any, ...]]:
+        prop = self.props[i]
+        uniq = list(dict.fromkeys(states))
+        if any(prop.accepting(rs) for rs in uniq):
+            return ACCEPTED
+        return tuple(sorted_by(uniq, self._pkeys[i]))
+
+    def initials(self) -> List[Any]:
+        comps = tuple(self._comp(i, p.initials()) for i, p in enumerate(self.props))
+        return [(lc, comps) for lc in sorted_by(self.lhs.initials(), self._lkey)]
+
+    def actions(self, c: Any) -> List[StepAction]:
+        if not any(c[1]):
+            return []  # aucune propriété ne peut plus accepter depuis c
+        return [StepAction(step) for step in self.steps(c[0])]
+
+    def execute(self, c: Any, a: StepAction) -> List[Any]:
+        _, comps = c
+        step = a.step
+        out: List[Optional[Tuple[Any, ...]]] = []
+        for i, comp in enumerate(comps):
+            if comp is ACCEPTED:
+                out.append(ACCEPTED)
+                continue
+            prop = self.props[i]
+            out.append(
+                self._comp(
+                    i,
+                    (
+                        rt
+                        for rs in comp
+                        for ra in prop.actions(step, rs)
+                        for rt in prop.execute(ra, step, rs)
+                    ),
+                )
+            )
+        return [(step[2], tuple(out))]
+
+    def accepted(self, c: Any) -> List[int]:
+        """Propriétés qui acceptent dans l'état c (ou l'un de ses ancêtres)."""
+        return [i for i, comp in enumerate(c[1]) if comp is ACCEPTED]
+
+    def system_steps(self, path: Sequence[Any], labels: Sequence[str]) -> List[Step]:
+        """Pas système d'un chemin du produit (labels = noms des actions)."""
+        out: List[Step] = []
+        for (lc, _), (lt, _), name in zip(path, path[1:], labels):
+            step = next(
+                (
+                    s
+                    for s in self.steps(lc)
+                    if s[2] == lt and action_name(s[1]) == name
+                ),
+                None,
+            )
+            if step is None:
+                raise ValueError(f"pas système {name} de {lc!r} vers {lt!r} absent")
+            out.append(step)
+        return out
+
+
+def run(prop: Any, steps: Sequence[Step]) -> Optional[Tuple[List[Any], List[str]]]:
+    """Exécution de prop le long de steps qui finit dans un état acceptant.
+
+    Returns: (états de la propriété, noms des morceaux), ou None.
+    """
+    key = state_order(prop)
+    akey = action_order(prop)
+    layers: List[Dict[Any, Optional[Tuple[Any, str]]]] = [
+        {rs: None for rs in sorted_by(prop.initials(), key)}
+    ]
+    for step in steps:
+        nxt: Dict[Any, Optional[Tuple[Any, str]]] = {}
+        for rs in layers[-1]:
+            for ra in sorted_by(prop.actions(step, rs), akey):
+                for rt in sorted_by(prop.execute(ra, step, rs), key):
+                    nxt.setdefault(rt, (rs, action_name(ra)))
+        layers.append(nxt)
+    goal = next((rs for rs in layers[-1] if prop.accepting(rs)), None)
+    if goal is None:
+        return None
+    states = [goal]
+    names: List[str] = []
+    for layer in reversed(layers[1:]):
+        prev = layer[states[-1]]
+        assert prev is not None
+        states.append(prev[0])
+        names.append(prev[1])
+    return states[::-1], names[::-1]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import Any, Callable, Tuple
 from isoup_lang import iPiece, iSoup
+from ordering import NATURAL
 
 PropState = str  # "T" ou "F"
 Step = Tuple[Any, Any, Any]  # (lc, la, lt)
@@ -25,7 +26,7 @@ def build_never_cond_pattern1(cond: Callable[[Step], bool]) -> iSoup:
             effect=lambda step, ps: T,
         ),
     ]
-    return iSoup(pieces=pieces, init=[T], accepting={F})
+    return iSoup(pieces=pieces, init=[T], accepting={F}, sort_key=NATURAL, ap=cond)
 
 
 def build_never_cond_pattern2(cond: Callable[[Step], bool]) -> iSoup:
@@ -47,7 +48,7 @@ def build_never_cond_pattern2(cond: Callable[[Step], bool]) -> iSoup:
             effect=lambda step, ps: T,
         ),
     ]
-    return iSoup(pieces=pieces, init=[T], accepting={F})
+    return iSoup(pieces=pieces, init=[T], accepting={F}, sort_key=NATURAL, ap=cond)
 
 
 # Conditions P1 / P2
@@ -0,0 +1,124 @@
+"""BFS parallèle, synchrone par niveau.
+
+Chaque niveau BFS est découpé en paquets de nœuds; les successeurs sont
+générés (et triés) dans des processus de travail, la déduplication et les
+appels à on_entry restent dans le processus coordinateur.
+
+Les résultats des paquets sont consommés dans l'ordre du niveau, et chaque
+liste de successeurs dans l'ordre déclaré par le graphe: l'ordre de
+découverte, donc le parent BFS de chaque nœud, est exactement celui de
+bfs.bfs (reconstruct_path donne la même trace).
+"""
+from __future__ import annotations
+
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Optional, Set, Tuple
+
+from bfs import Node, OnEntry, Opaque
+from ordering import sort_in_place, state_order
+
+_GRAPH: Any = None
+
+
+def _init_worker(graph: Any) -> None:
+    global _GRAPH
+    _GRAPH = graph
+
+
+def _expand(chunk: List[Any]) -> List[List[Any]]:
+    key = state_order(_GRAPH)
+    out: List[List[Any]] = []
+    for node in chunk:
+        succs = list(_GRAPH.neighbors(node))
+        sort_in_place(succs, key)
+        out.append(succs)
+    return out
+
+
+def _mp_context() -> Any:
+    # fork: le graphe (souvent plein de lambdas) n'a pas besoin d'être picklable;
+    # sans fork (Windows), None: tous les niveaux sont développés localement
+    if "fork" in mp.get_all_start_methods():
+        return mp.get_context("fork")
+    return None
+
+
+def parallel_bfs(
+    graph: Any,
+    opaque: Opaque,
+    on_entry: OnEntry,
+    workers: Optional[int] = None,
+    chunksize: int = 64,
+    min_parallel: int = 256,
+) -> Tuple[Opaque, Set[Node]]:
+    """Même contrat que bfs.bfs, avec expansion des niveaux sur un pool.
+
+    - workers: nombre de processus (défaut: nombre de cœurs)
+    - chunksize: nombre de nœuds envoyés par tâche
+    - min_parallel: en dessous de cette taille, un niveau est développé
+      localement (le coût de communication dépasserait le gain)
+
+    Remarque: les effets de bord de graph.neighbors dans les processus de
+    travail (ex: étiquettes LS2RG(keep_labels=True)) ne sont pas visibles
+    côté coordinateur.
+
+    Le pool n'est créé qu'au premier niveau d'au moins min_parallel nœuds.
+    Sans la méthode de démarrage fork (Windows), le graphe devrait être
+    picklable: l'exploration reste alors séquentielle (même résultat que
+    bfs.bfs).
+
+    Returns:
+      (opaque, visited)
+    """
+
+    key = state_order(graph)
+    visited: Set[Node] = set()
+    level: List[Any] = []
+
+    roots = list(graph.roots())
+    sort_in_place(roots, key)
+    for node in roots:
+        if node in visited:
+            continue
+        done = on_entry(None, node, opaque)
+        visited.add(node)
+        level.append(node)
+        if done:
+            return opaque, visited
+
+    ctx = _mp_context()
+    pool: Optional[ProcessPoolExecutor] = None
+    try:
+        while level:
+            chunks = [level[i : i + chunksize] for i in range(0, len(level), chunksize)]
+            if ctx is None or len(level) < min_parallel:
+                _init_worker(graph)
+                results = map(_expand, chunks)
+            else:
+                if pool is None:
+                    pool = ProcessPoolExecutor(
+                        max_workers=workers,
+                        mp_context=ctx,
+                        initializer=_init_worker,
+                        initargs=(graph,),
+                    )
+                results = pool.map(_expand, chunks)
+
+            nxt: List[Any] = []
+            for parents, succ_lists in zip(chunks, results):
+                for parent, succs in zip(parents, succ_lists):
+                    for node in succs:
+                        if node in visited:
+                            continue
+                        done = on_entry(parent, node, opaque)
+                        visited.add(node)
+                        nxt.append(node)
+                        if done:
+                            return opaque, visited
+            level = nxt
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    return opaque, visited
@@ -0,0 +1,284 @@
+"""Exploration multi-processus partitionnée par hachage.
+
+Chaque état appartient à un seul processus de travail (owner = hash % N):
+seul ce processus le stocke dans son ensemble visited, appelle on_entry
+dessus et génère ses successeurs. Les successeurs appartenant à un autre
+processus lui sont envoyés par paquets via sa file (owner-computes).
+La mémoire totale est donc répartie sur les N processus.
+
+Détection de terminaison: un compteur partagé `pending` compte les paquets
+en transit. L'émetteur l'incrémente avant chaque envoi, le destinataire le
+décrémente après avoir traité le paquet; il ne vaut 0 que lorsque plus
+aucun travail n'existe.
+
+L'ordre de visite n'est pas celui d'un BFS: le parent transmis à on_entry
+est un prédécesseur valide, pas forcément le parent BFS.
+
+Une exception dans un processus de travail arrête l'exploration (stop) sans
+casser le décompte de `pending`; elle est renvoyée par la file des résultats
+et relevée en RuntimeError dans l'appelant. Un processus mort (exitcode non
+nul) est détecté pendant l'attente.
+"""
+from __future__ import annotations
+
+import multiprocessing as mp
+import queue
+import traceback
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bfs import OnEntry, Opaque
+
+Owner = Callable[[Any], int]
+Merge = Callable[[Opaque, Opaque], None]
+
+POLL = 0.1  # secondes entre deux vérifications des processus de travail
+
+
+def blank_opaque(opaque: Opaque) -> Opaque:
+    """Opaque de départ d'un processus de travail: même forme, sans contenu.
+
+    dict/set/list: vide, bool: False, int: 0; les autres valeurs (None,
+    paramètres) sont reprises telles quelles. Chaque processus n'accumule
+    ainsi que sa contribution, fusionnée une seule fois dans l'opaque initial.
+    """
+    out: Dict[Any, Any] = {}
+    for k, v in opaque.items():
+        if isinstance(v, (dict, set, list)):
+            out[k] = type(v)()
+        elif isinstance(v, bool):
+            out[k] = False
+        elif isinstance(v, int):
+            out[k] = 0
+        else:
+            out[k] = v
+    return out
+
+
+def merge_opaque(dst: Opaque, src: Opaque) -> None:
+    """Fusion par défaut de la contribution d'un processus de travail.
+
+    dict/set: union, list: concaténation, bool: ou logique, int: somme,
+    None: première valeur non None rencontrée. Les autres valeurs de dst sont
+    conservées, de même que toute valeur de dst quand src[k] est None.
+    """
+    for k, v in src.items():
+        if v is None:
+            continue  # pas de contribution du processus
+        cur = dst.get(k)
+        if isinstance(cur, dict):
+            cur.update(v)
+        elif isinstance(cur, set):
+            cur |= v
+        elif isinstance(cur, list):
+            cur.extend(v)
+        elif isinstance(cur, bool):
+            dst[k] = cur or v
+        elif isinstance(cur, int):
+            dst[k] = cur + v
+        elif cur is None:
+            dst[k] = v
+
+
+def _worker(
+    me: int,
+    graph: Any,
+    on_entry: OnEntry,
+    opaque: Opaque,
+    owner: Owner,
+    inboxes: List[Any],
+    pending: Any,
+    stop: Any,
+    done: Any,
+    results: Any,
+    batch: int,
+) -> None:
+    n = len(inboxes)
+    visited = set()
+    out: List[List[Tuple[Any, Any]]] = [[] for _ in range(n)]
+
+    def send(j: int) -> None:
+        with pending.get_lock():
+            pending.value += 1
+        inboxes[j].put(out[j])
+        out[j] = []
+
+    error: Optional[str] = None
+    inbox = inboxes[me]
+    while True:
+        msg = inbox.get()
+        if msg is None:
+            break
+
+        # stop n'est consulté qu'une fois par paquet reçu
+        work = [] if stop.is_set() else list(msg)
+        try:
+            while work:
+                parent, node = work.pop()
+                if node in visited:
+                    continue
+                visited.add(node)
+                if on_entry(parent, node, opaque):
+                    stop.set()
+                    break
+                for succ in graph.neighbors(node):
+                    j = owner(succ) % n
+                    if j == me:
+                        if succ not in visited:
+                            work.append((node, succ))
+                        continue
+                    out[j].append((node, succ))
+                    if len(out[j]) >= batch:
+                        send(j)
+
+            for j in range(n):
+                if out[j]:
+                    send(j)
+        except Exception:
+            if error is None:
+                error = traceback.format_exc()
+            stop.set()
+            out = [[] for _ in range(n)]
+
+        # toujours décrémenté, même après une erreur: la terminaison reste sûre
+        with pending.get_lock():
+            pending.value -= 1
+            if pending.value == 0:
+                done.set()
+
+    results.put((me, len(visited), opaque if error is None else None, error))
+
+
+def _stable_owner(state: Any) -> int:
+    return zlib.crc32(repr(state).encode("utf-8"))
+
+
+def _default_owner(ctx_name: str) -> Owner:
+    if ctx_name == "fork":
+        # même graine de hachage dans tous les processus forkés
+        return hash
+    return _stable_owner
+
+
+def partitioned_bfs(
+    graph: Any,
+    opaque: Opaque,
+    on_entry: OnEntry,
+    workers: int = 4,
+    batch: int = 256,
+    owner: Optional[Owner] = None,
+    merge: Merge = merge_opaque,
+) -> Tuple[Opaque, int]:
+    """Explore graph (ex: LS2RG(ls)) sur `workers` processus.
+
+    on_entry(parent, node, opaque) est appelé exactement une fois par état
+    atteignable, dans le processus propriétaire, sur blank_opaque(opaque);
+    s'il renvoie True, l'exploration s'arrête au plus tôt. Les opaques des
+    processus sont ensuite fusionnés dans `opaque` par `merge` (les valeurs
+    doivent être picklables). Les clés valant None au départ reçoivent la
+    première valeur non None, dans l'ordre des processus.
+
+    Sans fork (Windows), graph, on_entry et owner doivent être picklables.
+
+    Returns:
+      (opaque, visited_count)
+
+    Raises:
+      RuntimeError: exception dans un processus de travail (trace jointe) ou
+        processus terminé anormalement.
+    """
+    if workers < 1:
+        raise ValueError("workers doit être >= 1")
+
+    methods = mp.get_all_start_methods()
+    ctx = mp.get_context("fork" if "fork" in methods else None)
+    if owner is None:
+        owner = _default_owner(ctx.get_start_method())
+
+    inboxes = [ctx.Queue() for _ in range(workers)]
+    results = ctx.Queue()
+    pending = ctx.Value("q", 0)
+    stop = ctx.Event()
+    done = ctx.Event()
+
+    procs = [
+        ctx.Process(
+            target=_worker,
+            args=(
+                i,
+                graph,
+                on_entry,
+                blank_opaque(opaque),
+                owner,
+                inboxes,
+                pending,
+                stop,
+                done,
+                results,
+                batch,
+            ),
+        )
+        for i in range(workers)
+    ]
+    for p in procs:
+        p.start()
+
+    def abort() -> None:
+        # processus peut-être bloqués dans inbox.get(): join attendrait sans fin
+        for p in procs:
+            p.terminate()
+        for q in inboxes:
+            q.cancel_join_thread()
+
+    def check_alive() -> None:
+        dead = [i for i, p in enumerate(procs) if p.exitcode not in (None, 0)]
+        if dead:
+            raise RuntimeError(f"processus de travail {dead} terminés anormalement")
+
+    finished = False
+    try:
+        seeds: Dict[int, List[Tuple[Any, Any]]] = {}
+        for root in graph.roots():
+            seeds.setdefault(owner(root) % workers, []).append((None, root))
+        if seeds:
+            with pending.get_lock():
+                pending.value += len(seeds)
+            for j, msg in seeds.items():
+                inboxes[j].put(msg)
+            while not done.wait(POLL):
+                check_alive()
+
+        for q in inboxes:
+            q.put(None)
+
+        collected = []
+        while len(collected) < workers:
+            try:
+                collected.append(results.get(timeout=POLL))
+            except queue.Empty:
+                check_alive()
+        finished = True
+    finally:
+        # exception avant la fin (roots(), owner(), processus mort...)
+        if not finished:
+            abort()
+        for p in procs:
+            p.join()
+
+    errors = [(me, err) for me, _, _, err in collected if err is not None]
+    if errors:
+        me, err = min(errors)
+        raise RuntimeError(f"processus de travail {me}:\n{err}")
+
+    # clés None au départ: première valeur non None, dans l'ordre des processus
+    # (sinon merge sommerait, par exemple, les entiers des processus suivants)
+    unset = [k for k, v in opaque.items() if v is None]
+    total = 0
+    for _, count, part, _ in sorted(collected, key=lambda r: r[0]):
+        total += count
+        for k in unset:
+            v = part.pop(k, None)
+            if opaque[k] is None:
+                opaque[k] = v
+        merge(opaque, part)
+    return opaque, total
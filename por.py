@@ -0,0 +1,230 @@
+"""Réduction d'ordre partiel (ensembles têtus) pour les soups déclaratives.
+
+Dans un modèle entrelacé, deux règles indépendantes (aucun champ écrit par
+l'une n'est lu ou écrit par l'autre) commutent: explorer leurs deux ordres
+ne produit que des états intermédiaires redondants. StubbornSemantics
+enveloppe une sémantique compilée (soup_dsl.CompiledSemantics, dont les
+empreintes Rule.reads / Rule.writes sont connues statiquement) et ne
+renvoie, dans chaque état, qu'un sous-ensemble têtu des règles activables:
+
+  - graine: une règle activable t; on ferme l'ensemble T par
+      * règle activable u dans T: toutes les règles dépendantes de u;
+      * règle inactivable u dans T: un ensemble nécessaire d'activation,
+        les règles qui écrivent la valeur attendue par un test faux de la
+        garde de u (pour any_of, un test faux de chaque alternative);
+  - on garde, sur toutes les graines, le T qui a le moins de règles
+    activables.
+
+Les deadlocks sont préservés (T est vide seulement si aucune règle n'est
+activable). Pour les propriétés d'état, `visible` nomme les champs observés
+(ex: a_loc, b_loc pour l'exclusion mutuelle): un ensemble qui contient une
+règle activable écrivant un champ visible est remplacé par toutes les
+règles activables.
+
+Proviso de cycle (fondé sur visited): un cycle du graphe réduit ne doit pas
+ignorer indéfiniment une règle. Dans tout cycle, l'état découvert en
+dernier a un successeur découvert avant lui; on développe donc entièrement
+un état dont un successeur réduit est déjà visité avec un rang de
+découverte <= au sien. `discovered(state)` donne ce rang (None si l'état
+n'est pas encore visité), ex: StateTable.id_of pour bfs_interned. Les
+deadlocks seuls (visible vide) n'ont pas besoin du proviso.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from ordering import action_order, state_order
+from soup_dsl import Rule
+
+Test = Tuple[int, Any]  # (indice du champ, valeur attendue)
+
+
+class StubbornSemantics:
+    """Sémantique réduite (voir le docstring du module).
+
+    sem: sémantique compilée (attribut spec: soup_dsl.Spec).
+    visible: champs lus par la propriété vérifiée.
+    discovered: rang de découverte des états visités (proviso de cycle);
+    None = pas de proviso (suffisant pour les deadlocks seuls).
+
+    Compteurs: reduced (états développés partiellement), full (états
+    développés entièrement alors que plusieurs règles étaient activables).
+    """
+
+    def __init__(
+        self,
+        sem: Any,
+        visible: Sequence[str] = (),
+        discovered: Optional[Callable[[Any], Optional[int]]] = None,
+    ) -> None:
+        spec = sem.spec
+        self.sem = sem
+        self.discovered = discovered
+        self.sort_key = state_order(sem)
+        self.action_key = action_order(sem)
+        self.immutable = getattr(sem, "immutable", False)
+        if getattr(sem, "successors", None) is not None:
+            self.successors = self._successors
+        rules: List[Rule] = list(spec.rules)
+        self._when: Dict[Rule, List[Test]] = {
+            r: [(spec.index(f), v) for f, v in r.when] for r in rules
+        }
+        self._any_of: Dict[Rule, List[List[Test]]] = {
+            r: [[(spec.index(f), v) for f, v in alt] for alt in r.any_of]
+            for r in rules
+        }
+        # règles dépendantes: champ écrit par l'une, lu ou écrit par l'autre
+        self._dep: Dict[Rule, FrozenSet[Rule]] = {
+            r: frozenset(
+                u
+                for u in rules
+                if u is not r
+                and (r.writes & (u.reads | u.writes) or u.writes & r.reads)
+            )
+            for r in rules
+        }
+        # règles qui rendent vrai le test champ == valeur
+        self._enablers: Dict[Test, FrozenSet[Rule]] = {}
+        for r in rules:
+            for f, v in r.then:
+                key = (spec.index(f), v)
+                self._enablers[key] = self._enablers.get(key, frozenset()) | {r}
+        vis = set(visible)
+        self._visible = frozenset(r for r in rules if r.writes & vis)
+        self.reduced = 0
+        self.full = 0
+
+    def initials(self) -> List[Any]:
+        return self.sem.initials()
+
+    def execute(self, state: Any, action: Rule) -> List[Any]:
+        return self.sem.execute(state, action)
+
+    def actions(self, state: Any) -> List[Rule]:
+        pairs = [
+            (r, s) for r in self.sem.actions(state) for s in self.sem.execute(state, r)
+        ]
+        return list(dict.fromkeys(r for r, _ in self._reduce(state, pairs)))
+
+    def _successors(self, state: Any) -> List[Tuple[Rule, Any]]:
+        return self._reduce(state, self.sem.successors(state))
+
+    def _reduce(
+        self, state: Any, pairs: List[Tuple[Rule, Any]]
+    ) -> List[Tuple[Rule, Any]]:
+        """Couples (règle, successeur) de l'ensemble têtu retenu.
+
+        Les candidats sont essayés du plus petit au plus grand; le premier
+        qui respecte le proviso de cycle est retenu, sinon tout est gardé.
+        """
+        enabled = list(dict.fromkeys(r for r, _ in pairs))
+        if len(enabled) <= 1:
+            return pairs
+        for keep in self._candidates(state, enabled):
+            out = [p for p in pairs if p[0] in keep]
+            if not self._may_close_cycle(state, out):
+                self.reduced += 1
+                return out
+        self.full += 1
+        return pairs
+
+    def _may_close_cycle(self, state: Any, pairs: List[Tuple[Rule, Any]]) -> bool:
+        """Un successeur réduit est déjà visité avec un rang <= celui de state."""
+        rank = self.discovered
+        if rank is None or not self._visible:
+            return False  # deadlocks seuls: pas de proviso nécessaire
+        cur = rank(state)
+        for _, s in pairs:
+            k = rank(s)
+            if k is not None and (cur is None or k <= cur):
+                return True
+        return False
+
+    def _candidates(self, state: Any, enabled: List[Rule]) -> List[FrozenSet[Rule]]:
+        """Ensembles têtus (règles activables) invisibles et stricts, par taille."""
+        en = frozenset(enabled)
+        out: List[FrozenSet[Rule]] = []
+        for seed in enabled:
+            # pas de saut si seed est déjà dans un candidat: sa fermeture
+            # peut être strictement plus petite
+            cand = self._closure(state, seed, en)
+            if cand & self._visible or len(cand) == len(en) or cand in out:
+                continue  # condition de visibilité / pas de réduction
+            out.append(cand)
+        out.sort(key=len)
+        return out
+
+    def _closure(
+        self, state: Any, seed: Rule, en: FrozenSet[Rule]
+    ) -> FrozenSet[Rule]:
+        seen = {seed}
+        work = [seed]
+        while work:
+            u = work.pop()
+            nxt = self._dep[u] if u in en else self._necessary(state, u)
+            for w in nxt:
+                if w not in seen:
+                    seen.add(w)
+                    work.append(w)
+        return en.intersection(seen)
+
+    def _necessary(self, state: Any, u: Rule) -> FrozenSet[Rule]:
+        """Ensemble nécessaire d'activation de u (inactivable dans state)."""
+        for t in self._when[u]:
+            if state[t[0]] != t[1]:
+                return self._enablers.get(t, frozenset())
+        out: FrozenSet[Rule] = frozenset()
+        for alt in self._any_of[u]:
+            for t in alt:
+                if state[t[0]] != t[1]:
+                    out = out | self._enablers.get(t, frozenset())
+                    break
+        return out
+
+    def __repr__(self) -> str:
+        return f"StubbornSemantics({self.reduced} réduits, {self.full} complets)"
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from alice_bob_soup_models import CS, make_mutex
+    from bfs import bfs_interned
+    from ls2rg import LS2RG
+    from state_table import StateTable
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mutex", type=int, default=6, metavar="N")
+    args = parser.parse_args()
+    n = args.mutex
+
+    def run(reduce: bool) -> Tuple[int, bool, int, Optional[StubbornSemantics]]:
+        table = StateTable()
+        full = make_mutex(n).compile()
+        sem: Any = full
+        por = None
+        if reduce:
+            sem = por = StubbornSemantics(
+                full, visible=("p0", "p1"), discovered=table.id_of
+            )
+        rg = LS2RG(sem)
+        found = {"bad": False, "dead": 0}
+
+        def on_entry(_p: int, nid: int, o: Dict[str, Any]) -> bool:
+            c = table.state(nid)
+            if n >= 2 and c[0] == CS and c[1] == CS:
+                o["bad"] = True
+            if not full.actions(c):
+                o["dead"] += 1
+            return False
+
+        bfs_interned(rg, found, on_entry, table)
+        return len(table), found["bad"], found["dead"], por
+
+    for reduce in (False, True):
+        states, bad, dead, por = run(reduce)
+        tag = "POR " if reduce else "plein"
+        print(
+            f"mutex({n}) {tag}: {states} états, p0/p1 en CS: {bad}, "
+            f"deadlocks: {dead}" + (f", {por}" if por is not None else "")
+        )
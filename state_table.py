@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from array import array
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+NO_PARENT = -1
+
+Codec = Callable[[Any], Any]
+
+
+class StateTable:
+    """Table d'internement des états découverts.
+
+    Chaque état reçoit, à sa première découverte, un identifiant entier dense
+    (0, 1, 2, ...) dans l'ordre de découverte. Le parent BFS est conservé
+    dans un tableau d'entiers (`array`) indexé par identifiant, NO_PARENT
+    (-1) pour les racines, au lieu d'un Dict[state, state].
+
+    Sans codec, l'état lui-même sert de clé de _ids et d'entrée de _codes
+    (deux références au même objet): la table ne gagne que le dictionnaire
+    des parents, l'objet état reste entier en mémoire. Avec encode / decode,
+    seul le code compact est conservé et state(i) le redécode: c'est ce mode
+    qui réduit réellement la mémoire par état. decode(encode(s)) doit valoir
+    s. Codecs disponibles: HanoiLS.encode_state / decode_state (un entier,
+    2 bits par disque), Spec.codec() pour les soups déclaratives (utilisé
+    par check_ab_soup.explore). Les états du produit de verify_nfa_alice_bob
+    (couples système × propriété) restent sans codec: --packed y compacte
+    déjà la partie système.
+    """
+
+    def __init__(
+        self, encode: Optional[Codec] = None, decode: Optional[Codec] = None
+    ) -> None:
+        if (encode is None) != (decode is None):
+            raise ValueError("encode et decode se donnent ensemble")
+        self._encode = encode
+        self._decode = decode
+        self._ids: Dict[Any, int] = {}  # code (ou état) -> identifiant
+        self._codes: List[Any] = []
+        self._parent = array("i")
+
+    def __getstate__(self) -> Tuple[List[Any], bytes, Any, Any]:
+        # pour les checkpoints: le dictionnaire d'index est reconstruit au chargement
+        return self._codes, self._parent.tobytes(), self._encode, self._decode
+
+    def __setstate__(self, st: Tuple[List[Any], bytes, Any, Any]) -> None:
+        codes, parent, self._encode, self._decode = st
+        self._codes = codes
+        self._ids = {c: i for i, c in enumerate(codes)}
+        self._parent = array("i")
+        self._parent.frombytes(parent)
+
+    def _code(self, state: Any) -> Any:
+        return state if self._encode is None else self._encode(state)
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __contains__(self, state: Any) -> bool:
+        return self._code(state) in self._ids
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._decode is None:
+            return iter(self._codes)
+        return map(self._decode, self._codes)
+
+    def add(self, state: Any, parent: int = NO_PARENT) -> int:
+        """Interne un nouvel état et renvoie son identifiant."""
+        sid = len(self._codes)
+        code = self._code(state)
+        self._ids[code] = sid
+        self._codes.append(code)
+        self._parent.append(parent)
+        return sid
+
+    def id_of(self, state: Any) -> Optional[int]:
+        return self._ids.get(self._code(state))
+
+    def state(self, sid: int) -> Any:
+        code = self._codes[sid]
+        return code if self._decode is None else self._decode(code)
+
+    def parent(self, sid: int) -> int:
+        return self._parent[sid]
+
+    def path(self, sid: int) -> List[Any]:
+        """Chemin racine -> sid (états), reconstruit via les parents."""
+        out: List[Any] = []
+        cur = sid
+        while cur != NO_PARENT:
+            out.append(self.state(cur))
+            cur = self._parent[cur]
+        out.reverse()
+        return out
@@ -0,0 +1,231 @@
+"""Exploration symbolique (BDD) des modèles déclaratifs soup_dsl.Spec.
+
+Les configurations sont codées bit à bit comme dans packed_config.Codec: le
+champ i occupe widths[i] variables booléennes (bit de poids fort d'abord,
+champs dans l'ordre de Spec.fields). Un ensemble de configurations est un
+BDD (bdd.py) sur ces variables.
+
+Relation de transition partitionnée par règle: une règle (garde g,
+affectations champ := constante) a pour image
+    img_r(S) = (∃ bits écrits . S ∧ g) ∧ (champs écrits == constantes)
+Les effets de soup_dsl n'affectant que des constantes, l'image se calcule
+sur les seules variables courantes (pas de variables primées ni de
+renommage). Le BFS symbolique garde une couche (BDD) par niveau:
+  - atteignables = union des couches;
+  - deadlocks    = atteignables ∧ ¬(∨ gardes);
+  - mauvais états = atteignables ∧ prédicat `bad` (tests champ == valeur);
+Un contre-exemple concret est reconstruit en remontant les couches
+(pré-image par règle d'un état concret).
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from bdd import BDD, FALSE, TRUE
+from soup_dsl import Rule, Spec, Tests
+
+Config = Tuple[Any, ...]
+
+
+class SymbolicSpec:
+    """Codage d'un Spec en BDD: ensembles d'états, gardes, images."""
+
+    def __init__(self, spec: Spec, bdd: Optional[BDD] = None) -> None:
+        self.spec = spec
+        self.codec = spec.codec()
+        self.bdd = bdd if bdd is not None else BDD()
+        self.nvars = self.codec.bits
+        # variables (poids fort d'abord) de chaque champ
+        self.field_vars: List[List[int]] = []
+        v = 0
+        for w in self.codec.widths:
+            self.field_vars.append(list(range(v, v + w)))
+            v += w
+        self.guards = [self.guard(r) for r in spec.rules]
+        self.assigns = [self.tests(r.then) for r in spec.rules]
+        self.written = [
+            [x for f, _ in r.then for x in self.field_vars[spec.index(f)]]
+            for r in spec.rules
+        ]
+        # configurations dont chaque champ porte un code valide
+        self.valid = TRUE
+        for i, d in enumerate(self.codec.domains):
+            codes = self.bdd.disjunction(self._code(i, k) for k in range(len(d)))
+            self.valid = self.bdd.and_(self.valid, codes)
+
+    def _code(self, i: int, code: int) -> int:
+        vs = self.field_vars[i]
+        w = len(vs)
+        bits = {x: bool((code >> (w - 1 - j)) & 1) for j, x in enumerate(vs)}
+        return self.bdd.cube(bits)
+
+    def tests(self, tests: Tests) -> int:
+        """BDD de la conjonction des tests champ == valeur."""
+        u = TRUE
+        for f, v in tests:
+            code = self.codec.code(f, v)
+            u = self.bdd.and_(u, self._code(self.spec.index(f), code))
+        return u
+
+    def guard(self, r: Rule) -> int:
+        u = self.tests(r.when)
+        if r.any_of:
+            alts = self.bdd.disjunction(self.tests(a) for a in r.any_of)
+            u = self.bdd.and_(u, alts)
+        return u
+
+    def state(self, config: Sequence[Any]) -> int:
+        return self.tests(tuple(zip(self.spec.fields, config)))
+
+    def states(self, configs: Sequence[Sequence[Any]]) -> int:
+        return self.bdd.disjunction(self.state(c) for c in configs)
+
+    def image_rule(self, s: int, i: int) -> int:
+        b = self.bdd
+        pre = b.and_(s, self.guards[i])
+        if pre == FALSE:
+            return FALSE
+        return b.and_(b.exists(pre, self.written[i]), self.assigns[i])
+
+    def image(self, s: int) -> int:
+        rules = range(len(self.guards))
+        return self.bdd.disjunction(self.image_rule(s, i) for i in rules)
+
+    def enabled_any(self) -> int:
+        return self.bdd.disjunction(self.guards)
+
+    def count(self, s: int) -> int:
+        return self.bdd.sat_count(s, self.nvars)
+
+    def pick(self, s: int) -> Optional[Config]:
+        """Une configuration de l'ensemble s (la plus petite), ou None."""
+        a = self.bdd.pick(s)
+        if a is None:
+            return None
+        out: List[Any] = []
+        for i, vs in enumerate(self.field_vars):
+            code = 0
+            for x in vs:
+                code = (code << 1) | int(a.get(x, False))
+            out.append(self.codec.domains[i][code])
+        return tuple(out)
+
+    def predecessor(
+        self, layer: int, config: Config
+    ) -> Optional[Tuple[Rule, Config]]:
+        """(règle, prédécesseur dans layer) de config, ou None."""
+        b = self.bdd
+        target = self.state(config)
+        for i, r in enumerate(self.spec.rules):
+            if b.and_(target, self.assigns[i]) == FALSE:
+                continue  # config ne porte pas les valeurs écrites par r
+            src = b.exists(target, self.written[i])
+            pre = b.and_(b.and_(layer, self.guards[i]), src)
+            if pre != FALSE:
+                return r, self.pick(pre)  # type: ignore[return-value]
+        return None
+
+
+def symbolic_explore(
+    spec: Spec,
+    bad: Optional[Mapping[str, Any]] = None,
+    max_levels: Optional[int] = None,
+) -> Dict[str, Any]:
+    """BFS symbolique; comptes, exemples et contre-exemple vers `bad`.
+
+    Returns:
+      {"states", "levels", "deadlocks", "bad", "example_deadlock",
+       "counterexample" (None, ou (configurations, noms de règles) depuis
+       un état initial jusqu'à un état `bad` de profondeur minimale),
+       "bdd_nodes" (taille du BDD des atteignables), "time"}
+    """
+    t0 = time.perf_counter()
+    sym = SymbolicSpec(spec)
+    b = sym.bdd
+    bad_set = FALSE
+    if bad:
+        try:
+            bad_set = b.and_(sym.tests(tuple(bad.items())), sym.valid)
+        except ValueError:
+            pass  # valeur hors domaine: aucun état ne la prend
+
+    layers: List[int] = [sym.states(spec.init)]
+    reach = layers[0]
+    hit_level: Optional[int] = None
+    while True:
+        if hit_level is None and b.and_(layers[-1], bad_set) != FALSE:
+            hit_level = len(layers) - 1
+        if max_levels is not None and len(layers) > max_levels:
+            break
+        new = b.diff(sym.image(layers[-1]), reach)
+        if new == FALSE:
+            break
+        reach = b.or_(reach, new)
+        layers.append(new)
+        b.clear_caches()
+
+    dead = b.diff(reach, sym.enabled_any())
+    counterexample = None
+    if hit_level is not None:
+        cur = sym.pick(b.and_(layers[hit_level], bad_set))
+        configs: List[Config] = [cur]  # type: ignore[list-item]
+        names: List[str] = []
+        for k in range(hit_level - 1, -1, -1):
+            step = sym.predecessor(layers[k], configs[-1])
+            assert step is not None, "couche BFS sans prédécesseur"
+            r, prev = step
+            names.append(r.name)
+            configs.append(prev)
+        counterexample = (configs[::-1], names[::-1])
+
+    return {
+        "states": sym.count(reach),
+        "levels": len(layers) - 1,
+        "deadlocks": sym.count(dead),
+        "bad": sym.count(b.and_(reach, bad_set)),
+        "example_deadlock": sym.pick(dead),
+        "counterexample": counterexample,
+        "bdd_nodes": b.size(reach),
+        "time": time.perf_counter() - t0,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from alice_bob_soup_models import CS, get_spec, make_mutex
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--mutex",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Modèle mutex à N processus.",
+    )
+    args = parser.parse_args()
+
+    if args.mutex is None:
+        for m in ["AB1", "AB2", "AB3", "AB4", "AB5"]:
+            r = symbolic_explore(get_spec(m), bad={"a_loc": CS, "b_loc": CS})
+            print(
+                f"{m}: {r['states']} états atteignables, "
+                f"CS/CS: {r['bad']}, deadlocks: {r['deadlocks']}"
+            )
+            if r["counterexample"] is not None:
+                configs, names = r["counterexample"]
+                print(f"  {configs[0]}")
+                for name, c in zip(names, configs[1:]):
+                    print(f"  --{name}--> {c}")
+            if r["example_deadlock"] is not None:
+                print(f"  deadlock: {r['example_deadlock']}")
+    else:
+        n = args.mutex
+        bad = {"p0": CS, "p1": CS} if n >= 2 else None
+        r = symbolic_explore(make_mutex(n), bad=bad)
+        print(
+            f"mutex({n}): {r['states']} états, {r['levels']} niveaux, "
+            f"deadlocks: {r['deadlocks']}, p0/p1 en CS: {r['bad']}, "
+            f"{r['bdd_nodes']} nœuds BDD, {r['time']:.2f} s"
+        )
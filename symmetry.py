@@ -0,0 +1,272 @@
+"""Réduction par symétrie des soups déclaratives.
+
+Un modèle symétrique déclare un groupe de permutations de ses champs
+(Spec.symmetry): échanger Alice et Bob (a_loc <-> b_loc, flag_a <-> flag_b,
+turn: Alice <-> Bob), ou permuter les n processus de make_mutex (avec
+renommage des identifiants de processus stockés dans lock). Si le groupe
+préserve la relation de transition, deux configurations d'une même orbite
+ont des futurs symétriques: on n'explore qu'un représentant canonique par
+orbite.
+
+  - Permutation: champ i de l'image = champ source[i] de l'état, valeur
+    renommée par rename[i] (ex: Alice -> Bob);
+  - PermutationGroup(fields, générateurs): groupe engendré (énuméré), le
+    représentant est le plus petit élément de l'orbite;
+  - ProcessSymmetry(fields, blocks, ids): groupe symétrique complet sur des
+    processus interchangeables (n! éléments jamais énumérés), représentant
+    obtenu en triant les blocs de champs des processus;
+  - SymmetricSemantics(sem, group): sémantique sur les représentants;
+  - concretize(sem, group, reps, ...): trace concrète (états réels du
+    modèle) correspondant à une trace de représentants, pour les rapports.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from ordering import action_name, action_order, sorted_by, state_order
+
+Config = Tuple[Any, ...]
+
+
+class Permutation:
+    """Permutation des champs avec renommage des valeurs."""
+
+    __slots__ = ("source", "rename")
+
+    def __init__(
+        self,
+        source: Sequence[int],
+        rename: Optional[Sequence[Mapping[Any, Any]]] = None,
+    ) -> None:
+        self.source: Tuple[int, ...] = tuple(source)
+        if rename is None:
+            rename = [{} for _ in self.source]
+        # entrées identité retirées: deux permutations égales ont la même clé
+        self.rename: Tuple[Dict[Any, Any], ...] = tuple(
+            {v: w for v, w in r.items() if v != w} for r in rename
+        )
+
+    def apply(self, state: Sequence[Any]) -> Config:
+        return tuple(
+            r.get(state[j], state[j]) if r else state[j]
+            for j, r in zip(self.source, self.rename)
+        )
+
+    def then(self, other: "Permutation") -> "Permutation":
+        """other ∘ self (self d'abord)."""
+        source = []
+        rename = []
+        for i, k in enumerate(other.source):
+            first, second = self.rename[k], other.rename[i]
+            keys = set(first) | set(second)
+            source.append(self.source[k])
+            rename.append(
+                {v: second.get(first.get(v, v), first.get(v, v)) for v in keys}
+            )
+        return Permutation(source, rename)
+
+    def inverse(self) -> "Permutation":
+        n = len(self.source)
+        source = [0] * n
+        rename: List[Dict[Any, Any]] = [{} for _ in range(n)]
+        for i, j in enumerate(self.source):
+            source[j] = i
+            rename[j] = {w: v for v, w in self.rename[i].items()}
+        return Permutation(source, rename)
+
+    def key(self) -> Tuple[Any, ...]:
+        return self.source, tuple(frozenset(r.items()) for r in self.rename)
+
+    def __repr__(self) -> str:
+        return f"Permutation({self.source}, {list(self.rename)})"
+
+
+def swap(
+    fields: Sequence[str],
+    pairs: Iterable[Tuple[str, str]],
+    values: Optional[Mapping[str, Mapping[Any, Any]]] = None,
+) -> Permutation:
+    """Échange de champs deux à deux, avec renommage de valeurs par champ.
+
+    Ex: swap(FIELDS, [("a_loc", "b_loc")], {"turn": {ALICE: BOB, BOB: ALICE}})
+    """
+    source = list(range(len(fields)))
+    for a, b in pairs:
+        i, j = fields.index(a), fields.index(b)
+        source[i], source[j] = j, i
+    rename: List[Dict[Any, Any]] = [{} for _ in fields]
+    for f, m in (values or {}).items():
+        rename[fields.index(f)] = dict(m)
+    return Permutation(source, rename)
+
+
+class PermutationGroup:
+    """Groupe engendré par des permutations, énuméré une fois.
+
+    Représentant d'une orbite: son plus petit élément (ordre naturel des
+    tuples).
+    """
+
+    def __init__(
+        self, fields: Sequence[str], generators: Sequence[Permutation]
+    ) -> None:
+        self.fields = tuple(fields)
+        ident = Permutation(range(len(self.fields)))
+        elements = {ident.key(): ident}
+        todo = [ident]
+        while todo:
+            g = todo.pop()
+            for s in generators:
+                h = g.then(s)
+                k = h.key()
+                if k not in elements:
+                    elements[k] = h
+                    todo.append(h)
+        self.elements: List[Permutation] = list(elements.values())
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def canonical_with(self, state: Sequence[Any]) -> Tuple[Config, Permutation]:
+        """(représentant, g) avec g.apply(state) == représentant."""
+        return min(((g.apply(state), g) for g in self.elements), key=lambda p: p[0])
+
+    def canonical(self, state: Sequence[Any]) -> Config:
+        return min(g.apply(state) for g in self.elements)
+
+
+class ProcessSymmetry:
+    """Groupe symétrique sur n processus interchangeables.
+
+    blocks[i]: champs du processus i (même forme pour tous les processus);
+    ids: champs qui contiennent un identifiant de processus, avec la valeur
+    qui désigne chaque processus (ex: {"lock": ("0", "1", ...)}).
+    Le représentant range les processus par valeurs de bloc croissantes et
+    renomme les identifiants en conséquence. Quand deux processus ont les
+    mêmes valeurs de bloc et qu'un identifiant désigne l'un d'eux, le
+    représentant peut ne pas être unique pour l'orbite: la réduction est
+    alors partielle, jamais fausse (le représentant reste dans l'orbite).
+    """
+
+    def __init__(
+        self,
+        fields: Sequence[str],
+        blocks: Sequence[Sequence[str]],
+        ids: Optional[Mapping[str, Sequence[Any]]] = None,
+    ) -> None:
+        self.fields = tuple(fields)
+        self.blocks = [[self.fields.index(f) for f in b] for b in blocks]
+        self.ids = {self.fields.index(f): tuple(v) for f, v in (ids or {}).items()}
+
+    def __len__(self) -> int:
+        out = 1
+        for k in range(2, len(self.blocks) + 1):
+            out *= k
+        return out
+
+    def canonical_with(self, state: Sequence[Any]) -> Tuple[Config, Permutation]:
+        blocks = self.blocks
+        order = sorted(
+            range(len(blocks)), key=lambda p: tuple(state[j] for j in blocks[p])
+        )
+        source = list(range(len(self.fields)))
+        for i, p in enumerate(order):
+            for dst, src in zip(blocks[i], blocks[p]):
+                source[dst] = src
+        rename: List[Dict[Any, Any]] = [{} for _ in self.fields]
+        for f, ids in self.ids.items():
+            rename[f] = {ids[p]: ids[i] for i, p in enumerate(order)}
+        g = Permutation(source, rename)
+        return g.apply(state), g
+
+    def canonical(self, state: Sequence[Any]) -> Config:
+        return self.canonical_with(state)[0]
+
+
+class SymmetricSemantics:
+    """Sémantique quotient: états = représentants canoniques.
+
+    sem: sémantique d'un soup_dsl.Spec (tuples ou configurations
+    compactées, packed_config.py); group: PermutationGroup / ProcessSymmetry.
+    """
+
+    def __init__(self, sem: Any, group: Any) -> None:
+        self.sem = sem
+        self.group = group
+        self.sort_key = state_order(sem)
+        self.action_key = action_order(sem)
+        self.immutable = getattr(sem, "immutable", False)
+        self._codec = getattr(sem, "codec", None)
+        if getattr(sem, "successors", None) is not None:
+            self.successors = self._successors
+
+    def canonical(self, state: Any) -> Any:
+        if self._codec is None:
+            return self.group.canonical(state)
+        return self._codec.encode(self.group.canonical(tuple(state)))
+
+    def initials(self) -> List[Any]:
+        reps = dict.fromkeys(self.canonical(s) for s in self.sem.initials())
+        return sorted_by(reps, self.sort_key)
+
+    def actions(self, state: Any) -> List[Any]:
+        return self.sem.actions(state)
+
+    def execute(self, state: Any, action: Any) -> List[Any]:
+        return [self.canonical(s) for s in self.sem.execute(state, action)]
+
+    def _successors(self, state: Any) -> List[Tuple[Any, Any]]:
+        return [(a, self.canonical(s)) for a, s in self.sem.successors(state)]
+
+
+def concretize(
+    sem: Any, group: Any, reps: Sequence[Any], names: Optional[Sequence[str]] = None
+) -> Tuple[List[Any], List[str]]:
+    """Trace concrète correspondant à la trace de représentants `reps`.
+
+    sem: sémantique non réduite; names[i] (optionnel): action de la trace
+    réduite entre reps[i] et reps[i+1], "stutter" pour un bégaiement (état
+    inchangé, aucune action). Renvoie (états concrets, noms d'actions): le
+    premier état est un état initial du modèle, chaque pas est une vraie
+    transition dont le successeur a pour représentant reps[i+1].
+    """
+    canon = SymmetricSemantics(sem, group).canonical
+    cur = next(s for s in sem.initials() if canon(s) == reps[0])
+    states = [cur]
+    actions: List[str] = []
+    for i in range(len(reps) - 1):
+        if names is not None and names[i] == "stutter":
+            states.append(cur)
+            actions.append(names[i])
+            continue
+        pairs = [(a, s) for a in sem.actions(cur) for s in sem.execute(cur, a)]
+        if names is not None:
+            # même action que la trace réduite d'abord, si elle convient
+            pairs.sort(key=lambda p: action_name(p[0]) != names[i])
+        step = next(((a, s) for a, s in pairs if canon(s) == reps[i + 1]), None)
+        if step is None:
+            raise ValueError(f"le groupe ne préserve pas les transitions ({cur})")
+        actions.append(action_name(step[0]))
+        cur = step[1]
+        states.append(cur)
+    return states, actions
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from alice_bob_soup_models import make_mutex
+    from bfs import bfs_interned
+    from ls2rg import LS2RG
+    from state_table import StateTable
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mutex", type=int, default=6, metavar="N")
+    args = parser.parse_args()
+
+    spec = make_mutex(args.mutex)
+    for sem in (spec.compile(), SymmetricSemantics(spec.compile(), spec.symmetry)):
+        table = StateTable()
+        bfs_interned(LS2RG(sem), {}, lambda _p, _n, _o: False, table)
+        tag = "symétrie" if isinstance(sem, SymmetricSemantics) else "plein"
+        print(f"mutex({args.mutex}) {tag}: {len(table)} états")
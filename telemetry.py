@@ -0,0 +1,229 @@
+"""Télémétrie d'exploration: statistiques par niveau BFS, débit, mémoire.
+
+Un observateur Telemetry se passe aux moteurs d'exploration (bfs,
+bfs_interned, build_reachable_product du dossier Büchi) par le paramètre
+`observer`. Le moteur l'informe:
+  - start(expanded) / finish(discovered): début et fin de l'exploration;
+  - expand(discovered): avant chaque expansion d'un nœud (discovered =
+    nombre de nœuds déjà découverts); les niveaux BFS s'en déduisent, la
+    file étant FIFO;
+  - lap(section, transitions): le temps écoulé depuis le tour précédent est
+    attribué à `section` (neighbors, sort, dedup, ...); `transitions` compte
+    les successeurs générés.
+call(section, fn, ...) chronomètre un appel (actions / execute / successors via
+TimedSemantics, callback on_entry) et le retire du tour en cours: chaque
+instant n'est compté que dans une seule section.
+
+Chaque niveau terminé produit un enregistrement JSON (une ligne) dans
+`sink`, puis un enregistrement "summary" en fin d'exploration;
+summary_lines() donne le tableau récapitulatif affiché par les CLI.
+Mémoire: pic de RSS (resource.getrusage, None sous Windows).
+"""
+from __future__ import annotations
+
+import json
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+clock = time.perf_counter
+
+
+def peak_rss_kb() -> Optional[int]:
+    """Pic de mémoire résidente du processus (Ko), None si indisponible."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en octets sous macOS, en Ko ailleurs
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _rate(n: float, dt: float) -> float:
+    return n / dt if dt > 0 else 0.0
+
+
+class Telemetry:
+    """Observateur d'exploration (voir le docstring du module).
+
+    sink: flux texte recevant les enregistrements JSON (un par ligne),
+    None pour ne rien écrire (les enregistrements restent dans `levels` et
+    `summary`). label: identifiant du calcul, recopié dans chaque
+    enregistrement (ex: "AB3/P1/p2").
+    """
+
+    def __init__(self, sink: Optional[TextIO] = None, label: str = "") -> None:
+        self.sink = sink
+        self.label = label
+        self.times: Dict[str, float] = {}
+        self.levels: List[Dict[str, Any]] = []
+        self.summary: Dict[str, Any] = {}
+        self.transitions = 0
+        self.expanded = 0
+        self._resumed = 0
+        self._depth = -1
+        self._level_end = 0  # rang (ordre de découverte) de fin du niveau courant
+        self._level_size = 0
+        self._level_transitions = 0
+        self._level_start = 0.0
+        self._start = 0.0
+        self._mark = 0.0
+
+    # -- interface moteur --------------------------------------------------
+
+    def start(self, expanded: int = 0) -> None:
+        # expanded > 0: reprise (checkpoint), les nœuds déjà développés ne
+        # sont pas comptés; le premier "niveau" est alors la file restante
+        self.expanded = self._level_end = self._resumed = expanded
+        self._start = self._level_start = self._mark = clock()
+
+    def expand(self, discovered: int) -> None:
+        if self.expanded == self._level_end:
+            # tous les nœuds du niveau suivant sont découverts: nouveau niveau
+            if self._depth >= 0:
+                self._close_level(discovered)
+            self._depth += 1
+            self._level_size = discovered - self._level_end
+            self._level_end = discovered
+            self._level_transitions = 0
+            self._level_start = clock()
+        self.expanded += 1
+
+    def lap(self, section: str, transitions: int = 0) -> None:
+        now = clock()
+        self.times[section] = self.times.get(section, 0.0) + (now - self._mark)
+        self._mark = now
+        self.transitions += transitions
+        self._level_transitions += transitions
+
+    def call(self, section: str, fn: Callable[..., Any], *args: Any) -> Any:
+        t0 = clock()
+        out = fn(*args)
+        dt = clock() - t0
+        self.times[section] = self.times.get(section, 0.0) + dt
+        self._mark += dt
+        return out
+
+    def wrap_on_entry(self, on_entry: Callable[..., bool]) -> Callable[..., bool]:
+        def timed(parent: Any, node: Any, opaque: Any) -> bool:
+            return self.call("on_entry", on_entry, parent, node, opaque)
+
+        return timed
+
+    def finish(self, discovered: int) -> None:
+        end = clock()
+        if self._depth >= 0:
+            self._close_level(discovered)
+        elapsed = end - self._start
+        self.summary = {
+            "event": "summary",
+            "label": self.label,
+            "states": discovered,
+            "expanded": self.expanded - self._resumed,
+            "transitions": self.transitions,
+            "levels": self._depth + 1,
+            "elapsed": elapsed,
+            "states_per_sec": _rate(discovered, elapsed),
+            "transitions_per_sec": _rate(self.transitions, elapsed),
+            "branching": _rate(self.transitions, self.expanded - self._resumed),
+            "times": dict(self.times),
+            "rss_peak_kb": peak_rss_kb(),
+        }
+        self._emit(self.summary)
+
+    # -- sorties -------------------------------------------------------------
+
+    def _close_level(self, discovered: int) -> None:
+        dt = clock() - self._level_start
+        new = discovered - self._level_end
+        expanded = self.expanded - (self._level_end - self._level_size)
+        rec = {
+            "event": "level",
+            "label": self.label,
+            "depth": self._depth,
+            "frontier": self._level_size,
+            "expanded": expanded,
+            "new": new,
+            "visited": discovered,
+            "transitions": self._level_transitions,
+            "branching": _rate(self._level_transitions, expanded),
+            "elapsed": dt,
+            "states_per_sec": _rate(new, dt),
+            "transitions_per_sec": _rate(self._level_transitions, dt),
+            "rss_kb": peak_rss_kb(),
+        }
+        self.levels.append(rec)
+        self._emit(rec)
+
+    def _emit(self, rec: Dict[str, Any]) -> None:
+        if self.sink is not None:
+            self.sink.write(json.dumps(rec) + "\n")
+            self.sink.flush()
+
+    def summary_lines(self) -> List[str]:
+        """Tableau récapitulatif (niveaux, débit, répartition du temps)."""
+        s = self.summary
+        if not s:
+            return ["(pas de télémétrie)"]
+        lines = [f"Télémétrie {self.label}".rstrip()]
+        lines.append(
+            f"{'niveau':>6} {'frontière':>10} {'nouveaux':>10} "
+            f"{'transitions':>12} {'branch.':>8} {'états/s':>11}"
+        )
+        for rec in self.levels:
+            lines.append(
+                f"{rec['depth']:>6} {rec['frontier']:>10} {rec['new']:>10} "
+                f"{rec['transitions']:>12} {rec['branching']:>8.2f} "
+                f"{rec['states_per_sec']:>11.0f}"
+            )
+        lines.append(
+            f"total: {s['states']} états, {s['transitions']} transitions, "
+            f"{s['levels']} niveaux, {s['elapsed']:.3f} s "
+            f"({s['states_per_sec']:.0f} états/s, "
+            f"{s['transitions_per_sec']:.0f} transitions/s, "
+            f"branchement moyen {s['branching']:.2f})"
+        )
+        elapsed = s["elapsed"]
+        parts = [
+            f"{name} {1000 * t:.1f} ms ({100 * _rate(t, elapsed):.0f}%)"
+            for name, t in sorted(s["times"].items(), key=lambda kv: -kv[1])
+        ]
+        lines.append("temps: " + ", ".join(parts))
+        rss = s["rss_peak_kb"]
+        lines.append(
+            "pic RSS: " + ("indisponible" if rss is None else f"{rss / 1024:.1f} Mo")
+        )
+        return lines
+
+
+class TimedSemantics:
+    """Enveloppe d'une sémantique: chronomètre actions / execute / successors.
+
+    successors (appel fusionné préféré par LS2RG) n'est exposé que si la
+    sémantique enveloppée le fournit. Les autres attributs (initials,
+    sort_key, accepting, ...) sont délégués à la sémantique enveloppée.
+    """
+
+    def __init__(self, sem: Any, telemetry: Telemetry) -> None:
+        self._sem = sem
+        self._tm = telemetry
+        if getattr(sem, "successors", None) is not None:
+            self.successors = self._successors
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._sem, name)
+
+    def actions(self, *args: Any) -> List[Any]:
+        return self._tm.call("actions", lambda: list(self._sem.actions(*args)))
+
+    def execute(self, *args: Any) -> List[Any]:
+        return self._tm.call("execute", lambda: list(self._sem.execute(*args)))
+
+    def _successors(self, *args: Any) -> List[Any]:
+        return self._tm.call(
+            "successors", lambda: list(self._sem.successors(*args))
+        )
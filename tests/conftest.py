@@ -0,0 +1,5 @@
+"""Racine du dépôt sur sys.path (modules à plat), même lancé depuis tests/."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,30 @@
+"""Exploration explicite de référence pour les tests des moteurs de soups."""
+from alice_bob_soup_models import CS, get_spec, make_mutex
+
+MODELS = ["AB1", "AB2", "AB3", "AB4", "AB5"]
+MUTEX_BAD = {"a_loc": CS, "b_loc": CS}
+
+
+def explicit(spec, bad):
+    """États atteignables, deadlocks et états `bad` par DFS explicite."""
+    sem = spec.compile()
+    seen = set(sem.initials())
+    work = list(seen)
+    while work:
+        c = work.pop()
+        for a in sem.actions(c):
+            for t in sem.execute(c, a):
+                if t not in seen:
+                    seen.add(t)
+                    work.append(t)
+    idx = {f: i for i, f in enumerate(spec.fields)}
+    dead = {c for c in seen if not sem.actions(c)}
+    hits = {c for c in seen if all(c[idx[f]] == v for f, v in bad.items())}
+    return seen, dead, hits
+
+
+def cases():
+    """(nom, spec, états mauvais) pour AB1..AB5 et make_mutex(2..4)."""
+    out = [(name, get_spec(name), MUTEX_BAD) for name in MODELS]
+    out += [(f"mutex{n}", make_mutex(n), {"p0": CS, "p1": CS}) for n in (2, 3, 4)]
+    return out
@@ -0,0 +1,65 @@
+"""Tables des propriétés indexées par propositions atomiques."""
+import os
+import sys
+from dataclasses import replace
+
+import pytest
+
+from bfs import bfs
+from isoup_lang import iSoupSemantics
+from ls2rg import LS2RG
+from StepSynchronousProduct import StepSynchronousProduct
+from verify_nfa_alice_bob import build_property, build_system
+
+BUCHI = os.path.join(os.path.dirname(os.path.dirname(__file__)), "Interpretation Buchi")
+MODELS = ["AB1", "AB2", "AB3", "AB4", "AB5"]
+
+
+def system_steps(model):
+    sys_sem = build_system(model)[0]
+    _, seen = bfs(LS2RG(sys_sem), None, lambda p, n, o: False)
+    prod = StepSynchronousProduct(sys_sem, None)
+    return sys_sem, [s for lc in sorted(seen) for s in prod.steps(lc)]
+
+
+@pytest.mark.parametrize("model", MODELS)
+@pytest.mark.parametrize("prop", ["P1", "P2"])
+@pytest.mark.parametrize("pattern", [1, 2])
+def test_isoup_table_matches_guards(model, prop, pattern):
+    sys_sem, steps = system_steps(model)
+    isoup = build_property(prop, pattern, sys_sem)
+    assert isoup.ap is not None
+    tabled = iSoupSemantics(isoup)
+    direct = iSoupSemantics(replace(isoup, ap=None))
+    for step in steps:
+        for ps in ("T", "F"):
+            assert tabled.actions(step, ps) == direct.actions(step, ps)
+    assert len(tabled._table) <= 4  # (T | F) x (cond vraie | fausse)
+
+
+@pytest.fixture(scope="module")
+def ib():
+    # modules propres au Büchi; les copies partagées sont identiques à la racine
+    sys.path.append(BUCHI)
+    import isoup_buchi_alice_bob
+
+    return isoup_buchi_alice_bob
+
+
+@pytest.mark.parametrize("prop", ["P1", "P2", "P3", "P4", "P5"])
+def test_buchi_table_matches_guards_on_every_valuation(ib, prop):
+    p = ib.PROPERTIES[prop]()
+    states = set(p._transitions) | set(p.initial()) | {max(p._transitions) + 1}
+    for mask in range(1 << len(ib.AP_NAMES)):
+        step = ib.Step(src=None, action="", tgt=None, ap=mask)
+        for st in states:
+            # les aps déclarées couvrent bien tout ce que lisent les gardes
+            assert p.actions(step, st) == p._evaluate(step, st)
+
+
+def test_ap_mask(ib):
+    assert ib.ap_mask({"aCS": True, "bCS": False, "q": True}) == (
+        ib.AP_BIT["aCS"] | ib.AP_BIT["q"]
+    )
+    step = ib.Step(src=None, action="", tgt=None, ap=ib.ap_mask({"cond": True}))
+    assert ib.ap(step, "cond") and not ib.ap(step, "q")
@@ -0,0 +1,67 @@
+import itertools
+import random
+
+from bdd import BDD, FALSE, TRUE
+
+NVARS = 5
+
+
+def _random_formula(rng, depth):
+    if depth == 0 or rng.random() < 0.2:
+        return ("var", rng.randrange(NVARS))
+    op = rng.choice(["and", "or", "not"])
+    if op == "not":
+        return ("not", _random_formula(rng, depth - 1))
+    return (op, _random_formula(rng, depth - 1), _random_formula(rng, depth - 1))
+
+
+def _build(b, f):
+    if f[0] == "var":
+        return b.var(f[1])
+    if f[0] == "not":
+        return b.not_(_build(b, f[1]))
+    lhs, rhs = _build(b, f[1]), _build(b, f[2])
+    return b.and_(lhs, rhs) if f[0] == "and" else b.or_(lhs, rhs)
+
+
+def _eval(f, env):
+    if f[0] == "var":
+        return env[f[1]]
+    if f[0] == "not":
+        return not _eval(f[1], env)
+    if f[0] == "and":
+        return _eval(f[1], env) and _eval(f[2], env)
+    return _eval(f[1], env) or _eval(f[2], env)
+
+
+def test_sat_count_matches_enumeration():
+    rng = random.Random(0)
+    for _ in range(200):
+        b = BDD()
+        f = _random_formula(rng, 4)
+        u = _build(b, f)
+        expected = sum(
+            _eval(f, env) for env in itertools.product([False, True], repeat=NVARS)
+        )
+        assert b.sat_count(u, NVARS) == expected
+
+
+def test_sat_count_leaves_and_cube():
+    b = BDD()
+    assert b.sat_count(FALSE, 3) == 0
+    assert b.sat_count(TRUE, 3) == 8
+    assert b.sat_count(b.cube({0: True, 2: False}), 4) == 4
+
+
+def test_pick_satisfies():
+    rng = random.Random(1)
+    for _ in range(100):
+        b = BDD()
+        f = _random_formula(rng, 4)
+        u = _build(b, f)
+        env = b.pick(u)
+        if u == FALSE:
+            assert env is None
+            continue
+        full = [env.get(v, False) for v in range(NVARS)]
+        assert _eval(f, full)
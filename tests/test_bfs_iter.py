@@ -0,0 +1,48 @@
+from itertools import islice
+
+import pytest
+
+from alice_bob_soup_models import get_spec
+from bfs import bfs, bfs_iter
+from hanoi_ls import HanoiLS
+from ls2rg import LS2RG
+
+GRAPHS = [LS2RG(HanoiLS(4)), LS2RG(get_spec("AB5").compile())]
+
+
+def events(graph):
+    def on_entry(parent, node, o):
+        o.append((parent, node))
+        return False
+
+    out, _ = bfs(graph, [], on_entry)
+    return out
+
+
+@pytest.mark.parametrize("graph", GRAPHS, ids=["hanoi4", "AB5"])
+def test_same_order_and_parents_as_bfs(graph):
+    got = list(bfs_iter(graph))
+    assert [(p, n) for p, n, _ in got] == events(graph)
+    depth = {}
+    for p, n, d in got:
+        assert d == (0 if p is None else depth[p] + 1)
+        depth[n] = d
+    assert [d for _, _, d in got] == sorted(d for _, _, d in got)
+
+
+def test_lazy_expansion():
+    calls = []
+
+    class Counting:
+        def roots(self):
+            return [0]
+
+        def neighbors(self, n):
+            calls.append(n)
+            return [n + 1, n + 2]
+
+    it = bfs_iter(Counting())
+    assert list(islice(it, 3)) == [(None, 0, 0), (0, 1, 1), (0, 2, 1)]
+    assert calls == [0]  # 1 et 2 pas encore développés
+    next(it)
+    assert calls == [0, 1]
@@ -0,0 +1,55 @@
+import pytest
+
+from bfs import bfs
+from bitstate import MB, BitStateSet, replay_levels
+from hanoi_ls import HanoiLS
+from ls2rg import LS2RG
+from verify_nfa_alice_bob import verify_one
+
+SCENARIOS = [
+    (m, p, k)
+    for m in ["AB1", "AB2", "AB3", "AB4", "AB5"]
+    for p in ["P1", "P2"]
+    for k in (1, 2)
+]
+
+
+def test_no_false_negative():
+    store = BitStateSet(1 << 16)
+    states = [(i, str(i)) for i in range(2000)]
+    for s in states:
+        store.add(s)
+    assert all(s in store for s in states)
+    assert len(store) <= len(states)
+    assert 0.0 <= store.omission_probability() < 1.0
+
+
+@pytest.mark.parametrize("model,prop,pattern", SCENARIOS)
+def test_bitstate_same_verdict_as_exact(model, prop, pattern):
+    exact = verify_one(model, prop, pattern)
+    approx = verify_one(model, prop, pattern, bitstate_mb=1)
+    assert approx["sat"] == exact["sat"]
+    assert approx["visited"] == exact["visited"]  # aucune omission à 1 Mo
+    assert approx["counterexample"] == exact["counterexample"]
+    assert approx["bitstate"]["states"] == exact["visited"]
+
+
+def test_replay_levels_rebuilds_shortest_path():
+    rg = LS2RG(HanoiLS(4))
+    goal = ((), (), (4, 3, 2, 1))
+    path = replay_levels(rg, goal, lambda: BitStateSet(MB))
+    assert path[0] == HanoiLS(4).initials()[0] and path[-1] == goal
+    assert all(b in rg.neighbors(a) for a, b in zip(path, path[1:]))
+    assert len(path) == 2**4  # solution minimale: 15 coups
+
+    def depth(parent, node, o):
+        o[node] = 0 if parent is None else o[parent] + 1
+        return False
+
+    ref, _ = bfs(rg, {}, depth)
+    assert [ref[s] for s in path] == list(range(len(path)))
+
+
+def test_replay_levels_unknown_goal():
+    with pytest.raises(RuntimeError):
+        replay_levels(LS2RG(HanoiLS(2)), "absent", lambda: BitStateSet(MB))
@@ -0,0 +1,75 @@
+import pytest
+
+from bfs import bfs_interned
+from checkpoint import Checkpointer, load_checkpoint, save_checkpoint
+from hanoi_ls import HanoiLS
+from ls2rg import LS2RG
+from state_table import StateTable
+
+
+def explore(table, ls, stop_after=None, checkpointer=None, head=0, opaque=None):
+    def on_entry(_parent, node, o):
+        o["order"].append(node)
+        return stop_after is not None and len(o["order"]) >= stop_after
+
+    opaque = {"order": []} if opaque is None else opaque
+    return bfs_interned(LS2RG(ls), opaque, on_entry, table, head, checkpointer)
+
+
+def test_checkpoint_file_round_trip(tmp_path):
+    ls = HanoiLS(3)
+    _, table = explore(StateTable(ls.encode_state, ls.decode_state), ls)
+    path = str(tmp_path / "t.ckpt")
+    save_checkpoint(path, {"table": table, "head": 7, "opaque": {"k": [1]}})
+    back = load_checkpoint(path)
+    assert back["head"] == 7 and back["opaque"] == {"k": [1]}
+    assert list(back["table"]) == list(table)
+
+
+def test_not_a_checkpoint(tmp_path):
+    path = tmp_path / "x.ckpt"
+    path.write_bytes(b"garbage")
+    with pytest.raises(ValueError):
+        load_checkpoint(str(path))
+
+
+def test_checkpoint_meta_mismatch(tmp_path):
+    path = str(tmp_path / "m.ckpt")
+    Checkpointer(path, meta={"model": "AB1"}).save({"head": 0})
+    assert Checkpointer(path, meta={"model": "AB1"}).load()["head"] == 0
+    with pytest.raises(ValueError):
+        Checkpointer(path, meta={"model": "AB2"}).load()
+
+
+@pytest.mark.parametrize("codec", [False, True])
+def test_resume_gives_same_exploration(tmp_path, codec):
+    ls = HanoiLS(4)
+
+    def new_table():
+        return StateTable(ls.encode_state, ls.decode_state) if codec else StateTable()
+
+    ref_opaque, ref = explore(new_table(), ls)
+
+    # exploration interrompue après 30 états, sauvegardée à chaque expansion
+    ckpt = Checkpointer(str(tmp_path / "r.ckpt"), every=0.0, meta={"n": 4})
+    explore(new_table(), ls, stop_after=30, checkpointer=ckpt)
+    saved = ckpt.load()
+    assert saved is not None and ckpt.saves > 0
+
+    opaque, table = explore(
+        saved["table"], ls, head=saved["head"], opaque=saved["opaque"]
+    )
+    assert list(table) == list(ref)
+    assert [table.parent(i) for i in range(len(table))] == [
+        ref.parent(i) for i in range(len(ref))
+    ]
+    assert opaque["order"] == ref_opaque["order"]
+
+
+def test_nfa_rejects_checkpoint_with_approximate_visited(tmp_path):
+    from verify_nfa_alice_bob import verify_one
+
+    with pytest.raises(ValueError):
+        verify_one(
+            "AB1", "P1", 1, bitstate_mb=1, checkpoint_path=str(tmp_path / "c")
+        )
@@ -0,0 +1,53 @@
+from collections import Counter
+
+import pytest
+
+from alice_bob_soup_models import get_spec
+from bfs import bfs
+from external_bfs import external_bfs
+from hanoi_ls import HanoiLS
+from ls2rg import LS2RG
+
+
+def levels(graph, run):
+    """États atteints et nombre d'états par niveau (profondeur via le parent)."""
+
+    def on_entry(parent, node, o):
+        o[node] = 0 if parent is None else o[parent] + 1
+        return False
+
+    depth, count = run(graph, {}, on_entry)
+    return depth, count
+
+
+@pytest.mark.parametrize("buffer_size", [3, 100_000])
+@pytest.mark.parametrize(
+    "graph",
+    [LS2RG(HanoiLS(4)), LS2RG(get_spec("AB4").compile())],
+    ids=["hanoi4", "AB4"],
+)
+def test_same_states_and_levels_as_bfs(graph, buffer_size, tmp_path):
+    ref, visited = levels(graph, bfs)
+    got, count = levels(
+        graph,
+        lambda g, o, f: external_bfs(
+            g, o, f, workdir=str(tmp_path), buffer_size=buffer_size
+        ),
+    )
+    assert count == len(visited) == len(ref)
+    assert set(got) == set(ref)
+    assert Counter(got.values()) == Counter(ref.values())
+    assert got == ref  # même profondeur pour chaque état
+    assert list(tmp_path.iterdir()) == []  # fichiers temporaires supprimés
+
+
+def test_early_stop(tmp_path):
+    goal = ((), (), (3, 2, 1))
+
+    def stop(_parent, node, o):
+        o["seen"].append(node)
+        return node == goal
+
+    o, _ = external_bfs(LS2RG(HanoiLS(3)), {"seen": []}, stop, workdir=str(tmp_path))
+    assert o["seen"][-1] == goal
+    assert len(o["seen"]) == len(set(o["seen"])) <= 27
@@ -0,0 +1,60 @@
+import os
+import sys
+
+import pytest
+
+from hash_compact import HashCompactSet
+from verify_nfa_alice_bob import verify_one
+
+BUCHI = os.path.join(os.path.dirname(os.path.dirname(__file__)), "Interpretation Buchi")
+MODELS = ["AB1", "AB2", "AB3", "AB4", "AB5"]
+
+
+@pytest.mark.parametrize("bits", [8, 32, 64])
+def test_store_contains_added(bits):
+    store = HashCompactSet(bits)
+    states = [("s", i) for i in range(3000)]
+    for s in states:
+        if s not in store:
+            store.add(s)
+    assert all(s in store for s in states)
+    assert len(store) <= len(states)
+    if bits == 64:
+        assert len(store) == len(states)
+    assert 0.0 <= store.collision_probability() <= 1.0
+
+
+@pytest.mark.parametrize("model", MODELS)
+@pytest.mark.parametrize("prop", ["P1", "P2"])
+def test_nfa_same_verdict_as_exact(model, prop):
+    for pattern in (1, 2):
+        exact = verify_one(model, prop, pattern)
+        approx = verify_one(model, prop, pattern, compact_bits=32)
+        assert approx["sat"] == exact["sat"]
+        assert approx["visited"] == exact["visited"]
+        assert approx["counterexample"] == exact["counterexample"]
+
+
+@pytest.fixture(scope="module")
+def vb():
+    # modules propres au Büchi; les copies partagées sont identiques à la racine
+    sys.path.append(BUCHI)
+    import verify_buchi_alice_bob
+
+    return verify_buchi_alice_bob
+
+
+@pytest.mark.parametrize("model", MODELS)
+@pytest.mark.parametrize("prop", ["P1", "P2", "P3", "P4", "P5"])
+def test_nested_dfs_same_verdict_as_buchi_bfs(vb, model, prop):
+    sys_sem = vb.load_system(model)
+    ok, _, _ = vb.verify_buchi(sys_sem, vb.PROPERTIES[prop]())
+    nok, store, cex = vb.nested_dfs(
+        sys_sem, vb.PROPERTIES[prop](), lambda: HashCompactSet(64)
+    )
+    assert nok == ok and len(store) > 0
+    if not ok:
+        prefix, prefix_edges, cycle, cycle_edges = cex
+        assert len(prefix) == len(prefix_edges) + 1
+        assert len(cycle) == len(cycle_edges) + 1
+        assert prefix[-1] == cycle[0] == cycle[-1]
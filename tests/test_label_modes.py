@@ -0,0 +1,44 @@
+import pytest
+
+from alice_bob_soup_models import get_spec
+from bfs import bfs
+from hanoi_ls import HanoiLS
+from ls2rg import LABELS_EDGES, LABELS_LAZY, LABELS_TREE, LS2RG
+
+SEMANTICS = [HanoiLS(3), get_spec("AB5").compile()]
+
+
+def tree_labels(ls, mode):
+    rg = LS2RG(ls, keep_labels=True, label_mode=mode)
+
+    def on_entry(parent, node, o):
+        if parent is not None:
+            o.append((parent, node))
+        return False
+
+    edges, _ = bfs(rg, [], on_entry)
+    return [(src, dst, rg.label(src, dst)) for src, dst in edges]
+
+
+@pytest.mark.parametrize("ls", SEMANTICS, ids=["hanoi3", "AB5"])
+def test_modes_give_same_tree_labels(ls):
+    ref = tree_labels(ls, LABELS_EDGES)
+    assert ref and all(lab != "?" for _, _, lab in ref)
+    assert tree_labels(ls, LABELS_TREE) == ref
+    assert tree_labels(ls, LABELS_LAZY) == ref
+
+
+def test_tree_mode_stores_one_label_per_state():
+    ls = HanoiLS(3)
+    rg = LS2RG(ls, keep_labels=True, label_mode=LABELS_TREE)
+    _, seen = bfs(rg, None, lambda p, n, o: False)
+    # O(états) et non O(arêtes): au plus une entrée par état atteint
+    assert len(rg.export_labels()) <= len(seen)
+    edges = LS2RG(ls, keep_labels=True)
+    bfs(edges, None, lambda p, n, o: False)
+    assert len(edges.export_labels()) > len(seen)
+
+
+def test_unknown_mode_rejected():
+    with pytest.raises(ValueError):
+        LS2RG(HanoiLS(3), label_mode="all")
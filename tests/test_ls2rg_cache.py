@@ -0,0 +1,56 @@
+import check_ab_soup
+from hanoi_ls import HanoiLS
+from ls2rg import LS2RG
+
+
+def test_cache_hits_and_same_successors():
+    ls = HanoiLS(3)
+    plain, cached = LS2RG(ls), LS2RG(ls, cache_size=4)
+    s = ls.initials()[0]
+    first = list(cached.neighbors(s))
+    assert list(cached.neighbors(s)) == first == list(plain.neighbors(s))
+    info = cached.cache_info()
+    assert info["hits"] == 1 and info["size"] == 1 and info["maxsize"] == 4
+
+
+def test_lru_eviction():
+    ls = HanoiLS(3)
+    rg = LS2RG(ls, cache_size=2)
+    a = ls.initials()[0]
+    b, c = list(rg.neighbors(a))[:2]
+    rg.neighbors(b)
+    rg.neighbors(a)  # a redevient le plus récent
+    rg.neighbors(c)  # évince b
+    hits = rg.cache_info()["hits"]
+    rg.neighbors(a)
+    assert rg.cache_info()["hits"] == hits + 1
+    rg.neighbors(b)
+    assert rg.cache_info()["hits"] == hits + 1
+    assert rg.cache_info()["size"] == 2
+
+
+def test_no_cache_by_default():
+    ls = HanoiLS(3)
+    rg = LS2RG(ls)
+    s = ls.initials()[0]
+    rg.neighbors(s)
+    rg.neighbors(s)
+    assert rg.cache_info()["hits"] == 0 and rg.cache_info()["size"] == 0
+
+
+def test_check_ab_soup_bitstate_has_no_cache(monkeypatch, capsys):
+    made = []
+
+    class Recording(LS2RG):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            made.append(self)
+
+    monkeypatch.setattr(check_ab_soup, "LS2RG", Recording)
+    check_ab_soup.explore("AB4")
+    check_ab_soup.explore("AB4", bitstate_mb=1)
+    exact, approx = made
+    assert exact.cache_size > 0 and exact.cache_info()["hits"] > 0
+    assert approx.cache_size == 0 and approx.cache_info()["size"] == 0
+    out = capsys.readouterr().out.split("AB4:")
+    assert out[1].splitlines()[0] == out[2].splitlines()[0]  # même nombre d'états
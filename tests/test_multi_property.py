@@ -0,0 +1,75 @@
+"""Produit multiple (verify_many) contre une exploration par propriété."""
+import pytest
+
+from alice_bob_soup_models import get_semantics
+from isoup_lang import iSoupSemantics
+from multi_property_product import MultiPropertyProduct
+from verify_nfa_alice_bob import build_property, build_system, verify_many, verify_one
+
+MODELS = ["AB1", "AB2", "AB3", "AB4", "AB5"]
+SCENARIOS = [(p, pat) for p in ("P1", "P2") for pat in (1, 2)]
+OPTIONS = [{}, {"packed": True}, {"por": True}, {"symmetry": True}]
+
+
+def check_trace(model, cex):
+    # chaque pas de la trace est une transition du modèle (ou un bégaiement)
+    sem = get_semantics(model)
+    states = [tuple(s) for s in cex["sys_states"]]  # configurations compactées
+    actions = cex["sys_actions"]
+    assert len(states) == len(actions) + 1
+    assert states[0] in sem.initials()
+    for s, t, a in zip(states, states[1:], actions):
+        if a == "stutter":
+            assert s == t and not sem.actions(s)
+        else:
+            assert any(
+                t in sem.execute(s, r) for r in sem.actions(s) if r.name == a
+            )
+
+
+@pytest.mark.parametrize("model", MODELS)
+@pytest.mark.parametrize("opts", OPTIONS, ids=["plain", "packed", "por", "symmetry"])
+def test_same_verdicts_as_verify_one(model, opts):
+    many = verify_many(model, SCENARIOS, **opts)
+    assert len({r["visited"] for r in many}) == 1
+    for (prop, pattern), res in zip(SCENARIOS, many):
+        one = verify_one(model, prop, pattern, **opts)
+        assert res["sat"] == one["sat"]
+        if not one["sat"]:
+            # même longueur (BFS), l'ordre de départage peut différer
+            got, ref = res["counterexample"], one["counterexample"]
+            assert len(got["sys_actions"]) == len(ref["sys_actions"])
+            check_trace(model, got)
+
+
+def test_accepted_does_not_depend_on_exploration():
+    sys_sem = build_system("AB2")[0]
+    props = [iSoupSemantics(build_property(p, pat, sys_sem)) for p, pat in SCENARIOS]
+    multi = MultiPropertyProduct(sys_sem, props)
+    c = multi.initials()[0]
+    before = multi.accepted(c)
+    seen = [c]
+    for c2 in seen:
+        for a in multi.actions(c2):
+            for t in multi.execute(c2, a):
+                if t not in seen:
+                    seen.append(t)
+    # les états déjà rencontrés gardent leur sens après l'exploration
+    assert multi.accepted(seen[0]) == before
+    assert multi.initials() == [seen[0]]
+    hits = [c for c in seen if multi.accepted(c)]
+    assert hits
+    for c in hits:  # ACCEPTED est absorbant
+        for a in multi.actions(c):
+            for t in multi.execute(c, a):
+                assert set(multi.accepted(c)) <= set(multi.accepted(t))
+
+
+def test_system_steps_rejects_foreign_path():
+    sys_sem = build_system("AB1")[0]
+    multi = MultiPropertyProduct(
+        sys_sem, [iSoupSemantics(build_property("P1", 1, sys_sem))]
+    )
+    c = multi.initials()[0]
+    with pytest.raises(ValueError):
+        multi.system_steps([c, c], ["a_inconnue"])
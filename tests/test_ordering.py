@@ -0,0 +1,55 @@
+"""Ordres de frontière (ordering.py): NATURAL ne doit pas changer le parcours."""
+import pytest
+
+from bfs import bfs
+from hanoi_ls import HanoiLS
+from ls2rg import LS2RG
+from ordering import NATURAL, REPR, UNORDERED, sort_in_place, sorted_by
+from soup_reference import MODELS, explicit
+from alice_bob_soup_models import get_spec
+
+
+@pytest.mark.parametrize("name", MODELS)
+def test_natural_agrees_with_repr_on_ab_states(name):
+    spec = get_spec(name)
+    assert spec.sort_key is NATURAL
+    seen, _, _ = explicit(spec, {})
+    # même ordre total sur tous les états: même ordre entre frères
+    assert sorted_by(seen, NATURAL) == sorted_by(seen, REPR)
+
+
+def test_hanoi_keeps_repr():
+    assert HanoiLS.sort_key is REPR
+    # l'ordre des entiers n'est pas celui des repr
+    pegs = [((10,), (), ()), ((9,), (), ()), ((3,), (), ()), ((3, 2), (), ())]
+    assert sorted_by(pegs, NATURAL) != sorted_by(pegs, REPR)
+
+
+def test_unordered_keeps_generation_order():
+    xs = [3, 1, 2]
+    sort_in_place(xs, UNORDERED)
+    assert xs == [3, 1, 2]
+
+
+def test_hanoi_traversal_unchanged_by_ordering_protocol():
+    ls = HanoiLS(3)
+
+    def on_entry(parent, node, o):
+        o.append(node)
+        return False
+
+    got, _ = bfs(LS2RG(ls), [], on_entry)
+    # référence: BFS triant explicitement par repr
+    ref, seen, level = [], set(ls.initials()), sorted(ls.initials(), key=repr)
+    ref.extend(level)
+    while level:
+        nxt = []
+        for s in level:
+            succ = [t for a in ls.actions(s) for t in ls.execute(s, a)]
+            for t in sorted(succ, key=repr):
+                if t not in seen:
+                    seen.add(t)
+                    nxt.append(t)
+        ref.extend(nxt)
+        level = nxt
+    assert got == ref
@@ -0,0 +1,61 @@
+"""Codec de packed_config: aller-retour, lisibilité et ordre des entiers."""
+import pickle
+
+import pytest
+
+from packed_config import Codec
+from soup_reference import cases, explicit
+
+CASES = cases()
+IDS = [name for name, _, _ in CASES]
+
+
+@pytest.mark.parametrize("name, spec, bad", CASES, ids=IDS)
+def test_round_trip_and_tuple_view(name, spec, bad):
+    codec = spec.codec()
+    seen, _, _ = explicit(spec, bad)
+    for c in seen:
+        p = codec.encode(c)
+        assert codec.decode(p) == c
+        assert tuple(p) == c and len(p) == len(c)
+        assert [p[i] for i in range(len(c))] == list(c) and p[1:] == c[1:]
+        assert repr(p) == repr(c)
+        q = pickle.loads(pickle.dumps(p))
+        assert q == p and repr(q) == repr(c)
+    assert len({codec.encode(c) for c in seen}) == len(seen)
+
+
+@pytest.mark.parametrize("name, spec, bad", CASES, ids=IDS)
+def test_int_order_is_tuple_order(name, spec, bad):
+    codec = spec.codec()
+    seen, _, _ = explicit(spec, bad)
+    by_tuple = sorted(seen)
+    by_int = [codec.decode(p) for p in sorted(int(codec.encode(c)) for c in seen)]
+    assert by_int == by_tuple
+
+
+@pytest.mark.parametrize("name, spec, bad", CASES, ids=IDS)
+def test_packed_semantics_same_successors(name, spec, bad):
+    plain, packed = spec.compile(), spec.compile(packed=True)
+    codec = packed.codec
+    seen, _, _ = explicit(spec, bad)
+    for c in seen:
+        p = codec.encode(c)
+        assert [a.name for a in packed.actions(p)] == [
+            a.name for a in plain.actions(c)
+        ]
+        got = [tuple(t) for a in packed.actions(p) for t in packed.execute(p, a)]
+        assert got == [t for a in plain.actions(c) for t in plain.execute(c, a)]
+
+
+def test_widths_and_errors():
+    codec = Codec(("a", "b", "c"), [[2, 0, 1], ["x"], [True, False]])
+    assert codec.widths == [2, 0, 1] and codec.bits == 3
+    assert codec.domains[0] == (0, 1, 2)
+    assert codec.decode(codec.encode((1, "x", True))) == (1, "x", True)
+    with pytest.raises(ValueError):
+        codec.encode((3, "x", True))
+    with pytest.raises(ValueError):
+        codec.encode((1, "x"))
+    with pytest.raises(ValueError):
+        Codec(("a",), [])
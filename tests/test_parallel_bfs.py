@@ -0,0 +1,53 @@
+import pytest
+
+import parallel_bfs
+from bfs import bfs
+from hanoi_ls import HanoiLS
+from ls2rg import LS2RG
+
+
+def record(parent, node, o):
+    o[node] = parent
+    return False
+
+
+@pytest.mark.parametrize("min_parallel", [4, 10**9])
+def test_same_parents_as_bfs(min_parallel):
+    rg = LS2RG(HanoiLS(4))
+    ref, visited = bfs(rg, {}, record)
+    got, pvisited = parallel_bfs.parallel_bfs(
+        rg, {}, record, workers=2, chunksize=4, min_parallel=min_parallel
+    )
+    assert pvisited == visited
+    assert list(got.items()) == list(ref.items())
+
+
+def test_early_stop():
+    goal = ((), (), (3, 2, 1))
+
+    def stop(parent, node, o):
+        o[node] = parent
+        return node == goal
+
+    got, _ = parallel_bfs.parallel_bfs(
+        LS2RG(HanoiLS(3)), {}, stop, workers=2, chunksize=2, min_parallel=2
+    )
+    assert goal in got
+
+
+def _no_pool(*_a, **_k):
+    raise AssertionError("pool créé inutilement")
+
+
+def test_small_levels_create_no_pool(monkeypatch):
+    monkeypatch.setattr(parallel_bfs, "ProcessPoolExecutor", _no_pool)
+    parallel_bfs.parallel_bfs(LS2RG(HanoiLS(3)), {}, record, min_parallel=10**9)
+
+
+def test_without_fork_stays_sequential(monkeypatch):
+    monkeypatch.setattr(parallel_bfs, "_mp_context", lambda: None)
+    monkeypatch.setattr(parallel_bfs, "ProcessPoolExecutor", _no_pool)
+    rg = LS2RG(HanoiLS(4))
+    ref, _ = bfs(rg, {}, record)
+    got, _ = parallel_bfs.parallel_bfs(rg, {}, record, min_parallel=1)
+    assert list(got.items()) == list(ref.items())
@@ -0,0 +1,110 @@
+import pytest
+
+from bfs import bfs
+from partitioned_bfs import blank_opaque, merge_opaque, partitioned_bfs
+
+
+class Ring:
+    """Graphe déterministe de 1000 nœuds (tous atteignables depuis 0)."""
+
+    def roots(self):
+        return [0]
+
+    def neighbors(self, n):
+        return [(n * 3 + 1) % 1000, (n * 7 + 2) % 1000]
+
+
+def record(_parent, node, o):
+    o["count"] += 1
+    o["nodes"].append(node)
+    o["seen"].add(node)
+    o["depth"][node] = True
+    if node == 999:
+        o["found"] = True
+    return False
+
+
+def test_blank_opaque_shape():
+    o = {"l": [1], "s": {2}, "d": {3: 4}, "b": True, "i": 7, "n": None, "t": "x"}
+    assert blank_opaque(o) == {
+        "l": [],
+        "s": set(),
+        "d": {},
+        "b": False,
+        "i": 0,
+        "n": None,
+        "t": "x",
+    }
+
+
+def test_merge_opaque_kinds():
+    dst = {"l": [1], "s": {1}, "d": {1: 1}, "b": False, "i": 2, "n": None}
+    merge_opaque(dst, {"l": [2], "s": {2}, "d": {2: 2}, "b": True, "i": 3, "n": 5})
+    merge_opaque(dst, {"l": [], "s": set(), "d": {}, "b": False, "i": 0, "n": None})
+    assert dst == {
+        "l": [1, 2],
+        "s": {1, 2},
+        "d": {1: 1, 2: 2},
+        "b": True,
+        "i": 5,
+        "n": 5,
+    }
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_partitioned_matches_bfs(workers):
+    def fresh():
+        return {"count": 0, "nodes": [], "seen": set(), "depth": {}, "found": False}
+
+    ref, visited = bfs(Ring(), fresh(), record)
+    init = fresh()
+    init["count"] = 5
+    init["nodes"] = ["x"]
+    out, total = partitioned_bfs(Ring(), init, record, workers=workers)
+    assert total == len(visited)
+    # l'état initial est gardé une seule fois, les contributions ajoutées
+    assert out["count"] == 5 + ref["count"]
+    assert out["nodes"][0] == "x"
+    assert sorted(out["nodes"][1:]) == sorted(ref["nodes"])
+    assert out["seen"] == ref["seen"]
+    assert out["depth"] == ref["depth"]
+    assert out["found"] is True
+
+
+def test_partitioned_unset_key_takes_first_value():
+    def first(_parent, node, o):
+        if o["first"] is None:
+            o["first"] = 1000 + node  # un entier par processus, pas une somme
+        return False
+
+    out, _ = partitioned_bfs(Ring(), {"first": None}, first, workers=3)
+    assert 1000 <= out["first"] < 2000
+
+
+def test_partitioned_worker_error():
+    def boom(_parent, node, _o):
+        if node == 500:
+            raise ValueError("boom")
+        return False
+
+    with pytest.raises(RuntimeError, match="ValueError: boom"):
+        partitioned_bfs(Ring(), {}, boom, workers=3)
+
+
+def test_partitioned_early_stop():
+    def stop(_parent, node, o):
+        if node == 500:
+            o["goal"] = node
+            return True
+        return False
+
+    out, _ = partitioned_bfs(Ring(), {"goal": None}, stop, workers=3)
+    assert out["goal"] == 500
+
+
+def test_partitioned_owner_error_does_not_hang():
+    def bad_owner(_state):
+        raise KeyError("owner")
+
+    with pytest.raises(KeyError):
+        partitioned_bfs(Ring(), {}, lambda *_: False, workers=2, owner=bad_owner)
@@ -0,0 +1,51 @@
+"""Réduction d'ordre partiel (por.py)."""
+import pytest
+
+from alice_bob_soup_models import CS, get_spec, make_mutex
+from bfs import bfs_interned
+from ls2rg import LS2RG
+from por import StubbornSemantics
+from soup_reference import MODELS, explicit
+from state_table import StateTable
+
+CASES = [(name, get_spec(name), ("a_loc", "b_loc")) for name in MODELS] + [
+    (f"mutex{n}", make_mutex(n), ("p0", "p1")) for n in (2, 3, 4)
+]
+IDS = [c[0] for c in CASES]
+
+
+def reduced(spec, visible):
+    table = StateTable()
+    discovered = table.id_of if visible else None
+    sem = StubbornSemantics(spec.compile(), visible=visible, discovered=discovered)
+    bfs_interned(LS2RG(sem), {}, lambda _p, _n, _o: False, table)
+    return table
+
+
+@pytest.mark.parametrize("name,spec,visible", CASES, ids=IDS)
+def test_por_preserves_deadlocks(name, spec, visible):
+    full = spec.compile()
+    seen, dead, _ = explicit(spec, {})
+    # deadlocks seuls: pas de champ visible, pas de proviso
+    states = set(reduced(spec, ()))
+    assert states <= seen
+    assert {c for c in states if not full.actions(c)} == dead
+
+
+@pytest.mark.parametrize("name,spec,visible", CASES, ids=IDS)
+def test_por_preserves_mutex_verdict(name, spec, visible):
+    idx = [spec.fields.index(f) for f in visible]
+    seen, _, _ = explicit(spec, {})
+    table = reduced(spec, visible)
+
+    def bad(states):
+        return any(all(c[i] == CS for i in idx) for c in states)
+
+    assert len(table) <= len(seen)
+    assert bad(table) == bad(seen)
+
+
+def test_por_reduces_mutex():
+    spec = make_mutex(4)
+    seen, _, _ = explicit(spec, {})
+    assert len(reduced(spec, ("p0", "p1"))) < len(seen)
@@ -0,0 +1,63 @@
+"""Ordre des actions du produit synchrone (ordre des composantes)."""
+from alice_bob_soup_models import make_mutex
+from bfs import bfs
+from ls2rg import LS2RG
+from ordering import action_name
+from StepSynchronousProduct import StepSynchronousProduct
+
+
+class Check:
+    name = "check"
+
+
+class Skip:
+    name = "skip"
+
+
+class Watch:
+    """Propriété à un état, deux actions par pas système (ordre par nom)."""
+
+    acts = [Skip(), Check()]
+
+    def initials(self):
+        return [0]
+
+    def actions(self, step, rc):
+        return list(self.acts)  # triées par le produit
+
+    def execute(self, action, step, rc):
+        return [rc]
+
+
+def product(n=11):
+    return StepSynchronousProduct(make_mutex(n).compile(), Watch())
+
+
+def test_actions_follow_component_orders():
+    prod = product()
+    c = prod.initials()[0]
+    acts = prod.actions(c)
+    by_components = sorted(
+        acts, key=lambda a: (action_name(a.step[1]), action_name(a.rhs_action))
+    )
+    assert acts == by_components
+    names = [a.name for a in acts]
+    assert names[:4] == ["t0||check", "t0||skip", "t1||check", "t1||skip"]
+    assert names.index("t1||check") < names.index("t10||check")
+    # le tri des noms "la||ra" comme chaînes placerait t10 avant t1
+    assert sorted(names) != names
+
+
+def test_bfs_order_is_deterministic():
+    def run():
+        rg = LS2RG(product(), keep_labels=True)
+
+        def on_entry(parent, node, o):
+            if parent is not None:
+                o.append(rg.label(parent, node))
+            return len(o) >= 200
+
+        return bfs(rg, [], on_entry)[0]
+
+    first = run()
+    assert len(first) == 200 and run() == first
@@ -0,0 +1,32 @@
+"""Sémantique compilée (soup_dsl) contre check_ab_soup et l'interprète."""
+import re
+
+import pytest
+
+import check_ab_soup
+from alice_bob_soup_models import get_spec
+from soup_dsl import Spec, rule
+from soup_reference import MODELS, MUTEX_BAD, explicit
+
+
+@pytest.mark.parametrize("name", MODELS)
+def test_explicit_matches_check_ab_soup(name, capsys):
+    check_ab_soup.explore(name)
+    out = capsys.readouterr().out
+    states = int(re.search(r"(\d+) états atteignables", out).group(1))
+    seen, dead, hits = explicit(get_spec(name), MUTEX_BAD)
+    assert states == len(seen)
+    assert ("Deadlocks: OUI" in out) == bool(dead)
+    assert ("Exclusion mutuelle: VIOLEE" in out) == bool(hits)
+
+
+@pytest.mark.parametrize("packed", [False, True])
+def test_empty_any_of_alternative_is_true(packed):
+    spec = Spec(
+        ("x", "y"),
+        [rule("t", when={"x": 0}, any_of=[{}, {"y": 5}], then={"x": 1})],
+        init=[(0, 0)],
+    )
+    sem = spec.compile(packed=packed)
+    c = sem.initials()[0]
+    assert [a.name for a in sem.actions(c)] == ["t"]
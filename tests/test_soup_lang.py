@@ -0,0 +1,86 @@
+import pytest
+
+from alice_bob_soup_models import get_model
+from bfs import bfs
+from ls2rg import LS2RG
+from soup_lang import Piece, Soup, SoupSemantics, is_immutable
+
+
+def bump(state):
+    return (state[0] + 1, state[1])
+
+
+def bump_in_place(state):
+    state[0] += 1
+    return state
+
+
+def successors(sem, state):
+    return [n for a in sem.actions(state) for n in sem.execute(state, a)]
+
+
+def test_is_immutable():
+    assert is_immutable((1, "a", (None, frozenset({2}))))
+    assert not is_immutable((1, [2]))
+    assert not is_immutable({"a": 1})
+
+
+def test_immutable_detected_on_initials():
+    assert SoupSemantics(Soup([Piece("b", bump)], [(0, 0)])).immutable
+    assert not SoupSemantics(Soup([Piece("b", bump_in_place)], [[0, 0]])).immutable
+    forced = Soup([Piece("b", bump)], [(0, 0)], immutable=False)
+    assert not SoupSemantics(forced).immutable
+
+
+def test_fast_path_gives_same_successors():
+    pieces = [Piece("b", bump, guard=lambda s: s[0] < 3)]
+    fast = SoupSemantics(Soup(pieces, [(0, 0)]))
+    slow = SoupSemantics(Soup(pieces, [(0, 0)], immutable=False))
+    assert fast.immutable and not slow.immutable
+    for s in [(0, 0), (2, 5), (3, 0)]:
+        assert successors(fast, s) == successors(slow, s)
+
+
+def test_mutable_states_are_copied():
+    sem = SoupSemantics(Soup([Piece("b", bump_in_place)], [[0, 0]]))
+    state = [0, 0]
+    assert successors(sem, state) == [[1, 0]]
+    assert state == [0, 0]
+
+
+def test_check_mutation_raises_on_in_place_effect():
+    soup = Soup([Piece("b", bump_in_place)], [[0, 0]], immutable=True)
+    sem = SoupSemantics(soup, check_mutation=True)
+    with pytest.raises(RuntimeError, match="b"):
+        successors(sem, [0, 0])
+
+
+def test_check_mutation_accepts_pure_effect():
+    sem = SoupSemantics(Soup([Piece("b", bump)], [(0, 0)]), check_mutation=True)
+    assert successors(sem, (0, 0)) == [(1, 0)]
+
+
+def unindexed(soup):
+    # même programme, gardes indexées repliées dans la garde (évaluation directe)
+    pieces = [Piece(p.name, p.effect, p.enabled) for p in soup.pieces]
+    return Soup(pieces, soup.init, soup.sort_key, soup.immutable)
+
+
+@pytest.mark.parametrize("name", ["AB1", "AB2", "AB3", "AB4", "AB5"])
+def test_guard_index_matches_direct_evaluation(name):
+    soup = get_model(name)
+    assert any(p.on is not None for p in soup.pieces)
+    indexed, direct = SoupSemantics(soup), SoupSemantics(unindexed(soup))
+    _, seen = bfs(LS2RG(direct), None, lambda p, n, o: False)
+    for s in seen:
+        assert [a.name for a in indexed.actions(s)] == [
+            a.name for a in direct.actions(s)
+        ]
+        assert successors(indexed, s) == successors(direct, s)
+    assert indexed._dispatch  # la table a bien servi
+
+
+def test_indexed_piece_enabled():
+    p = Piece("p", bump, guard=lambda s: s[1] > 0, on=(0, 1))
+    assert p.enabled((1, 1))
+    assert not p.enabled((0, 1)) and not p.enabled((1, 0))
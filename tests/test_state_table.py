@@ -0,0 +1,84 @@
+import pickle
+
+import pytest
+
+from bfs import bfs, bfs_interned
+from hanoi_ls import HanoiLS
+from ls2rg import LS2RG
+from state_table import NO_PARENT, StateTable
+
+
+def explore(table, ls):
+    return bfs_interned(LS2RG(ls), {}, lambda _p, _n, _o: False, table)
+
+
+def test_interned_parents_match_bfs():
+    ls = HanoiLS(4)
+
+    def on_entry(parent, node, o):
+        o[node] = parent
+        return False
+
+    parents, _ = bfs(LS2RG(ls), {}, on_entry)
+    _, table = explore(StateTable(), ls)
+    assert list(table) == list(parents)
+    for sid, state in enumerate(table):
+        p = table.parent(sid)
+        assert parents[state] == (None if p == NO_PARENT else table.state(p))
+
+
+@pytest.mark.parametrize("codec", [False, True])
+def test_pickle_round_trip(codec):
+    ls = HanoiLS(4)
+    table = StateTable(ls.encode_state, ls.decode_state) if codec else StateTable()
+    explore(table, ls)
+    copy = pickle.loads(pickle.dumps(table))
+    assert len(copy) == len(table) == 81
+    assert list(copy) == list(table)
+    for sid in range(len(table)):
+        state = table.state(sid)
+        assert copy.state(sid) == state
+        assert copy.id_of(state) == sid
+        assert copy.parent(sid) == table.parent(sid)
+    assert copy.path(len(table) - 1) == table.path(len(table) - 1)
+
+
+def test_codec_round_trip():
+    ls = HanoiLS(5)
+    table = StateTable()
+    explore(table, ls)
+    for state in table:
+        assert ls.decode_state(ls.encode_state(state)) == state
+    assert len({ls.encode_state(s) for s in table}) == len(table)
+
+
+def test_codec_requires_both():
+    with pytest.raises(ValueError):
+        StateTable(encode=repr)
+
+
+def test_path_starts_at_root():
+    ls = HanoiLS(3)
+    table = StateTable(ls.encode_state, ls.decode_state)
+    explore(table, ls)
+    goal = table.id_of(((), (), (3, 2, 1)))
+    path = table.path(goal)
+    assert path[0] == ls.initials()[0]
+    assert path[-1] == ((), (), (3, 2, 1))
+    assert len(path) == 2**3
+    assert table.parent(0) == NO_PARENT
+
+
+@pytest.mark.parametrize("name", ["AB1", "AB3", "AB5"])
+def test_spec_codec_same_exploration(name):
+    from alice_bob_soup_models import get_spec
+
+    spec = get_spec(name)
+    codec = spec.codec()
+    plain, packed = StateTable(), StateTable(codec.encode, codec.decode)
+    for table in (plain, packed):
+        bfs_interned(LS2RG(spec.compile()), {}, lambda _p, _n, _o: False, table)
+    assert list(packed) == list(plain)
+    assert [packed.parent(i) for i in range(len(packed))] == [
+        plain.parent(i) for i in range(len(plain))
+    ]
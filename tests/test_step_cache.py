@@ -0,0 +1,76 @@
+"""Cache des pas système des produits: mêmes produits avec ou sans cache."""
+import os
+import sys
+
+import pytest
+
+from bfs import bfs
+from isoup_lang import iSoupSemantics
+from ls2rg import LS2RG
+from StepSynchronousProduct import StepSynchronousProduct
+from verify_nfa_alice_bob import build_property, build_system
+
+BUCHI = os.path.join(os.path.dirname(os.path.dirname(__file__)), "Interpretation Buchi")
+MODELS = ["AB1", "AB2", "AB3", "AB4", "AB5"]
+
+
+def product(model, prop, pattern, cache_size):
+    sys_sem = build_system(model)[0]
+    prop_sem = iSoupSemantics(build_property(prop, pattern, sys_sem))
+    return StepSynchronousProduct(sys_sem, prop_sem, cache_size=cache_size)
+
+
+def edges(prod):
+    rg = LS2RG(prod, keep_labels=True)
+
+    def on_entry(parent, node, o):
+        o.append((parent, node, None if parent is None else rg.label(parent, node)))
+        return False
+
+    out, _ = bfs(rg, [], on_entry)
+    return out
+
+
+@pytest.mark.parametrize("model", MODELS)
+@pytest.mark.parametrize("prop", ["P1", "P2"])
+@pytest.mark.parametrize("pattern", [1, 2])
+def test_nfa_product_same_with_and_without_cache(model, prop, pattern):
+    ref = edges(product(model, prop, pattern, 0))
+    for size in (1, None):
+        prod = product(model, prop, pattern, size)
+        assert edges(prod) == ref
+        info = prod.cache_info()
+        assert info["hits"] + info["misses"] > 0
+        if size == 1:
+            assert info["size"] <= 1
+
+
+def test_steps_shared_across_property_states():
+    prod = product("AB2", "P2", 1, None)
+    edges(prod)
+    info = prod.cache_info()
+    assert info["hits"] > 0 and info["misses"] == info["size"]
+    off = product("AB2", "P2", 1, 0)
+    edges(off)
+    assert off.cache_info() == {"hits": 0, "misses": 0, "size": 0, "maxsize": 0}
+
+
+@pytest.fixture(scope="module")
+def vb():
+    # modules propres au Büchi; les copies partagées sont identiques à la racine
+    sys.path.append(BUCHI)
+    import verify_buchi_alice_bob
+
+    return verify_buchi_alice_bob
+
+
+@pytest.mark.parametrize("model", MODELS)
+@pytest.mark.parametrize("prop", ["P1", "P3", "P5"])
+def test_buchi_product_same_with_and_without_cache(vb, model, prop):
+    sys_sem = vb.load_system(model)
+    ref = vb.build_reachable_product(sys_sem, vb.PROPERTIES[prop](), cache_size=0)
+    for size in (1, None):
+        got = vb.build_reachable_product(
+            sys_sem, vb.PROPERTIES[prop](), cache_size=size
+        )
+        assert got[1] == ref[1] and got[2] == ref[2]
@@ -0,0 +1,21 @@
+import pytest
+
+from symbolic_bfs import symbolic_explore
+from soup_reference import cases, explicit
+
+CASES = cases()
+
+
+@pytest.mark.parametrize("name,spec,bad", CASES, ids=[c[0] for c in CASES])
+def test_symbolic_counts(name, spec, bad):
+    seen, dead, hits = explicit(spec, bad)
+    r = symbolic_explore(spec, bad=bad)
+    assert r["states"] == len(seen)
+    assert r["deadlocks"] == len(dead)
+    assert r["bad"] == len(hits)
+    if hits:
+        configs, names = r["counterexample"]
+        assert configs[0] in spec.init and configs[-1] in hits
+        assert len(names) == len(configs) - 1
+    else:
+        assert r["counterexample"] is None
@@ -0,0 +1,25 @@
+"""Réduction par symétrie (symmetry.py)."""
+import pytest
+
+from alice_bob_soup_models import get_spec, make_mutex
+from bfs import bfs_interned
+from ls2rg import LS2RG
+from soup_reference import MODELS, explicit
+from state_table import StateTable
+from symmetry import SymmetricSemantics
+
+CASES = [
+    (name, get_spec(name)) for name in MODELS if get_spec(name).symmetry is not None
+] + [(f"mutex{n}", make_mutex(n)) for n in (2, 3, 4)]
+
+
+@pytest.mark.parametrize("name,spec", CASES, ids=[c[0] for c in CASES])
+def test_symmetry_one_state_per_orbit(name, spec):
+    group = spec.symmetry
+    seen, _, _ = explicit(spec, {})
+    table = StateTable()
+    sem = SymmetricSemantics(spec.compile(), group)
+    bfs_interned(LS2RG(sem), {}, lambda _p, _n, _o: False, table)
+    assert set(table) == {group.canonical(c) for c in seen}
+    if name.startswith("mutex"):
+        assert len(table) < len(seen)
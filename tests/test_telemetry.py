@@ -0,0 +1,36 @@
+import io
+import json
+
+from alice_bob_soup_models import get_spec
+from bfs import bfs
+from hanoi_ls import HanoiLS
+from ls2rg import LS2RG
+from telemetry import Telemetry, TimedSemantics
+
+
+def run(sem, tm):
+    return bfs(LS2RG(sem), {}, lambda _p, _n, _o: False, observer=tm)
+
+
+def test_fused_successors_are_timed():
+    sem = get_spec("AB5").compile()
+    sink = io.StringIO()
+    tm = Telemetry(sink, label="AB5")
+    timed = TimedSemantics(sem, tm)
+    _, visited = run(timed, tm)
+    _, ref = run(sem, None)
+    assert visited == ref
+    assert tm.times.get("successors", 0.0) > 0.0
+    assert "actions" not in tm.times  # LS2RG passe par l'appel fusionné
+    lines = sink.getvalue().splitlines()
+    assert lines and all(json.loads(line) for line in lines)
+
+
+def test_actions_execute_timed_without_successors():
+    ls = HanoiLS(3)
+    tm = Telemetry()
+    timed = TimedSemantics(ls, tm)
+    assert not hasattr(timed, "successors")
+    _, visited = run(timed, tm)
+    assert len(visited) == 27
+    assert tm.times["actions"] > 0.0 and tm.times["execute"] > 0.0
@@ -0,0 +1,20 @@
+import pytest
+
+from soup_reference import cases, explicit
+
+np = pytest.importorskip("numpy")
+
+from vector_bfs import vector_explore  # noqa: E402
+
+CASES = cases()
+
+
+@pytest.mark.parametrize("name,spec,bad", CASES, ids=[c[0] for c in CASES])
+def test_vector_counts(name, spec, bad):
+    seen, dead, hits = explicit(spec, bad)
+    r = vector_explore(spec, bad=bad)
+    assert r["states"] == len(seen)
+    assert r["deadlocks"] == len(dead)
+    assert r["bad"] == len(hits)
+    enc = r["encoding"]
+    assert {enc.decode(int(k)) for k in r["visited"]} == seen
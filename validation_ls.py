@@ -1,49 +1,38 @@
 from __future__ import annotations
-from typing import Dict, Optional, Tuple, List
+from typing import Any, Dict, List
 
-from bfs import bfs
+from bfs import bfs_interned
 from ls2rg import LS2RG
 from hanoi_ls import HanoiLS, State
+from state_table import StateTable
 
 
-def solve_hanoi_ls(n: int) -> List[State]:
+def solve_hanoi_ls(n: int, observer: Any = None) -> List[State]:
     ls = HanoiLS(n)
-    rg = LS2RG(ls, keep_labels=True)
+    rg = LS2RG(ls)  # chemin d'états seul: aucune étiquette à garder
+
+    # états compactés en entiers (2 bits par disque)
+    table = StateTable(ls.encode_state, ls.decode_state)
 
     opaque: Dict[str, object] = {
-        "parent": {},
         "goal": None,
     }
 
-    def on_entry(
-        parent: Optional[State], node: State, opaque_dict: Dict[str, object]
-    ) -> bool:
-        parent_map = opaque_dict["parent"]
-        assert isinstance(parent_map, dict)
-        parent_map[node] = parent
-
-        if ls.is_goal(node):
+    def on_entry(parent: int, node: int, opaque_dict: Dict[str, object]) -> bool:
+        if ls.is_goal(table.state(node)):
             opaque_dict["goal"] = node
             return True
         return False
 
-    bfs(rg, opaque, on_entry)
+    bfs_interned(rg, opaque, on_entry, table, observer=observer)
 
     goal = opaque["goal"]
     if goal is None:
         return []
 
-    parent_map = opaque["parent"]
-    assert isinstance(parent_map, dict)
-
-    # reconstruction chemin
-    path: List[State] = []
-    cur: Optional[State] = goal  # type: ignore[assignment]
-    while cur is not None:
-        path.append(cur)
-        cur = parent_map.get(cur)
-    path.reverse()
-    return path
+    # reconstruction chemin (parents internés dans la table)
+    assert isinstance(goal, int)
+    return table.path(goal)
 
 
 if __name__ == "__main__":
@@ -1,11 +1,19 @@
 from __future__ import annotations
 import argparse
-from typing import Any, Dict, List, Optional, Sequence, Tuple
-from bfs import bfs
-from ls2rg import LS2RG
-from soup_lang import SoupSemantics
-from alice_bob_soup_models import get_model
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from bfs import bfs, bfs_interned
+from bitstate import MB, BitStateSet, replay_levels
+from checkpoint import Checkpointer
+from hash_compact import HashCompactSet
+from ls2rg import LABELS_LAZY, LABELS_TREE, LS2RG
+from por import StubbornSemantics
+from symmetry import SymmetricSemantics, concretize
+from language_semantics import LanguageSemantics
+from state_table import StateTable
+from telemetry import Telemetry, TimedSemantics
+from alice_bob_soup_models import get_semantics, get_spec
 from StepSynchronousProduct import StepSynchronousProduct
+from multi_property_product import MultiPropertyProduct, run as property_run
 from isoup_lang import iSoupSemantics
 from nfa_properties import (
     build_never_cond_pattern1,
@@ -19,13 +27,9 @@ import os
 PY_CMD = "python" if os.name == "nt" else "python3"
 
 
-def reconstruct_path(goal: Any, parent: Dict[Any, Any]) -> List[Any]:
-    path: List[Any] = []
-    cur = goal
-    while cur is not None:
-        path.append(cur)
-        cur = parent.get(cur)
-    return list(reversed(path))
+def reconstruct_path(goal: int, table: StateTable) -> List[Any]:
+    # goal et parents sont des identifiants internés (voir bfs_interned)
+    return table.path(goal)
 
 
 def edge_labels(path: Sequence[Any], rg: Any) -> List[str]:
@@ -46,7 +50,12 @@ def project_system_actions(labels: Sequence[str]) -> List[str]:
     return [lab.split("||", 1)[0] for lab in labels]
 
 
-def build_property(prop: str, pattern: int, sys_sem: SoupSemantics):
+# Champs du système lus par chaque propriété (réduction d'ordre partiel):
+# P1 observe a_loc / b_loc de la config cible, P2 seulement le stutter.
+POR_VISIBLE: Dict[str, Tuple[str, ...]] = {"P1": ("a_loc", "b_loc"), "P2": ()}
+
+
+def build_property(prop: str, pattern: int, sys_sem: LanguageSemantics):
     prop_u = prop.upper()
     if prop_u == "P1":
         cond = cond_exclusion
@@ -62,57 +71,315 @@ def build_property(prop: str, pattern: int, sys_sem: SoupSemantics):
     raise ValueError(f"Patron inconnu: {pattern}")
 
 
-def verify_one(model: str, prop: str, pattern: int) -> Dict[str, Any]:
+def build_system(
+    model: str,
+    packed: bool = False,
+    por_visible: Optional[Sequence[str]] = None,
+    symmetry: bool = False,
+) -> Tuple[Any, Any, Any, Dict[Any, int]]:
+    """Sémantique système de model, avec les réductions demandées.
+
+    por_visible: champs visibles pour la réduction d'ordre partiel (None =
+    pas de réduction); le proviso de cycle lit le rang de découverte de
+    chaque état système dans le dictionnaire renvoyé (à remplir à l'entrée).
+
+    Returns: (sémantique explorée, sémantique concrète, groupe de symétrie
+    ou None, rangs de découverte)
+    """
+    sys_sem: Any = get_semantics(model, packed)  # sémantique compilée (soup_dsl)
+    concrete_sem = sys_sem
+    group = get_spec(model).symmetry if symmetry else None
+    if group is not None:
+        if por_visible is not None:
+            raise ValueError("réduction d'ordre partiel et symétrie non combinables")
+        sys_sem = SymmetricSemantics(sys_sem, group)
+    sys_rank: Dict[Any, int] = {}
+    if por_visible is not None:
+        sys_sem = StubbornSemantics(
+            sys_sem, visible=por_visible, discovered=sys_rank.get
+        )
+    return sys_sem, concrete_sem, group, sys_rank
+
+
+def make_counterexample(
+    path: List[Any], labels: List[str], concrete_sem: Any, group: Any
+) -> Dict[str, Any]:
+    """Contre-exemple du rapport à partir d'un chemin du produit et de ses
+    étiquettes "la||ra"; avec symétrie, ramené à une trace concrète."""
+    sys_states = project_system_trace(path)
+    sys_actions = project_system_actions(labels)
+    if group is not None:
+        # représentants -> états concrets du modèle
+        sys_states, sys_actions = concretize(
+            concrete_sem, group, sys_states, sys_actions
+        )
+        path = [(c, rc) for c, (_, rc) in zip(sys_states, path)]
+        labels = [
+            f"{a}||{lab.split('||', 1)[1]}" for a, lab in zip(sys_actions, labels)
+        ]
+    return {
+        "product_path": path,
+        "edge_labels": labels,
+        "sys_states": sys_states,
+        "sys_actions": sys_actions,
+        "accepting_node": path[-1],
+    }
+
+
+def verify_one(
+    model: str,
+    prop: str,
+    pattern: int,
+    bitstate_mb: Optional[int] = None,
+    compact_bits: Optional[int] = None,
+    checkpoint_path: Optional[str] = None,
+    resume: bool = False,
+    checkpoint_every: float = 60.0,
+    observer: Optional[Telemetry] = None,
+    packed: bool = False,
+    por: bool = False,
+    symmetry: bool = False,
+) -> Dict[str, Any]:
+    """Vérifie model × (prop, pattern) par BFS sur le produit synchrone.
+
+    bitstate_mb: si donné, l'ensemble visited est un tableau de bits de cette
+    taille (Mo, voir bitstate.py): exploration approchée à mémoire constante,
+    avec probabilité d'omission et couverture estimée dans le résultat.
+    compact_bits: si donné, visited ne garde que des empreintes de cette
+    largeur (hash_compact.py), avec probabilité de collision dans le résultat.
+    Dans ces deux modes aucun parent ni étiquette n'est gardé (mémoire
+    bornée par visited et la file BFS): la trace est retrouvée en rejouant
+    l'exploration niveau par niveau (bitstate.replay_levels).
+
+    checkpoint_path: sauvegarde périodique (toutes les checkpoint_every
+    secondes) de la table des états, de la frontière et des étiquettes;
+    resume=True repart du checkpoint s'il existe. Le fichier est supprimé une
+    fois la vérification terminée. Exploration exacte seulement (ValueError
+    avec bitstate_mb / compact_bits).
+
+    observer: télémétrie de l'exploration (telemetry.py); le temps passé dans
+    actions / execute du produit y est mesuré séparément.
+
+    packed: configurations du système compactées dans un entier
+    (packed_config.py); traces et rapport inchangés.
+
+    por: réduction d'ordre partiel du système (por.py), avec les champs
+    visibles de la propriété (POR_VISIBLE); le verdict est préservé, le
+    nombre d'états visités est celui du produit réduit. Le proviso de cycle
+    utilise le rang de première découverte de chaque état système: exploration
+    exacte seulement (ValueError avec bitstate_mb / compact_bits).
+
+    symmetry: le système n'est exploré qu'à un représentant près par orbite
+    de la symétrie déclarée par le modèle (symmetry.py; P1 et P2 sont
+    invariants par échange d'Alice et Bob). Le contre-exemple est ramené à
+    une trace concrète du modèle pour le rapport.
+    """
     # 1) système
-    soup = get_model(model)
-    sys_sem = SoupSemantics(soup)
+    sys_sem, concrete_sem, group, sys_rank = build_system(
+        model, packed, POR_VISIBLE[prop.upper()] if por else None, symmetry
+    )
 
     # 2) propriété iSoup (NFA)
     isoup = build_property(prop, pattern, sys_sem)
     prop_sem = iSoupSemantics(isoup)
 
     # 3) produit
-    prod = StepSynchronousProduct(sys_sem, prop_sem)
-    prod_rg = LS2RG(prod, keep_labels=True)
-
-    opaque: Dict[str, Any] = {"parent": {}, "goal": None}
+    prod: Any = StepSynchronousProduct(sys_sem, prop_sem)
+    if observer is not None:
+        prod = TimedSemantics(prod, observer)
+
+    opaque: Dict[str, Any] = {"goal": None}
+    extra: Dict[str, Any] = {}
+
+    approx = bitstate_mb is not None or compact_bits is not None
+    if checkpoint_path is not None and approx:
+        raise ValueError("checkpoint: exploration exacte seulement")
+    if por and approx:
+        # le proviso de cycle demande le rang de découverte de chaque état
+        raise ValueError("la réduction d'ordre partiel nécessite visited exact")
+    new_store: Optional[Callable[[], Any]] = None
+    if bitstate_mb is not None:
+        new_store = lambda: BitStateSet(bitstate_mb * MB)  # noqa: E731
+        extra_key = "bitstate"
+    elif compact_bits is not None:
+        new_store = lambda: HashCompactSet(compact_bits)  # noqa: E731
+        extra_key = "hash_compact"
+    store: Any = None if new_store is None else new_store()
+    # étiquettes recalculées à la demande en mode approché (mémoire bornée)
+    prod_rg = LS2RG(
+        prod,
+        keep_labels=True,
+        label_mode=LABELS_TREE if store is None else LABELS_LAZY,
+    )
 
-    def on_entry(parent: Optional[Any], node: Any, opaque_dict: Dict[str, Any]) -> bool:
-        opaque_dict["parent"][node] = parent
-        # node = (lhs_state, prop_state)
-        if prop_sem.accepting(node[1]):
-            opaque_dict["goal"] = node
-            return True
-        return False
+    if store is None:
+        table = StateTable()
+        head = 0
+        ckpt: Optional[Checkpointer] = None
+        if checkpoint_path is not None:
+            ckpt = Checkpointer(
+                checkpoint_path,
+                every=checkpoint_every,
+                meta={
+                    "model": model,
+                    "prop": prop,
+                    "pattern": pattern,
+                    "packed": packed,
+                    "por": por,
+                    "symmetry": symmetry,
+                    "bitstate": bitstate_mb,
+                    "hash_compact": compact_bits,
+                },
+                extra=lambda: {
+                    "labels": prod_rg.export_labels(),
+                    "sys_rank": sys_rank,
+                },
+            )
+            saved = ckpt.load() if resume else None
+            if saved is not None:
+                table, head, opaque = saved["table"], saved["head"], saved["opaque"]
+                prod_rg.import_labels(saved["extra"]["labels"])
+                sys_rank.update(saved["extra"]["sys_rank"])
+
+        def on_entry(parent: int, node: int, opaque_dict: Dict[str, Any]) -> bool:
+            # table.state(node) = (lhs_state, prop_state)
+            lhs, rhs = table.state(node)
+            if por:
+                sys_rank.setdefault(lhs, len(sys_rank))
+            if prop_sem.accepting(rhs):
+                opaque_dict["goal"] = node
+                return True
+            return False
+
+        opaque_out, visited = bfs_interned(
+            prod_rg,
+            opaque,
+            on_entry,
+            table,
+            head=head,
+            checkpointer=ckpt,
+            observer=observer,
+        )
+        if ckpt is not None:
+            ckpt.clear()
+        visited_count = len(visited)
+        goal = opaque_out["goal"]
+        if goal is not None:
+            path = reconstruct_path(goal, table)
+    else:
 
-    opaque_out, visited = bfs(prod_rg, opaque, on_entry)
+        def on_entry_bs(
+            parent: Optional[Any], node: Any, opaque_dict: Dict[str, Any]
+        ) -> bool:
+            if prop_sem.accepting(node[1]):
+                opaque_dict["goal"] = node
+                return True
+            return False
+
+        opaque_out, visited = bfs(
+            prod_rg, opaque, on_entry_bs, visited=store, observer=observer
+        )
+        extra[extra_key] = store.stats()
+        visited_count = len(visited)
+        store = visited = None  # libéré avant le rejeu: un seul visited à la fois
+        goal = opaque_out["goal"]
+        if goal is not None:
+            assert new_store is not None
+            path = replay_levels(prod_rg, goal, new_store)
 
-    goal = opaque_out["goal"]
     if goal is None:
         return {
             "sat": True,
-            "visited": len(visited),
+            "visited": visited_count,
             "counterexample": None,
+            **extra,
         }
 
-    path = reconstruct_path(goal, opaque_out["parent"])
-    labels = edge_labels(path, prod_rg)
-    sys_states = project_system_trace(path)
-    sys_actions = project_system_actions(labels)
-
     return {
         "sat": False,
-        "visited": len(visited),
-        "counterexample": {
-            "product_path": path,
-            "edge_labels": labels,
-            "sys_states": sys_states,
-            "sys_actions": sys_actions,
-            "accepting_node": goal,
-        },
+        "visited": visited_count,
+        "counterexample": make_counterexample(
+            path, edge_labels(path, prod_rg), concrete_sem, group
+        ),
+        **extra,
     }
 
 
+def verify_many(
+    model: str,
+    scenarios: Sequence[Tuple[str, int]],
+    observer: Optional[Telemetry] = None,
+    packed: bool = False,
+    por: bool = False,
+    symmetry: bool = False,
+) -> List[Dict[str, Any]]:
+    """Vérifie model × chaque (prop, pattern) de scenarios en une exploration.
+
+    Le produit multiple (multi_property_product.py) fait avancer toutes les
+    propriétés sur chaque pas système; une propriété est décidée au premier
+    état (ordre BFS) où elle accepte, l'exploration s'arrête quand toutes
+    le sont. Un résultat par scénario, de même forme que verify_one;
+    "visited" est le nombre d'états du produit multiple (commun à tous).
+
+    packed / por / symmetry: voir verify_one (por: union des champs visibles
+    des propriétés). Exploration exacte seulement (StateTable).
+    """
+    visible: Tuple[str, ...] = ()
+    if por:
+        for prop, _ in scenarios:
+            visible += tuple(f for f in POR_VISIBLE[prop.upper()] if f not in visible)
+    sys_sem, concrete_sem, group, sys_rank = build_system(
+        model, packed, visible if por else None, symmetry
+    )
+    props = [
+        iSoupSemantics(build_property(prop, pattern, sys_sem))
+        for prop, pattern in scenarios
+    ]
+    multi = MultiPropertyProduct(sys_sem, props)
+    prod: Any = multi
+    if observer is not None:
+        prod = TimedSemantics(prod, observer)
+    prod_rg = LS2RG(prod, keep_labels=True, label_mode=LABELS_TREE)
+
+    table = StateTable()
+    goals: Dict[int, int] = {}  # propriété -> état acceptant (identifiant)
+
+    def on_entry(parent: int, node: int, opaque_dict: Dict[str, Any]) -> bool:
+        c = table.state(node)
+        if por:
+            sys_rank.setdefault(c[0], len(sys_rank))
+        for i in multi.accepted(c):
+            goals.setdefault(i, node)  # premier état acceptant (ordre BFS)
+        return len(goals) == len(props)
+
+    bfs_interned(prod_rg, {}, on_entry, table, observer=observer)
+
+    results: List[Dict[str, Any]] = []
+    for i, prop_sem in enumerate(props):
+        goal = goals.get(i)
+        if goal is None:
+            results.append({"sat": True, "visited": len(table), "counterexample": None})
+            continue
+        path = reconstruct_path(goal, table)
+        sys_labels = edge_labels(path, prod_rg)
+        # exécution acceptante de la propriété i le long du chemin système
+        prun = property_run(prop_sem, multi.system_steps(path, sys_labels))
+        assert prun is not None, "état acceptant sans exécution acceptante"
+        prop_states, prop_names = prun
+        path = [(lc, rs) for (lc, _), rs in zip(path, prop_states)]
+        labels = [f"{a}||{r}" for a, r in zip(sys_labels, prop_names)]
+        results.append(
+            {
+                "sat": False,
+                "visited": len(table),
+                "counterexample": make_counterexample(
+                    path, labels, concrete_sem, group
+                ),
+            }
+        )
+    return results
+
+
 def md_block(lines: List[str]) -> str:
     return "\n".join(lines) + "\n"
 
@@ -193,6 +460,18 @@ def write_report(results: List[Dict[str, Any]], out_path: str) -> None:
         lines.append("```")
         lines.append("")
         lines.append(f"- États explorés (visited) : **{r['visited']}**")
+        if "bitstate" in r:
+            bs = r["bitstate"]
+            lines.append(
+                f"- Bitstate : couverture estimée **{bs['coverage']:.6f}**, "
+                f"probabilité d'omission {bs['omission_probability']:.3e}"
+            )
+        if "hash_compact" in r:
+            hc = r["hash_compact"]
+            lines.append(
+                f"- Compaction ({hc['fingerprint_bits']} bits) : "
+                f"probabilité de collision {hc['collision_probability']:.3e}"
+            )
 
         if r["sat"]:
             lines.append("- Résultat : **SAT** (pas de contre-exemple)")
@@ -234,7 +513,145 @@ def main() -> None:
     parser.add_argument("--prop", type=str, default=None, help="P1 ou P2")
     parser.add_argument("--pattern", type=int, default=None, help="1 ou 2")
     parser.add_argument("--out", type=str, default="VerificationNFAAliceBob.md")
+    parser.add_argument(
+        "--bitstate",
+        type=int,
+        default=None,
+        metavar="MB",
+        help="Visited approché par tableau de bits de MB Mo (supertrace).",
+    )
+    parser.add_argument(
+        "--hash-compact",
+        type=int,
+        default=None,
+        metavar="BITS",
+        help="Visited réduit à des empreintes de BITS bits (compaction).",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Répertoire des checkpoints périodiques (un fichier par scénario).",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=float,
+        default=60.0,
+        metavar="SEC",
+        help="Intervalle entre deux checkpoints (secondes).",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reprendre depuis les checkpoints de --checkpoint s'ils existent.",
+    )
+    parser.add_argument(
+        "--telemetry",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Statistiques d'exploration (JSON lines) dans FILE + tableau récapitulatif.",
+    )
+    parser.add_argument(
+        "--packed",
+        action="store_true",
+        help="Configurations compactées dans un entier (packed_config.py).",
+    )
+    parser.add_argument(
+        "--por",
+        action="store_true",
+        help="Réduction d'ordre partiel du système (por.py).",
+    )
+    parser.add_argument(
+        "--symmetry",
+        action="store_true",
+        help="Réduction par symétrie (modèles qui en déclarent une, symmetry.py).",
+    )
+    parser.add_argument(
+        "--multi",
+        action="store_true",
+        help="Avec --all: une seule exploration par modèle pour toutes les "
+        "propriétés (multi_property_product.py).",
+    )
     args = parser.parse_args()
+    if args.resume and args.checkpoint is None:
+        parser.error("--resume nécessite --checkpoint DIR")
+    approx = args.bitstate is not None or args.hash_compact is not None
+    if args.checkpoint is not None and approx:
+        parser.error("--checkpoint: exploration exacte seulement")
+    if args.multi and not args.all:
+        parser.error("--multi nécessite --all")
+    if args.multi and (approx or args.checkpoint is not None):
+        parser.error("--multi: exploration exacte sans checkpoint seulement")
+    if args.por and args.symmetry:
+        parser.error("--por et --symmetry ne se combinent pas")
+    if args.por and approx:
+        parser.error("--por: visited exact requis (ni --bitstate ni --hash-compact)")
+    if args.telemetry is not None:
+        open(args.telemetry, "w", encoding="utf-8").close()
+
+    def run(model: str, prop: str, pattern: int) -> Dict[str, Any]:
+        ckpt_path = None
+        if args.checkpoint is not None:
+            os.makedirs(args.checkpoint, exist_ok=True)
+            ckpt_path = os.path.join(
+                args.checkpoint, f"{model}_{prop}_p{pattern}.ckpt"
+            )
+        if args.telemetry is None:
+            return verify_one(
+                model,
+                prop,
+                pattern,
+                args.bitstate,
+                args.hash_compact,
+                checkpoint_path=ckpt_path,
+                resume=args.resume,
+                checkpoint_every=args.checkpoint_every,
+                packed=args.packed,
+                por=args.por,
+                symmetry=args.symmetry,
+            )
+        with open(args.telemetry, "a", encoding="utf-8") as sink:
+            tm = Telemetry(sink, label=f"{model}/{prop}/p{pattern}")
+            res = verify_one(
+                model,
+                prop,
+                pattern,
+                args.bitstate,
+                args.hash_compact,
+                checkpoint_path=ckpt_path,
+                resume=args.resume,
+                checkpoint_every=args.checkpoint_every,
+                observer=tm,
+                packed=args.packed,
+                por=args.por,
+                symmetry=args.symmetry,
+            )
+        print("\n".join(tm.summary_lines()))
+        return res
+
+    def run_many(model: str, scenarios: List[Tuple[str, int]]) -> List[Dict[str, Any]]:
+        if args.telemetry is None:
+            return verify_many(
+                model,
+                scenarios,
+                packed=args.packed,
+                por=args.por,
+                symmetry=args.symmetry,
+            )
+        with open(args.telemetry, "a", encoding="utf-8") as sink:
+            tm = Telemetry(sink, label=f"{model}/multi")
+            res = verify_many(
+                model,
+                scenarios,
+                observer=tm,
+                packed=args.packed,
+                por=args.por,
+                symmetry=args.symmetry,
+            )
+        print("\n".join(tm.summary_lines()))
+        return res
 
     results: List[Dict[str, Any]] = []
 
@@ -243,11 +660,14 @@ def main() -> None:
         props = ["P1", "P2"]
         patterns = [1, 2]
         for m in models:
-            for p in props:
-                for pat in patterns:
-                    res = verify_one(m, p, pat)
-                    res.update({"model": m, "prop": p, "pattern": pat})
-                    results.append(res)
+            scenarios = [(p, pat) for p in props for pat in patterns]
+            if args.multi:
+                batch = run_many(m, scenarios)
+            else:
+                batch = [run(m, p, pat) for p, pat in scenarios]
+            for (p, pat), res in zip(scenarios, batch):
+                res.update({"model": m, "prop": p, "pattern": pat})
+                results.append(res)
         write_report(results, args.out)
         print(f"[OK] Rapport écrit dans: {args.out}")
         return
@@ -256,7 +676,7 @@ def main() -> None:
     if args.model is None or args.prop is None or args.pattern is None:
         raise SystemExit("Utilise --all ou bien --model ABk --prop P1/P2 --pattern 1/2")
 
-    res = verify_one(args.model, args.prop, args.pattern)
+    res = run(args.model, args.prop, args.pattern)
     res.update({"model": args.model, "prop": args.prop, "pattern": args.pattern})
     write_report([res], args.out)
     print(f"[OK] Rapport écrit dans: {args.out}")